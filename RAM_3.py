@@ -1,6 +1,7 @@
 import random
 from scsa import *
-from player import Player
+from player import Player, PlayerSession
+from telemetry import telemetry
 
 """
 Note: As requested by the Professor, this is a note explaining our group's situation. Our team captain 
@@ -19,17 +20,34 @@ class RAM(Player):
     def __init__(self):
 
         self.player_name = "RAM"
-        
-    #Global Variables
-    guessnum = 0            #to find 1st color
-    guessecondnum = 0       #to find 2nd color based on the 1st color
-    guesses = []            #to store all guesses
-    prevGuesses = []        #Holds all guesses attempted
-    responses = []          #Holds all responses corresponding to previous guesses  
-    positions = {}          #Holds position data in dictionary {position: character}
-    colorsUsed = []         #Holds all correct colors in a given code
-    num_bs = 0
-    
+        self.session = None #session of the round being played through make_guess
+
+    def new_session(self):
+        return RAMSession(self)
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        if (last_response[2] == 0 or self.session is None): #a new round gets a new session
+            self.session = self.new_session()
+        return self.session.make_guess(board_length, colors, scsa, last_response)
+
+
+class RAMSession(PlayerSession):
+    """State of one round of RAM; see RAM for the strategy"""
+
+    __slots__ = ("guessnum", "guessecondnum", "guesses", "prevGuesses", "responses", "positions", "colorsUsed", "num_bs")
+
+    def __init__(self, owner):
+
+        super().__init__(owner)
+        self.guessnum = 0 #to find 1st color
+        self.guessecondnum = 0 #to find 2nd color based on the 1st color
+        self.guesses = [] #to store all guesses
+        self.prevGuesses = [] #Holds all guesses attempted
+        self.responses = [] #Holds all responses corresponding to previous guesses
+        self.positions = {} #Holds position data in dictionary {position: character}
+        self.colorsUsed = [] #Holds all correct colors in a given code
+        self.num_bs = 0
+
     def make_guess(self, board_length, colors, scsa, last_response):
 #_________________________________________ Insert Colors __________________________________________________________
         if scsa.name == "InsertColors":
@@ -151,6 +169,7 @@ class RAM(Player):
                     guess = list_to_str(color) #generate the guess
                     if not (guess in self.guesses): #check if the guess has already been made
                         break #if not then make the guess and if so then make a new guess
+                    telemetry.count("rejections") #count every guess drawn again
             self.guesses.append(guess) #save the guess to the list to keep track of the guesses made
             return guess #return the guess
             
@@ -260,6 +279,7 @@ class RAM(Player):
                 while (guess in self.prevGuesses):                                          #make sure guess hasnt already been 
                     guess = list_to_str(random.sample(self.colorsUsed, k = board_length))   #guessed if so make another one until
                                                                                             #you have a new guess
+                    telemetry.count("rejections")                                           #count every guess drawn again
             guess = list_to_str(guess)                   #convert guess to a string
             self.prevGuesses.append(list_to_str(guess))  #add guess to previous guesses
             #print("colorUsed:", self.colorsUsed)
@@ -283,6 +303,7 @@ class RAM(Player):
                 guess = list_to_str(random.sample(colors, k = board_length))       #guess random combo w colors
                 while (guess in self.prevGuesses):                                 #make sure guess hasnt already been 
                     guess = list_to_str(random.sample(colors, k = board_length))   #guessed if so make another one until
+                    telemetry.count("rejections")                                           #count every guess drawn again
                 guess = list_to_str(guess)                                         #convert guess to a string
                 self.prevGuesses.append(list_to_str(guess))                        #add guess to prev guesses
                 return guess   
@@ -309,6 +330,7 @@ class RAM(Player):
                 while (guess in self.prevGuesses):                                          #make sure guess hasnt already been 
                     guess = list_to_str(random.sample(self.colorsUsed, k = board_length))   #guessed if so make another one until
                                                                                             #you have a new guess
+                    telemetry.count("rejections")                                           #count every guess drawn again
             guess = list_to_str(guess)                   #convert guess to a string
             self.prevGuesses.append(list_to_str(guess))  #add guess to prev guesses
             #print("colorUsed:", self.colorsUsed)
@@ -374,6 +396,7 @@ class RAM(Player):
                 guess = list_to_str(random.sample(self.colorsUsed, k = board_length))   #generate a random guess using colors confirmed to be correct
                 while guess in self.prevGuesses:                                #if that guess was already guessed
                     guess = list_to_str(random.sample(self.colorsUsed, k = board_length))  #guess again
+                    telemetry.count("rejections")                                           #count every guess drawn again
 
             #print('guessnum: ', self.guessnum)
             #print('guess: ', guess)
@@ -1,6 +1,6 @@
 import random
 from scsa import *
-from player import Player
+from player import Player, PlayerSession
 
 class RAMB2(Player): #b2
     
@@ -21,25 +21,45 @@ class RAMB2(Player): #b2
     def __init__(self):
 
         self.player_name = "RAMB2"
-    guesses = [] #for all guesses made
-    guessnum = 0 
-    #esentially the same function as last_response[2], i.e. the guess number; 
-    #a separate variable with the same functionality had to be used because 
-    #last_response[2]'s value cannot be changed when cycling through guesses
-    invalid_letters = set() 
-    #to hold invalid colors, which each guess produced is checked against
+        self.session = None #session of the round being played through make_guess
+
+    def new_session(self):
+        return RAMB2Session(self)
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        if (last_response[2] == 0 or self.session is None): #a new round gets a new session
+            self.session = self.new_session()
+        return self.session.make_guess(board_length, colors, scsa, last_response)
+
+
+class RAMB2Session(PlayerSession):
+    """State of one round of RAMB2; see RAMB2 for the strategy"""
+
+    __slots__ = ("last_guess", "guessnum", "invalid_letters")
+
+    def __init__(self, owner):
+
+        super().__init__(owner)
+        self.last_guess = None #the previous guess, which the next one is enumerated from
+        self.guessnum = 0 
+        #esentially the same function as last_response[2], i.e. the guess number; 
+        #a separate variable with the same functionality had to be used because 
+        #last_response[2]'s value cannot be changed when cycling through guesses
+        self.invalid_letters = set() 
+        #to hold invalid colors, which each guess produced is checked against
+
     def make_guess(self, board_length, colors, scsa, last_response):
         if (last_response[2] == 0): #if the first guess
             guess = list_to_str('A'*board_length) #guess all As
             self.guessnum = 0 #reset globals
             self.invalid_letters = set()
         else:
-            color = list(self.guesses[-1]) 
+            color = list(self.last_guess) 
             #retrieve the previous guess for lexicographic enumeration
             if (last_response[0] == 0 and last_response[1] == 0): 
                 #check if last guess had colors that were totally ruled out 
                 #and should not appear in future guesses
-                self.invalid_letters.update(self.guesses[-1]) 
+                self.invalid_letters.update(self.last_guess) 
                 #if it did then put those colors into the set
                                         
                 while (set(color).isdisjoint(self.invalid_letters) != True): 
@@ -85,8 +105,8 @@ class RAMB2(Player): #b2
             guess = list_to_str(color)  
             #turn the final list into a string guess
              
-        self.guesses.append(guess) 
-        #save the guess that will be made
+        self.last_guess = guess 
+        #save the guess that will be made; only the last one is needed
         return guess #make the guess
 
 
@@ -1,6 +1,6 @@
 import random
 from scsa import *
-from player import Player
+from player import Player, PlayerSession
 
 class RAMB3(Player): #b2
     """Professor granted our group an extension for B3 because of our group's situation. This is why B3 is
@@ -10,11 +10,31 @@ class RAMB3(Player): #b2
     def __init__(self):
 
         self.player_name = "RAMB3"
-    guesses = [] #all guesses made
-    num_colors = [] #store occurence of each letter
+        self.session = None #session of the round being played through make_guess
+
+    def new_session(self):
+        return RAMB3Session(self)
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        if (last_response[2] == 0 or self.session is None): #a new round gets a new session
+            self.session = self.new_session()
+        return self.session.make_guess(board_length, colors, scsa, last_response)
+
+
+class RAMB3Session(PlayerSession):
+    """State of one round of RAMB3; see RAMB3 for the strategy"""
+
+    __slots__ = ("guesses", "num_colors")
+
+    def __init__(self, owner):
+
+        super().__init__(owner)
+        self.guesses = set() #all guesses made this round
+        self.num_colors = [] #store occurence of each letter
+
     def make_guess(self, board_length, colors, scsa, last_response): 
         if (last_response[2] == 0): #if the first guess of a round
-            self.guesses = [] #reset globals
+            self.guesses = set() #reset globals
             self.num_colors = []
         if (last_response[2] < (len(colors)-1)): #guess monochromatic combos of all c-1 colors; e.g. 3 colors, len = 3, want colors[0] and colors[1]
             guess = list_to_str(colors[last_response[2]]*board_length) 
@@ -30,5 +50,5 @@ class RAMB3(Player): #b2
                 guess = list_to_str(self.num_colors) #generate a guess
                 if not (guess in self.guesses): #if the guess has not already been made
                     break #stop looping so the guess can be made
-        self.guesses.append(guess) #save all guesses made
+        self.guesses.add(guess) #save all guesses made
         return guess #make the guess
\ No newline at end of file
@@ -0,0 +1,601 @@
+# File contains a benchmark suite for the engine, the SCSAs and the players, with stored baselines to compare against
+# Run bench.py before and after a change and compare the two runs:
+#
+#     python bench.py run --out baseline.json
+#     (change the engine)
+#     python bench.py run --out change.json
+#     python bench.py compare baseline.json change.json
+#
+# Every benchmark is timed repeats times, one sample of each benchmark in turn, so that a slow spell of the machine
+# is spread over all of them rather than landing on a few. A change is only called slower or faster when the medians
+# differ by more than the threshold and the Mann-Whitney U test finds the two sets of samples different after the
+# Holm correction for comparing every benchmark at once. compare exits with status 1 when any benchmark is slower,
+# so it can gate a change.
+
+import argparse
+import datetime
+import functools
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+from mastermind import *
+from registry import *
+
+DEFAULT_BOARD = (4, 6)
+SWEEP_LENGTHS = [4, 5, 6, 8]
+SWEEP_COLORS = [6, 8, 10, 12]
+DEFAULT_PLAYERS = ["RandomFolks", "Boring", "RAM", "Prior", "Identifying", "Adaptive"]
+
+def board_colors(num_colors):
+    """Lists the colors of a board
+
+    Args:
+        num_colors (int): Number of colors.
+
+    Returns:
+        list of chrs: Returns the first num_colors capital letters.
+    """
+
+    return [chr(i) for i in range(65,91)][:num_colors]
+
+def board_name(board):
+    """Names a board
+
+    Args:
+        board (tuple): Board length and number of colors.
+
+    Returns:
+        str: Returns "LENGTHxCOLORS", e.g. "4x6".
+    """
+
+    return str(board[0]) + "x" + str(board[1])
+
+def time_per_call(function, number):
+    """Times a function over several calls with garbage collection off, as timeit does
+
+    Args:
+        function (function): Called with no arguments.
+        number (int): Number of calls.
+
+    Returns:
+        float: Returns mean seconds per call.
+    """
+
+    enabled = gc.isenabled()
+
+    gc.disable()
+
+    try:
+
+        start = time.perf_counter_ns()
+
+        for _ in range(number):
+
+            function()
+
+        end = time.perf_counter_ns()
+
+    finally:
+
+        if enabled:
+
+            gc.enable()
+
+    return (end - start)/number/1e9
+
+def process_guess_sampler(board, number):
+    """Makes a sampler of Round.process_guess throughput on random guesses
+
+    Args:
+        board (tuple): Board length and number of colors.
+        number (int): Guesses scored per sample.
+
+    Returns:
+        function: Returns function of the repeat number that returns seconds per guess.
+    """
+
+    colors = board_colors(board[1])
+
+    def sample(repeat):
+
+        rng = random.Random(repeat)
+        round = Round(board[0], colors, list_to_str(rng.choices(colors, k = board[0])), None)
+        guesses = iter([list_to_str(rng.choices(colors, k = board[0])) for _ in range(number)])
+
+        return time_per_call(lambda: round.process_guess(next(guesses)), number)
+
+    return sample
+
+def respond_to_guess_sampler(board, number):
+    """Makes a sampler of Round.respond_to_guess on random guesses, invalid ones included
+
+    Args:
+        board (tuple): Board length and number of colors.
+        number (int): Guesses responded to per sample.
+
+    Returns:
+        function: Returns function of the repeat number that returns seconds per guess.
+    """
+
+    colors = board_colors(board[1])
+
+    def sample(repeat):
+
+        rng = random.Random(repeat)
+        round = Round(board[0], colors, list_to_str(rng.choices(colors, k = board[0])), None)
+        guesses = [list_to_str(rng.choices(colors, k = board[0])) for _ in range(number)]
+
+        # One guess in ten is invalid and one is the answer, so every branch is timed
+        for i in range(0, number, 10):
+
+            guesses[i] = guesses[i][:-1]
+
+        for i in range(5, number, 10):
+
+            guesses[i] = round.answer
+
+        guesses = iter(guesses)
+
+        return time_per_call(lambda: round.respond_to_guess(next(guesses)), number)
+
+    return sample
+
+def generate_codes_sampler(scsa, board, number):
+    """Makes a sampler of SCSA.generate_codes
+
+    Args:
+        scsa (SCSA): SCSA to time.
+        board (tuple): Board length and number of colors.
+        number (int): Codes generated per sample.
+
+    Returns:
+        function or None: Returns function of the repeat number that returns seconds per code, or None if the SCSA
+                          cannot generate codes for the board.
+    """
+
+    colors = board_colors(board[1])
+
+    if scsa.generate_codes(board[0], colors, 1) is None:
+
+        return None
+
+    def sample(repeat):
+
+        random.seed(repeat)
+
+        return time_per_call(lambda: scsa.generate_codes(board[0], colors, number), 1)/number
+
+    return sample
+
+def make_guess_sampler(player_name, scsa, board, rounds):
+    """Makes a sampler of a player's make_guess latency against an SCSA
+
+    Args:
+        player_name (str): Name of the player, as accepted by player_by_name.
+        scsa (SCSA): SCSA of the secret codes.
+        board (tuple): Board length and number of colors.
+        rounds (int): Rounds played per sample.
+
+    Returns:
+        function or None: Returns function of the repeat number that returns mean seconds per guess, or None if the SCSA
+                          cannot generate codes for the board.
+    """
+
+    colors = board_colors(board[1])
+
+    if scsa.generate_codes(board[0], colors, 1) is None:
+
+        return None
+
+    def sample(repeat):
+
+        random.seed(repeat)
+
+        player = player_by_name(player_name)
+        codes = scsa.generate_codes(board[0], colors, rounds)
+        codes = [codes] if isinstance(codes, str) else codes
+        latency = LatencyRecorder()
+
+        player.prepare(board[0], colors, scsa)
+
+        for code in codes:
+
+            Round(board[0], colors, code, scsa, latency = latency).play_round(player)
+
+        return latency.overall["make_guess"].summary()["mean"]
+
+    return sample
+
+def benchmarks(players = DEFAULT_PLAYERS, scsa_names = None, board = DEFAULT_BOARD, lengths = SWEEP_LENGTHS, num_colors = SWEEP_COLORS, quick = False):
+    """Lists the benchmarks of the suite
+
+    Args:
+        players (list of strs, optional): Names of the players whose make_guess is timed. Defaults to DEFAULT_PLAYERS.
+        scsa_names (list of strs, optional): Names of the SCSAs. Defaults to every SCSA.
+        board (tuple, optional): Board of the player benchmarks. Defaults to (4, 6).
+        lengths (list of ints, optional): Board lengths of the scaling sweep. Defaults to SWEEP_LENGTHS.
+        num_colors (list of ints, optional): Numbers of colors of the scaling sweep. Defaults to SWEEP_COLORS.
+        quick (bool, optional): Whether to time fewer calls per sample. Defaults to False.
+
+    Returns:
+        list of tuples: Returns name and sampler of every benchmark.
+    """
+
+    scale = 10 if quick else 1
+    scsas = [scsa_class() for scsa_class in SCSA.__subclasses__()]
+
+    if scsa_names is not None:
+
+        scsas = [scsa for scsa in scsas if scsa.name in scsa_names]
+
+    sweep = [(length, colors) for length in lengths for colors in num_colors]
+    suite = []
+
+    for sweep_board in sweep:
+
+        suite.append(("process_guess/" + board_name(sweep_board), process_guess_sampler(sweep_board, 20000//scale)))
+        suite.append(("respond_to_guess/" + board_name(sweep_board), respond_to_guess_sampler(sweep_board, 20000//scale)))
+
+        for scsa in scsas:
+
+            suite.append(("generate_codes/" + scsa.name + "/" + board_name(sweep_board), generate_codes_sampler(scsa, sweep_board, 2000//scale)))
+
+    for player_name in players:
+
+        for scsa in scsas:
+
+            suite.append(("make_guess/" + player_name + "/" + scsa.name + "/" + board_name(board), make_guess_sampler(player_name, scsa, board, 1 if quick else 3)))
+
+    return [(name, sampler) for name, sampler in suite if sampler is not None]
+
+def run(suite, repeats = 10, pattern = None, verbose = True):
+    """Times every benchmark of a suite, taking one sample of each benchmark in turn until each has repeats
+
+    Args:
+        suite (list of tuples): Name and sampler of every benchmark, as from benchmarks.
+        repeats (int, optional): Samples per benchmark. Defaults to 10, enough for the Holm correction over a few
+                                 hundred benchmarks to be able to find a change.
+        pattern (str, optional): Only benchmarks whose name contains it are run. Defaults to None, which runs all.
+        verbose (bool, optional): Whether to print every benchmark as it finishes. Defaults to True.
+
+    Returns:
+        dict: Returns baseline with the environment, the samples and median of every benchmark in seconds and the
+              names of the benchmarks that raised an error.
+    """
+
+    suite = [(name, sampler) for name, sampler in suite if pattern is None or pattern in name]
+    samples = {name: [] for name, _ in suite}
+    failed = []
+
+    for repeat in range(repeats):
+
+        for name, sampler in suite:
+
+            if name in failed:
+
+                continue
+
+            try:
+
+                samples[name].append(sampler(repeat))
+
+            except Exception as error:
+
+                # A player that cannot play an SCSA, such as RAM against InsertColors, is left out of the run
+                failed.append(name)
+
+                if verbose:
+
+                    print("{:<52}{:>17}".format(name, "failed: " + type(error).__name__), file = sys.stderr)
+
+        if verbose:
+
+            print("Repeat", repeat + 1, "of", repeats, "done", file = sys.stderr)
+
+    results = {name: {"samples": samples[name], "median": statistics.median(samples[name])} for name, _ in suite if name not in failed}
+
+    if verbose:
+
+        for name, result in results.items():
+
+            print("{:<52}{:>14.3f} us".format(name, result["median"]*1e6), file = sys.stderr)
+
+    return {
+        "version": 1,
+        "created": datetime.datetime.now().isoformat(timespec = "seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "unit": "seconds per call",
+        "results": results,
+        "failed": failed,
+    }
+
+@functools.lru_cache(maxsize = None)
+def u_distribution(n, m):
+    """Counts the orderings of two samples without ties by their Mann-Whitney U statistic
+
+    Args:
+        n (int): Size of the first sample.
+        m (int): Size of the second sample.
+
+    Returns:
+        tuple of ints: Returns number of orderings with U equal to each value from 0 to n*m.
+    """
+
+    if n == 0 or m == 0:
+
+        return (1,)
+
+    counts = [0]*(n*m + 1)
+
+    # The largest value is either from the second sample, larger than all n of the first, or from the first
+    for u, count in enumerate(u_distribution(n, m - 1)):
+
+        counts[u + n] += count
+
+    for u, count in enumerate(u_distribution(n - 1, m)):
+
+        counts[u] += count
+
+    return tuple(counts)
+
+def mann_whitney(first, second):
+    """Tests whether the values of second tend to be larger than those of first
+
+    Uses the exact distribution of the U statistic when there are no ties and few samples, and the normal
+    approximation with tie and continuity corrections otherwise.
+
+    Args:
+        first (list of floats): First samples.
+        second (list of floats): Second samples.
+
+    Returns:
+        float: Returns one-sided p-value of second being no larger than first.
+    """
+
+    n, m = len(first), len(second)
+
+    if n == 0 or m == 0:
+
+        return 1.0
+
+    # U counts the pairs in which the second sample is larger, ties counting half
+    u = sum(1.0 if b > a else 0.5 if b == a else 0.0 for a in first for b in second)
+    ties = len(set(first) | set(second)) < n + m
+
+    if not ties and n*m <= 2500:
+
+        return sum(u_distribution(n, m)[math.ceil(u):])/math.comb(n + m, n)
+
+    values = sorted(first + second)
+    tie_sizes = [values.count(value) for value in set(values)]
+    mean = n*m/2
+    variance = n*m/12*((n + m + 1) - sum(t**3 - t for t in tie_sizes)/((n + m)*(n + m - 1)))
+
+    if variance <= 0:
+
+        return 1.0
+
+    z = (u - mean - 0.5)/math.sqrt(variance)
+
+    return 0.5*math.erfc(z/math.sqrt(2))
+
+def holm(p_values):
+    """Adjusts p-values for testing them all at once with the Holm step-down method
+
+    Rejecting every hypothesis whose adjusted p-value is below alpha keeps the chance of any false rejection
+    below alpha, however many hypotheses there are.
+
+    Args:
+        p_values (list of floats): P-values of the tests.
+
+    Returns:
+        list of floats: Returns adjusted p-values, in the same order.
+    """
+
+    adjusted = [1.0]*len(p_values)
+    largest = 0.0
+
+    for rank, i in enumerate(sorted(range(len(p_values)), key = lambda i: p_values[i])):
+
+        # Adjusted values are kept in the order of the p-values, so that a smaller p-value is never adjusted above a larger one
+        largest = max(largest, min((len(p_values) - rank)*p_values[i], 1.0))
+        adjusted[i] = largest
+
+    return adjusted
+
+def smallest_p(n, m):
+    """Finds the smallest two-sided p-value the Mann-Whitney U test can give for two sets of samples
+
+    Args:
+        n (int): Size of the first set.
+        m (int): Size of the second set.
+
+    Returns:
+        float: Returns p-value when every sample of one set is larger than every sample of the other.
+    """
+
+    return min(2/math.comb(n + m, n), 1.0)
+
+def compare(baseline, current, threshold = 0.05, alpha = 0.05):
+    """Compares the benchmarks two runs have in common
+
+    Every common benchmark is tested, two-sided, and the p-values are adjusted together with the Holm method,
+    so that on two runs of the same code the chance of calling any benchmark slower or faster is at most alpha.
+
+    Args:
+        baseline (dict): Earlier run, as from run.
+        current (dict): Later run.
+        threshold (float, optional): Smallest relative change of the median that counts. Defaults to 0.05.
+        alpha (float, optional): Chance of calling any benchmark changed when none is. Defaults to 0.05.
+
+    Returns:
+        list of tuples: Returns name, baseline median, current median, ratio, adjusted p-value of the change and
+                        verdict ("slower", "faster" or "") of every common benchmark.
+    """
+
+    names = sorted(set(baseline["results"]) & set(current["results"]))
+    tests = []
+
+    for name in names:
+
+        before = baseline["results"][name]["samples"]
+        after = current["results"][name]["samples"]
+
+        tests.append(min(2*min(mann_whitney(before, after), mann_whitney(after, before)), 1.0))
+
+    rows = []
+
+    for name, p in zip(names, holm(tests)):
+
+        before = baseline["results"][name]
+        after = current["results"][name]
+        ratio = after["median"]/before["median"] if before["median"] else math.inf
+        verdict = ""
+
+        if p < alpha and ratio > 1 + threshold:
+
+            verdict = "slower"
+
+        elif p < alpha and ratio < 1 - threshold:
+
+            verdict = "faster"
+
+        rows.append((name, before["median"], after["median"], ratio, p, verdict))
+
+    return rows
+
+def print_comparison(rows):
+    """Prints a comparison, slower benchmarks first
+
+    Args:
+        rows (list of tuples): Rows of compare.
+    """
+
+    order = {"slower": 0, "faster": 1, "": 2}
+
+    print("{:<52}{:>12}{:>12}{:>9}{:>9}  {}".format("Benchmark", "Base (us)", "New (us)", "Ratio", "p", "Verdict"))
+
+    for name, before, after, ratio, p, verdict in sorted(rows, key = lambda row: (order[row[5]], row[0])):
+
+        print("{:<52}{:>12.3f}{:>12.3f}{:>9.3f}{:>9.4f}  {}".format(name, before*1e6, after*1e6, ratio, p, verdict))
+
+    print()
+    print(sum(1 for row in rows if row[5] == "slower"), "slower,", sum(1 for row in rows if row[5] == "faster"), "faster,", len(rows), "compared")
+
+    return
+
+def print_curves(baseline):
+    """Prints the median of every swept benchmark as a table of board length by number of colors
+
+    Args:
+        baseline (dict): Run, as from run.
+    """
+
+    curves = {}
+
+    for name, result in baseline["results"].items():
+
+        family, board = name.rsplit("/", 1)
+
+        if not name.startswith("make_guess/"):
+
+            length, num_colors = board.split("x")
+
+            curves.setdefault(family, {})[(int(length), int(num_colors))] = result["median"]
+
+    for family, points in sorted(curves.items()):
+
+        lengths = sorted(set(length for length, _ in points))
+        num_colors = sorted(set(colors for _, colors in points))
+
+        print(family + " (us per call)")
+        print("{:>8}".format("L \\ C") + "".join("{:>10}".format(colors) for colors in num_colors))
+
+        for length in lengths:
+
+            print("{:>8}".format(length) + "".join("{:>10.3f}".format(points[(length, colors)]*1e6) if (length, colors) in points else "{:>10}".format("-") for colors in num_colors))
+
+        print()
+
+    return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Benchmark the engine, SCSAs and players, and compare runs.")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--out", default = "bench.json", help = "file to save the run to, as a JSON baseline")
+    run_parser.add_argument("--repeats", type = int, default = 10)
+    run_parser.add_argument("--filter", help = "only run benchmarks whose name contains this")
+    run_parser.add_argument("--players", nargs = "+", default = DEFAULT_PLAYERS)
+    run_parser.add_argument("--scsas", nargs = "+", default = None)
+    run_parser.add_argument("--board", default = board_name(DEFAULT_BOARD), help = "board of the player benchmarks, e.g. 4x6")
+    run_parser.add_argument("--lengths", nargs = "+", type = int, default = SWEEP_LENGTHS)
+    run_parser.add_argument("--colors", nargs = "+", type = int, default = SWEEP_COLORS)
+    run_parser.add_argument("--quick", action = "store_true", help = "time fewer calls per sample")
+
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type = float, default = 0.05, help = "smallest relative change of the median that counts")
+    compare_parser.add_argument("--alpha", type = float, default = 0.05, help = "chance of calling any benchmark changed when none is")
+
+    curves_parser = commands.add_parser("curves")
+    curves_parser.add_argument("baseline")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+
+        for player_name in args.players:
+
+            if player_by_name(player_name) is None:
+
+                print("Unrecognized player:", player_name)
+                sys.exit(1)
+
+        board = tuple(int(value) for value in args.board.split("x"))
+        suite = benchmarks(args.players, args.scsas, board, args.lengths, args.colors, args.quick)
+        baseline = run(suite, args.repeats, args.filter)
+
+        with open(args.out, "w") as file:
+
+            json.dump(baseline, file, indent = 1)
+
+        print_curves(baseline)
+
+    elif args.command == "compare":
+
+        with open(args.baseline) as file:
+
+            baseline = json.load(file)
+
+        with open(args.current) as file:
+
+            current = json.load(file)
+
+        rows = compare(baseline, current, args.threshold, args.alpha)
+
+        print_comparison(rows)
+
+        # With too few repeats even samples that do not overlap at all cannot pass the correction
+        if rows and smallest_p(baseline["repeats"], current["repeats"])*len(rows) >= args.alpha:
+
+            print("Warning:", baseline["repeats"], "and", current["repeats"], "repeats cannot show a change among", len(rows), "benchmarks; run with more --repeats")
+
+        if any(row[5] == "slower" for row in rows):
+
+            sys.exit(1)
+
+    else:
+
+        with open(args.baseline) as file:
+
+            print_curves(json.load(file))
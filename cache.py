@@ -0,0 +1,353 @@
+# File contains an on-disk cache of generated corpora, precomputed tables and learned models
+# Run python cache.py list to see what is cached, python cache.py evict to trim it to --max-bytes or clear to empty it
+#
+# Every artifact is stored under the hash of its type and of everything it was built from, including the version of
+# the code that built it, so a changed SCSA or player is never served a stale artifact:
+#     cache = ArtifactCache(".cache/artifacts", max_bytes = 2**30)
+#     path = cache.fetch("corpus", {"scsa": "PreferFewer", "board_length": 4, ...}, build, ".codes")
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+from telemetry import telemetry
+
+DEFAULT_DIRECTORY = os.path.join(".cache", "artifacts")
+
+def source_version(*objects):
+    """Fingerprints the source code of modules, classes or functions
+
+    Args:
+        *objects: Modules, classes or functions whose source files are hashed.
+
+    Returns:
+        str: Returns hex digest of the source files, each hashed once.
+    """
+
+    paths = []
+
+    for item in objects:
+
+        module = item if inspect.ismodule(item) else sys.modules.get(getattr(item, "__module__", None))
+        path = getattr(module, "__file__", None)
+
+        if path is not None:
+
+            paths.append(path)
+
+    return file_version(*paths)
+
+def file_version(*paths):
+    """Fingerprints source files
+
+    Args:
+        *paths: Paths of the files to hash.
+
+    Returns:
+        str: Returns hex digest of the files, each hashed once.
+    """
+
+    digest = hashlib.sha256()
+
+    for path in sorted(set(os.path.abspath(path) for path in paths)):
+
+        with open(path, "rb") as file:
+
+            digest.update(os.path.basename(path).encode() + b"\0" + file.read())
+
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Directory of artifacts addressed by the hash of what they were built from
+
+    Artifacts are written to a temporary file and renamed into place, so a reader never sees a partial one and
+    concurrent builders of the same artifact simply replace each other's identical result. Reading an artifact
+    marks it as recently used; once the directory holds more than max_bytes the least recently used artifacts
+    are deleted.
+    """
+
+    def __init__(self, directory = DEFAULT_DIRECTORY, max_bytes = 2**30):
+        """Constructor for ArtifactCache
+
+        Args:
+            directory (str, optional): Directory of the cache. Defaults to ".cache/artifacts".
+            max_bytes (int, optional): Largest total size of the artifacts. Defaults to 1 GiB.
+        """
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, kind, params):
+        """Computes the address of an artifact
+
+        Args:
+            kind (str): Type of artifact (e.g. "corpus").
+            params (dict): Everything the artifact is built from, as JSON-serializable values.
+
+        Returns:
+            str: Returns hex digest.
+        """
+
+        return hashlib.sha256(json.dumps([kind, params], sort_keys = True, default = str).encode()).hexdigest()
+
+    def path(self, kind, params, suffix = ""):
+        """Computes the file name of an artifact
+
+        Args:
+            kind (str): Type of artifact.
+            params (dict): Everything the artifact is built from.
+            suffix (str, optional): File extension. Defaults to "".
+
+        Returns:
+            str: Returns file name inside the cache directory.
+        """
+
+        return os.path.join(self.directory, kind + "-" + self.key(kind, params) + suffix)
+
+    def lookup(self, kind, params, suffix = ""):
+        """Finds an artifact and marks it as recently used
+
+        Args:
+            kind (str): Type of artifact.
+            params (dict): Everything the artifact is built from.
+            suffix (str, optional): File extension. Defaults to "".
+
+        Returns:
+            str or None: Returns file name of the artifact, or None if it is not cached.
+        """
+
+        path = self.path(kind, params, suffix)
+
+        try:
+
+            os.utime(path)
+
+        except FileNotFoundError:
+
+            telemetry.count("artifact_cache_misses")
+
+            return None
+
+        telemetry.count("artifact_cache_hits")
+
+        return path
+
+    def store(self, kind, params, write, suffix = ""):
+        """Builds an artifact into the cache
+
+        Args:
+            kind (str): Type of artifact.
+            params (dict): Everything the artifact is built from.
+            write (function): Called with a file name to write the artifact to.
+            suffix (str, optional): File extension. Defaults to "".
+
+        Returns:
+            str: Returns file name of the artifact.
+        """
+
+        path = self.path(kind, params, suffix)
+        temporary = path + "." + str(os.getpid()) + ".tmp"
+
+        os.makedirs(self.directory, exist_ok = True)
+
+        try:
+
+            write(temporary)
+
+            os.replace(temporary, path)
+
+        finally:
+
+            if os.path.exists(temporary):
+
+                os.remove(temporary)
+
+        self.evict(keep = path)
+
+        return path
+
+    def fetch(self, kind, params, write, suffix = ""):
+        """Finds an artifact, building it first if it is not cached
+
+        Args:
+            kind (str): Type of artifact.
+            params (dict): Everything the artifact is built from.
+            write (function): Called with a file name to write the artifact to, if it is not cached.
+            suffix (str, optional): File extension. Defaults to "".
+
+        Returns:
+            str: Returns file name of the artifact.
+        """
+
+        path = self.lookup(kind, params, suffix)
+
+        if path is None:
+
+            path = self.store(kind, params, write, suffix)
+
+        return path
+
+    def fetch_json(self, kind, params, build):
+        """Finds a JSON artifact, building it first if it is not cached
+
+        Args:
+            kind (str): Type of artifact.
+            params (dict): Everything the artifact is built from.
+            build (function): Called with no arguments to build the artifact's value.
+
+        Returns:
+            Returns value of the artifact.
+        """
+
+        def write(file_name):
+
+            with open(file_name, "w") as file:
+
+                json.dump(build(), file)
+
+        with open(self.fetch(kind, params, write, ".json")) as file:
+
+            return json.load(file)
+
+    def fetch_pickle(self, kind, params, build):
+        """Finds a pickled artifact, building it first if it is not cached
+
+        Args:
+            kind (str): Type of artifact.
+            params (dict): Everything the artifact is built from.
+            build (function): Called with no arguments to build the artifact's value.
+
+        Returns:
+            Returns value of the artifact.
+        """
+
+        def write(file_name):
+
+            with open(file_name, "wb") as file:
+
+                pickle.dump(build(), file, pickle.HIGHEST_PROTOCOL)
+
+        with open(self.fetch(kind, params, write, ".pickle"), "rb") as file:
+
+            return pickle.load(file)
+
+    def entries(self):
+        """Lists the artifacts in the cache
+
+        Returns:
+            list of tuples: Returns file name, size in bytes and last use time of every artifact, least recently used first.
+        """
+
+        if not os.path.isdir(self.directory):
+
+            return []
+
+        entries = []
+
+        for name in os.listdir(self.directory):
+
+            if name.endswith(".tmp"):
+
+                continue
+
+            path = os.path.join(self.directory, name)
+
+            try:
+
+                stat = os.stat(path)
+
+            except FileNotFoundError:
+
+                continue
+
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        entries.sort(key = lambda entry: entry[2])
+
+        return entries
+
+    def evict(self, keep = None):
+        """Deletes the least recently used artifacts until the cache fits in max_bytes
+
+        Args:
+            keep (str, optional): File name of an artifact never to delete, such as the one just stored. Defaults to None.
+
+        Returns:
+            int: Returns number of artifacts deleted.
+        """
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+
+        for path, size, _ in entries:
+
+            if total <= self.max_bytes:
+
+                break
+
+            if path == keep:
+
+                continue
+
+            try:
+
+                os.remove(path)
+
+            except FileNotFoundError:
+
+                pass
+
+            total -= size
+            deleted += 1
+
+        return deleted
+
+    def clear(self):
+        """Deletes every artifact
+        """
+
+        for path, _, _ in self.entries():
+
+            try:
+
+                os.remove(path)
+
+            except FileNotFoundError:
+
+                pass
+
+        return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Inspect or empty the artifact cache.")
+    parser.add_argument("command", choices = ["list", "evict", "clear"])
+    parser.add_argument("--directory", default = DEFAULT_DIRECTORY)
+    parser.add_argument("--max-bytes", type = int, default = 2**30)
+    args = parser.parse_args()
+
+    cache = ArtifactCache(args.directory, args.max_bytes)
+
+    if args.command == "list":
+
+        entries = cache.entries()
+
+        for path, size, _ in entries:
+
+            print(size, os.path.basename(path))
+
+        print(len(entries), "artifacts,", sum(size for _, size, _ in entries), "bytes")
+
+    elif args.command == "evict":
+
+        print(cache.evict(), "artifacts deleted")
+
+    else:
+
+        cache.clear()
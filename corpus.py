@@ -0,0 +1,610 @@
+# File contains a packed binary file format for pregenerated secret codes, read in chunks without loading the file
+# Generate or convert a corpus once, then read its codes in chunks with Corpus(file_name) or open_codes(file_name):
+#
+#     python corpus.py generate PreferFewer 4 6 1000000 PreferFewer_4_6.codes --compression gzip
+#     python corpus.py convert PreferFewer_4_6.txt PreferFewer_4_6.codes
+#     python corpus.py info PreferFewer_4_6.codes
+#
+# A corpus is a fixed header followed by the codes, one byte per peg holding the index of the peg's color:
+#     magic (8 bytes), version, compression (0 none, 1 gzip, 2 lzma), board length (uint16), number of codes (uint64),
+#     number of colors (uint8), length of the SCSA name (uint16), colors, SCSA name, then the pegs.
+# Only the pegs are compressed, so the header of any corpus can be read directly.
+
+import argparse
+import gzip
+import lzma
+import mmap
+import os
+import struct
+import sys
+from scsa import *
+from cache import *
+
+MAGIC = b"MMCORPUS"
+VERSION = 1
+HEADER = struct.Struct("<8sBBHQBH")
+COMPRESSIONS = {None: 0, "gzip": 1, "lzma": 2}
+
+def is_corpus(file_name):
+    """Checks whether a file is a packed corpus rather than a text file of codes
+
+    Args:
+        file_name (str): Name of file to check.
+
+    Returns:
+        bool: Returns whether the file starts with the corpus magic.
+    """
+
+    with open(file_name, "rb") as file:
+
+        return file.read(len(MAGIC)) == MAGIC
+
+def open_payload(file, compression, mode):
+    """Wraps a file positioned at the pegs in the stream that (de)compresses them
+
+    Args:
+        file (file): Binary file positioned at the start of the pegs.
+        compression (int): Compression code from the header.
+        mode (str): "rb" or "wb".
+
+    Returns:
+        file: Returns stream of uncompressed pegs.
+    """
+
+    if compression == 1:
+
+        return gzip.GzipFile(fileobj = file, mode = mode)
+
+    if compression == 2:
+
+        return lzma.LZMAFile(file, mode)
+
+    return file
+
+def write_packed(file_name, chunks, colors, board_length, scsa_name = "", compression = None):
+    """Writes pegs that are already packed to a corpus
+
+    Args:
+        file_name (str): Name of file to write.
+        chunks (iterable of bytes): Pegs of consecutive codes, one color index per byte.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        board_length (int): Number of pegs.
+        scsa_name (str, optional): Name of the SCSA the codes were generated from. Defaults to "".
+        compression (str, optional): None, "gzip" or "lzma". Defaults to None.
+
+    Returns:
+        int: Returns number of codes written.
+
+    Raises:
+        ValueError: Raised if a chunk does not hold whole codes.
+    """
+
+    colors_bytes = "".join(colors).encode("ascii")
+    name_bytes = scsa_name.encode("utf-8")
+    count = 0
+
+    with open(file_name, "wb") as file:
+
+        file.write(HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression], board_length, 0, len(colors), len(name_bytes)))
+        file.write(colors_bytes + name_bytes)
+
+        payload = open_payload(file, COMPRESSIONS[compression], "wb")
+
+        for packed in chunks:
+
+            if board_length == 0 or len(packed) % board_length != 0:
+
+                raise ValueError("every code must have " + str(board_length) + " pegs")
+
+            payload.write(packed)
+
+            count += len(packed)//board_length
+
+        if payload is not file:
+
+            payload.close()
+
+        # The number of codes is only known once they are all written
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression], board_length, count, len(colors), len(name_bytes)))
+
+    return count
+
+def write_corpus(file_name, codes, colors, board_length = None, scsa_name = "", compression = None, chunk_size = 65536):
+    """Writes codes to a packed corpus
+
+    Codes are packed chunk_size at a time, so any iterable of codes, including a generator, can be written
+    without holding them all in memory.
+
+    Args:
+        file_name (str): Name of file to write.
+        codes (iterable of strs): Codes to write.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        board_length (int, optional): Number of pegs. Defaults to the length of the first code.
+        scsa_name (str, optional): Name of the SCSA the codes were generated from. Defaults to "".
+        compression (str, optional): None, "gzip" or "lzma". Defaults to None.
+        chunk_size (int, optional): Codes packed at a time. Defaults to 65536.
+
+    Returns:
+        int: Returns number of codes written.
+
+    Raises:
+        ValueError: Raised if a code does not have board_length pegs or uses a color not in colors.
+    """
+
+    codes = iter(codes)
+    first = next(codes, None)
+
+    if board_length is None:
+
+        board_length = len(first) if first is not None else 0
+
+    colors_bytes = "".join(colors).encode("ascii")
+    table = bytes.maketrans(colors_bytes, bytes(range(len(colors))))
+
+    def pack():
+
+        chunk = [] if first is None else [first]
+
+        while True:
+
+            chunk.extend(itertools.islice(codes, chunk_size - len(chunk)))
+
+            if not chunk:
+
+                return
+
+            for code in chunk:
+
+                if len(code) != board_length:
+
+                    raise ValueError("code " + repr(code) + " does not have " + str(board_length) + " pegs")
+
+            joined = "".join(chunk).encode("ascii", "replace")
+
+            # Deleting every valid color leaves only the pegs of other colors
+            if joined.translate(None, colors_bytes):
+
+                code = next(code for code in chunk if not set(code) <= set(colors))
+
+                raise ValueError("code " + repr(code) + " uses a color not in " + "".join(colors))
+
+            yield joined.translate(table)
+
+            chunk = []
+
+    return write_packed(file_name, pack(), colors, board_length, scsa_name, compression)
+
+def convert(text_file, corpus_file, colors = None, scsa_name = None, compression = None):
+    """Converts a text file of codes, one per line, to a packed corpus
+
+    Files named as by SCSA.write_to_file give their SCSA name and number of colors; otherwise the colors are the
+    ones that appear in the file.
+
+    Args:
+        text_file (str): Name of text file to read.
+        corpus_file (str): Name of corpus file to write.
+        colors (list of chrs, optional): All possible colors that can be used to generate a code. Defaults to None.
+        scsa_name (str, optional): Name of the SCSA the codes were generated from. Defaults to None.
+        compression (str, optional): None, "gzip" or "lzma". Defaults to None.
+
+    Returns:
+        int: Returns number of codes converted.
+    """
+
+    parts = os.path.splitext(os.path.basename(text_file))[0].rsplit("_", 2)
+    named = len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit()
+
+    if scsa_name is None:
+
+        scsa_name = parts[0] if named else ""
+
+    if colors is None and named:
+
+        colors = [chr(i) for i in range(65,91)][:int(parts[2])]
+
+    if colors is None:
+
+        seen = set()
+
+        with open(text_file) as file:
+
+            for line in file:
+
+                seen.update(line.strip())
+
+        colors = sorted(seen)
+
+    with open(text_file) as file:
+
+        return write_corpus(corpus_file, (line.strip() for line in file if line.strip()), colors, None, scsa_name, compression)
+
+
+class Corpus:
+    """Packed corpus opened for reading
+
+    Uncompressed corpora are memory-mapped, so any code is read straight from the page cache. Compressed
+    corpora are decompressed as a stream, one chunk at a time. Either way at most one chunk of codes is held
+    in memory at once, however long the corpus is.
+    """
+
+    def __init__(self, file_name, chunk_size = 65536):
+        """Constructor for Corpus
+
+        Args:
+            file_name (str): Name of corpus file.
+            chunk_size (int, optional): Codes decoded at a time. Defaults to 65536.
+
+        Raises:
+            ValueError: Raised if the file is not a corpus.
+        """
+
+        self.file_name = file_name
+        self.chunk_size = chunk_size
+        self.file = open(file_name, "rb")
+
+        magic, version, self.compression, self.board_length, self.count, num_colors, name_length = HEADER.unpack(self.file.read(HEADER.size))
+
+        if magic != MAGIC or version != VERSION:
+
+            self.file.close()
+
+            raise ValueError(file_name + " is not a corpus")
+
+        self.colors = list(self.file.read(num_colors).decode("ascii"))
+        self.scsa_name = self.file.read(name_length).decode("utf-8")
+        self.offset = HEADER.size + num_colors + name_length
+        self.table = bytes.maketrans(bytes(range(num_colors)), "".join(self.colors).encode("ascii"))
+        self.map = None
+        self.stream = None
+        self.buffer = ""
+        self.buffer_start = 0
+
+        if self.compression == 0 and self.count*self.board_length > 0:
+
+            self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    def __len__(self):
+
+        return self.count
+
+    def decode(self, packed):
+        """Turns packed pegs back into one string of colors
+
+        Args:
+            packed (bytes): Pegs of consecutive codes.
+
+        Returns:
+            str: Returns codes joined together.
+        """
+
+        return packed.translate(self.table).decode("ascii")
+
+    def split(self, joined):
+        """Splits codes joined together
+
+        Args:
+            joined (str): Codes joined together.
+
+        Returns:
+            list of strs: Returns codes.
+        """
+
+        length = self.board_length
+
+        return [joined[i:i + length] for i in range(0, len(joined), length)]
+
+    def restart(self):
+        """Starts decompressing again from the first code
+        """
+
+        if self.stream is not None:
+
+            self.stream.close()
+
+        self.file.seek(self.offset)
+
+        self.stream = open_payload(self.file, self.compression, "rb")
+        self.buffer = ""
+        self.buffer_start = 0
+
+        return
+
+    def read_chunk(self):
+        """Decompresses the chunk after the buffered one
+
+        Returns:
+            bool: Returns whether there were codes left to read.
+        """
+
+        self.buffer_start += len(self.buffer)//self.board_length if self.board_length else 0
+        self.buffer = self.decode(self.stream.read(self.chunk_size*self.board_length))
+
+        return len(self.buffer) > 0
+
+    def code(self, index):
+        """Reads one code
+
+        Reading codes of a compressed corpus in increasing order decompresses it only once.
+
+        Args:
+            index (int): Position of the code, starting from 0.
+
+        Returns:
+            str: Returns code.
+
+        Raises:
+            IndexError: Raised if there is no code at that position.
+        """
+
+        if not 0 <= index < self.count:
+
+            raise IndexError("corpus index out of range")
+
+        length = self.board_length
+
+        if self.map is not None:
+
+            start = self.offset + index*length
+
+            return self.decode(self.map[start:start + length])
+
+        if self.stream is None or index < self.buffer_start:
+
+            self.restart()
+
+        while index >= self.buffer_start + len(self.buffer)//length:
+
+            if not self.read_chunk():
+
+                raise IndexError("corpus ends before its header says")
+
+        start = (index - self.buffer_start)*length
+
+        return self.buffer[start:start + length]
+
+    def __getitem__(self, index):
+
+        return self.code(index)
+
+    def chunks(self):
+        """Reads the codes chunk_size at a time
+
+        Yields:
+            list of strs: Next chunk of codes.
+        """
+
+        length = self.board_length
+
+        if self.map is not None:
+
+            for first in range(0, self.count, self.chunk_size):
+
+                start = self.offset + first*length
+                stop = self.offset + min(first + self.chunk_size, self.count)*length
+
+                yield self.split(self.decode(self.map[start:stop]))
+
+            return
+
+        if length == 0:
+
+            return
+
+        self.file.seek(self.offset)
+
+        stream = open_payload(self.file, self.compression, "rb")
+
+        try:
+
+            while True:
+
+                packed = stream.read(self.chunk_size*length)
+
+                if not packed:
+
+                    break
+
+                yield self.split(self.decode(packed))
+
+        finally:
+
+            if stream is not self.file:
+
+                stream.close()
+
+            # Random access restarts its own stream after the file was moved
+            self.stream = None
+
+        return
+
+    def __iter__(self):
+
+        for chunk in self.chunks():
+
+            yield from chunk
+
+    def close(self):
+        """Closes the corpus
+        """
+
+        if self.map is not None:
+
+            self.map.close()
+
+            self.map = None
+
+        if self.stream is not None and self.stream is not self.file:
+
+            self.stream.close()
+
+        self.stream = None
+
+        self.file.close()
+
+        return
+
+
+def open_codes(file_name):
+    """Opens pregenerated codes, packed or one per line
+
+    Args:
+        file_name (str): Name of file to read secret codes from.
+
+    Returns:
+        Corpus or list of strs: Returns codes, which support len, iteration and indexing either way.
+    """
+
+    if is_corpus(file_name):
+
+        return Corpus(file_name)
+
+    return read_from_file(file_name)
+
+def generate_corpus(scsa, file_name, length, colors, num_codes, compression = None, chunk_size = 65536, seed = None):
+    """Generates codes from an SCSA straight into a packed corpus
+
+    With NumPy installed the codes are drawn with the SCSA's generate_array, a chunk at a time; otherwise they
+    come from iter_codes and the random module.
+
+    Args:
+        scsa (SCSA): SCSA to generate codes with.
+        file_name (str): Name of file to write.
+        length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        num_codes (int): Number of codes to generate.
+        compression (str, optional): None, "gzip" or "lzma". Defaults to None.
+        chunk_size (int, optional): Codes generated at a time. Defaults to 65536.
+        seed (int, optional): Seed of the random number generator. Defaults to None, for an unseeded one.
+
+    Returns:
+        int: Returns number of codes written.
+    """
+
+    try:
+
+        numpy = load_numpy()
+
+    except ImportError:
+
+        numpy = None
+
+    if numpy is None:
+
+        state = random.getstate()
+
+        if seed is not None:
+
+            random.seed(seed)
+
+        try:
+
+            codes = itertools.chain.from_iterable(scsa.iter_codes(length, colors, chunk_size, num_codes))
+
+            return write_corpus(file_name, codes, colors, length, scsa.name, compression, chunk_size)
+
+        finally:
+
+            # Seeding for the corpus must not change what the random module draws next
+            if seed is not None:
+
+                random.setstate(state)
+
+    rng = numpy.random.default_rng(seed)
+    chunks = (scsa.generate_array(length, colors, min(chunk_size, num_codes - first), rng).tobytes() for first in range(0, num_codes, chunk_size))
+
+    return write_packed(file_name, chunks, colors, length, scsa.name, compression)
+
+def cached_corpus(scsa, length, colors, num_codes, seed, cache = None, compression = None):
+    """Finds the corpus generate_corpus makes for these settings, generating it only if it is not cached
+
+    Args:
+        scsa (SCSA): SCSA to generate codes with.
+        length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        num_codes (int): Number of codes to generate.
+        seed (int): Seed of the random number generator.
+        cache (ArtifactCache, optional): Cache to look in. Defaults to the default cache directory.
+        compression (str, optional): None, "gzip" or "lzma". Defaults to None.
+
+    Returns:
+        str: Returns file name of the corpus.
+    """
+
+    try:
+
+        generator = "numpy " + load_numpy().__version__
+
+    except ImportError:
+
+        generator = "random"
+
+    cache = cache if cache is not None else ArtifactCache()
+    params = {
+        "scsa": scsa.name,
+        "board_length": length,
+        "colors": list_to_str(colors),
+        "count": num_codes,
+        "seed": seed,
+        "compression": compression,
+        "generator": generator,
+        "version": source_version(type(scsa), generate_corpus),
+    }
+
+    return cache.fetch("corpus", params, lambda file_name: generate_corpus(scsa, file_name, length, colors, num_codes, compression, seed = seed), ".codes")
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Create and inspect packed corpora of secret codes.")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    generate_parser = commands.add_parser("generate")
+    generate_parser.add_argument("scsa_name")
+    generate_parser.add_argument("board_length", type = int)
+    generate_parser.add_argument("num_colors", type = int)
+    generate_parser.add_argument("num_codes", type = int)
+    generate_parser.add_argument("corpus_file")
+    generate_parser.add_argument("--compression", choices = ["gzip", "lzma"])
+    generate_parser.add_argument("--seed", type = int)
+
+    convert_parser = commands.add_parser("convert")
+    convert_parser.add_argument("text_file")
+    convert_parser.add_argument("corpus_file")
+    convert_parser.add_argument("--colors", help = "colors as one string, e.g. ABCDEF")
+    convert_parser.add_argument("--scsa")
+    convert_parser.add_argument("--compression", choices = ["gzip", "lzma"])
+
+    info_parser = commands.add_parser("info")
+    info_parser.add_argument("corpus_file")
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+
+        scsa = scsa_by_name(args.scsa_name)
+
+        if scsa is None:
+
+            print("Unrecognized SCSA.")
+            sys.exit(1)
+
+        colors = [chr(i) for i in range(65,91)][:args.num_colors]
+
+        print(generate_corpus(scsa, args.corpus_file, args.board_length, colors, args.num_codes, args.compression, seed = args.seed), "codes written")
+
+    elif args.command == "convert":
+
+        colors = list(args.colors) if args.colors else None
+
+        print(convert(args.text_file, args.corpus_file, colors, args.scsa, args.compression), "codes converted")
+
+    else:
+
+        corpus = Corpus(args.corpus_file)
+
+        print("SCSA:", corpus.scsa_name or "-")
+        print("Game:", corpus.board_length, "Pegs", len(corpus.colors), "Colors")
+        print("Codes:", len(corpus))
+        print("Compression:", {0: "none", 1: "gzip", 2: "lzma"}[corpus.compression])
+
+        corpus.close()
@@ -0,0 +1,520 @@
+# File contains a coordinator that hands the rounds of Mastermind tournaments to worker processes over TCP
+# Start a coordinator, then any number of workers, on the same or other machines:
+#     python distributed.py coordinator --port 5555 --tournament RAM PreferFewer 4 6 10000
+#     python distributed.py worker <coordinator host> 5555
+
+import argparse
+import json
+import math
+import queue
+import socket
+import socketserver
+import sys
+import threading
+from parallel import *
+from registry import *
+
+def send_message(stream, message):
+    """Writes one message as a line of JSON
+
+    Args:
+        stream (file): Binary stream of a socket.
+        message (dict): Message to send.
+    """
+
+    stream.write((json.dumps(message) + "\n").encode())
+    stream.flush()
+
+    return
+
+def receive_message(stream):
+    """Reads one message written by send_message
+
+    Args:
+        stream (file): Binary stream of a socket.
+
+    Returns:
+        dict or None: Returns message, or None if the other side closed the connection.
+    """
+
+    line = stream.readline()
+
+    if not line:
+
+        return None
+
+    return json.loads(line)
+
+
+class Tournament:
+    """Settings of one tournament, as sent to workers
+    """
+
+    def __init__(self, player_name, scsa_name, board_length, num_colors, num_rounds, seed = 0, guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300):
+        """Constructor for Tournament
+
+        Args:
+            player_name (str): Name of the player, as accepted by player_by_name.
+            scsa_name (str): Name of the SCSA, as accepted by scsa_by_name.
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors.
+            num_rounds (int): Number of rounds to play.
+            seed (int or str, optional): Seed of the tournament. Defaults to 0.
+            guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
+            round_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the tournament. Defaults to 300.
+        """
+
+        self.player_name = player_name
+        self.scsa_name = scsa_name
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.num_rounds = num_rounds
+        self.seed = seed
+        self.guess_cutoff = guess_cutoff
+        self.round_time_cutoff = round_time_cutoff
+        self.tournament_time_cutoff = tournament_time_cutoff
+
+    def settings(self):
+        """Gives the settings as a dictionary that can be sent as JSON
+
+        Returns:
+            dict: Returns settings.
+        """
+
+        return dict(vars(self))
+
+    def mastermind(self):
+        """Creates the Mastermind that merges the tournament's rounds
+
+        Returns:
+            ParallelMastermind: Returns Mastermind with the tournament's board and cutoffs.
+        """
+
+        colors = [chr(i) for i in range(65,91)][:self.num_colors]
+
+        return ParallelMastermind(self.board_length, colors, self.guess_cutoff, self.round_time_cutoff, self.tournament_time_cutoff, 1, self.seed)
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    """TCP server of a coordinator, which can listen again on a port left in TIME_WAIT by an earlier run
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Coordinator:
+    """Splits tournaments into chunks of rounds and hands them to workers that connect over TCP
+
+    Workers ask for a chunk, play it and send back the result of every round. A chunk whose worker disconnects
+    or does not answer within timeout is put back in the queue for another worker, up to max_retries times.
+    Rounds are seeded as in ParallelMastermind, so a chunk gives the same results on whichever worker plays it,
+    and results are merged in round order with the same cutoff and failure rules.
+
+    Messages are lines of JSON. A worker sends {"type": "ready"}; the coordinator answers with either
+    {"type": "chunk", "id", "tournament", "settings", "start", "stop"} or {"type": "done"}; the worker answers
+    a chunk with {"type": "result", "id", "played"}.
+    """
+
+    def __init__(self, host = "0.0.0.0", port = 5555, chunk_size = 100, timeout = 600, max_retries = 3):
+        """Constructor for Coordinator
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "0.0.0.0".
+            port (int, optional): Port to listen on, 0 for any free port. Defaults to 5555.
+            chunk_size (int, optional): Number of rounds per chunk. Defaults to 100.
+            timeout (float, optional): Seconds a worker may take to play a chunk. Defaults to 600.
+            max_retries (int, optional): Times a chunk is handed out again after its worker is lost. Defaults to 3.
+        """
+
+        self.host = host
+        self.port = port
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.tournaments = []
+        self.chunks = {}
+        self.pending = queue.Queue()
+        self.played = {}
+        self.retries = {}
+        self.failed = set()
+        self.first_failure = {}
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.server = None
+
+    def add_tournament(self, tournament):
+        """Adds a tournament to be played
+
+        Args:
+            tournament (Tournament): Tournament to play.
+
+        Returns:
+            int: Returns index of the tournament in the list run returns.
+        """
+
+        index = len(self.tournaments)
+
+        self.tournaments.append(tournament)
+
+        for start in range(1, tournament.num_rounds + 1, self.chunk_size):
+
+            chunk_id = len(self.chunks)
+
+            self.chunks[chunk_id] = (index, start, min(start + self.chunk_size, tournament.num_rounds + 1))
+            self.retries[chunk_id] = 0
+
+            self.pending.put(chunk_id)
+
+        return index
+
+    def needed(self, chunk_id):
+        """Checks whether a chunk's rounds can still count
+
+        Args:
+            chunk_id (int): Chunk to check.
+
+        Returns:
+            bool: Returns False if an earlier round of the same tournament ended in failure.
+        """
+
+        index, start, _ = self.chunks[chunk_id]
+
+        return start <= self.first_failure.get(index, math.inf)
+
+    def next_chunk(self):
+        """Takes the next chunk that still needs playing
+
+        Returns:
+            int or None: Returns chunk id, or None once every chunk is settled.
+        """
+
+        while not self.finished.is_set():
+
+            try:
+
+                chunk_id = self.pending.get(timeout = 0.5)
+
+            except queue.Empty:
+
+                continue
+
+            with self.lock:
+
+                if self.needed(chunk_id):
+
+                    return chunk_id
+
+                self.settle(chunk_id, [])
+
+        return None
+
+    def settle(self, chunk_id, played):
+        """Records the rounds of a chunk; the caller holds the lock
+
+        Args:
+            chunk_id (int): Chunk that was played or dropped.
+            played (list of lists): Round number, result, number of guesses and seconds of every round played.
+        """
+
+        self.played[chunk_id] = [tuple(item) for item in played]
+
+        for round_number, result, _, _ in played:
+
+            if result == "failure":
+
+                tournament = self.chunks[chunk_id][0]
+
+                self.first_failure[tournament] = min(self.first_failure.get(tournament, math.inf), round_number)
+
+        if len(self.played) + len(self.failed) == len(self.chunks):
+
+            self.finished.set()
+
+        return
+
+    def requeue(self, chunk_id):
+        """Puts back a chunk whose worker was lost
+
+        Args:
+            chunk_id (int): Chunk to hand out again.
+        """
+
+        with self.lock:
+
+            self.retries[chunk_id] += 1
+
+            if self.retries[chunk_id] > self.max_retries:
+
+                self.failed.add(chunk_id)
+
+                if len(self.played) + len(self.failed) == len(self.chunks):
+
+                    self.finished.set()
+
+                return
+
+        self.pending.put(chunk_id)
+
+        return
+
+    def serve_worker(self, connection):
+        """Hands chunks to one connected worker until there are none left
+
+        Args:
+            connection (socket.socket): Connection to the worker.
+        """
+
+        connection.settimeout(self.timeout)
+
+        stream = connection.makefile("rwb")
+        chunk_id = None
+
+        try:
+
+            while True:
+
+                message = receive_message(stream)
+
+                if message is None:
+
+                    break
+
+                if message["type"] == "result":
+
+                    with self.lock:
+
+                        if chunk_id == message["id"] and chunk_id not in self.played:
+
+                            self.settle(chunk_id, message["played"])
+
+                    chunk_id = None
+
+                chunk_id = self.next_chunk()
+
+                if chunk_id is None:
+
+                    send_message(stream, {"type": "done"})
+
+                    break
+
+                index, start, stop = self.chunks[chunk_id]
+
+                send_message(stream, {"type": "chunk", "id": chunk_id, "tournament": index, "settings": self.tournaments[index].settings(), "start": start, "stop": stop})
+
+        except (OSError, ValueError):
+
+            pass
+
+        finally:
+
+            if chunk_id is not None:
+
+                self.requeue(chunk_id)
+
+            stream.close()
+
+        return
+
+    def run(self):
+        """Serves workers until every chunk is played, then merges and prints the results
+
+        Returns:
+            list of dicts: Returns number of wins, losses, and failures of every tournament, in the order added.
+
+        Raises:
+            RuntimeError: Raised if a chunk was lost more than max_retries times.
+        """
+
+        coordinator = self
+
+        class Handler(socketserver.BaseRequestHandler):
+
+            def handle(self):
+
+                coordinator.serve_worker(self.request)
+
+        self.server = CoordinatorServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+
+        thread = threading.Thread(target = self.server.serve_forever, daemon = True)
+        thread.start()
+
+        if self.chunks:
+
+            self.finished.wait()
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        if self.failed:
+
+            raise RuntimeError("Chunks " + str(sorted(self.failed)) + " were lost more than " + str(self.max_retries) + " times")
+
+        return self.merge()
+
+    def merge(self):
+        """Merges the played chunks of every tournament in round order and prints the results
+
+        Returns:
+            list of dicts: Returns number of wins, losses, and failures of every tournament, in the order added.
+        """
+
+        all_results = []
+
+        for index, tournament in enumerate(self.tournaments):
+
+            chunk_ids = sorted((start, chunk_id) for chunk_id, (owner, start, _) in self.chunks.items() if owner == index)
+
+            mastermind = tournament.mastermind()
+            results = {"win": 0, "loss": 0, "failure": 0}
+
+            mastermind.merge_chunks((self.played[chunk_id] for _, chunk_id in chunk_ids), results)
+            mastermind.print_results(player_by_name(tournament.player_name), results, tournament.num_rounds)
+
+            all_results.append(results)
+
+        return all_results
+
+
+def play_assigned_chunk(message, players):
+    """Plays the rounds of a chunk sent by the coordinator
+
+    Args:
+        message (dict): Chunk message.
+        players (dict): Player of every tournament played so far, created on first use.
+
+    Returns:
+        list of tuples: Returns play_seeded_round's result for each round, up to the first failure.
+    """
+
+    settings = message["settings"]
+
+    scsa = scsa_by_name(settings["scsa_name"])
+    colors = [chr(i) for i in range(65,91)][:settings["num_colors"]]
+
+    if message["tournament"] not in players:
+
+        players[message["tournament"]] = player_by_name(settings["player_name"])
+        players[message["tournament"]].prepare(settings["board_length"], colors, scsa)
+
+    player = players[message["tournament"]]
+    played = []
+
+    for index in range(message["start"], message["stop"]):
+
+        played.append(play_seeded_round(settings["board_length"], colors, settings["guess_cutoff"], settings["round_time_cutoff"], player, scsa, settings["seed"], index))
+
+        if played[-1][1] == "failure":
+
+            break
+
+    return played
+
+def run_worker(host, port, attempts = 10, wait = 1):
+    """Connects to a coordinator and plays chunks until it has none left or it goes away
+
+    Args:
+        host (str): Address of the coordinator.
+        port (int): Port of the coordinator.
+        attempts (int, optional): Times to try connecting before giving up. Defaults to 10.
+        wait (float, optional): Seconds between connection attempts. Defaults to 1.
+
+    Returns:
+        int: Returns number of chunks played.
+    """
+
+    for attempt in range(attempts):
+
+        try:
+
+            connection = socket.create_connection((host, port))
+
+            break
+
+        except OSError:
+
+            if attempt == attempts - 1:
+
+                raise
+
+            time.sleep(wait)
+
+    stream = connection.makefile("rwb")
+    players = {}
+    chunks = 0
+
+    try:
+
+        send_message(stream, {"type": "ready"})
+
+        while True:
+
+            message = receive_message(stream)
+
+            if message is None or message["type"] == "done":
+
+                break
+
+            played = play_assigned_chunk(message, players)
+            chunks += 1
+
+            send_message(stream, {"type": "result", "id": message["id"], "played": played})
+
+    except ConnectionError:
+
+        # A coordinator that has finished closes every connection, which a worker can meet as soon as its handshake
+        pass
+
+    finally:
+
+        stream.close()
+        connection.close()
+
+    return chunks
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Play Mastermind tournaments on workers connected over TCP.")
+    subparsers = parser.add_subparsers(dest = "mode", required = True)
+
+    coordinator_parser = subparsers.add_parser("coordinator")
+    coordinator_parser.add_argument("--host", default = "0.0.0.0")
+    coordinator_parser.add_argument("--port", type = int, default = 5555)
+    coordinator_parser.add_argument("--tournament", nargs = 5, action = "append", required = True, metavar = ("PLAYER", "SCSA", "LENGTH", "COLORS", "ROUNDS"))
+    coordinator_parser.add_argument("--seed", default = "0")
+    coordinator_parser.add_argument("--chunk-size", type = int, default = 100)
+    coordinator_parser.add_argument("--timeout", type = float, default = 600)
+    coordinator_parser.add_argument("--retries", type = int, default = 3)
+
+    worker_parser = subparsers.add_parser("worker")
+    worker_parser.add_argument("host")
+    worker_parser.add_argument("port", type = int)
+
+    args = parser.parse_args()
+
+    if args.mode == "worker":
+
+        print("Chunks played:", run_worker(args.host, args.port))
+
+        sys.exit(0)
+
+    coordinator = Coordinator(args.host, args.port, args.chunk_size, args.timeout, args.retries)
+
+    for player_name, scsa_name, board_length, num_colors, num_rounds in args.tournament:
+
+        if player_by_name(player_name) is None:
+
+            print("Unrecognized player.")
+            sys.exit(1)
+
+        if scsa_by_name(scsa_name) is None:
+
+            print("Unrecognized SCSA.")
+            sys.exit(1)
+
+        coordinator.add_tournament(Tournament(player_name, scsa_name, int(board_length), int(num_colors), int(num_rounds), args.seed))
+
+    coordinator.run()
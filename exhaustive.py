@@ -0,0 +1,330 @@
+# File contains an evaluation that plays a player against every code an SCSA can generate
+# Run exhaustive.py with a player, an SCSA and a board to print the guesses taken, worst case and mean over every code:
+#
+#     python exhaustive.py RAM PreferFewer 4 6 --processes 4
+
+import argparse
+import ast
+import collections
+import hashlib
+import inspect
+import os
+import sys
+import parallel
+from parallel import *
+from registry import *
+from cache import *
+
+def play_codes(chunk):
+    """Plays every code of a chunk in a worker process, whatever the results
+
+    Args:
+        chunk (range): Positions of the codes to play in the worker's SharedCodes.
+
+    Returns:
+        list of tuples: Returns round number, result, number of guesses and seconds of every code.
+    """
+
+    return [play_seeded_round(*parallel.worker_settings, index + 1, parallel.worker_codes.code(index)) for index in chunk]
+
+def repository_imports(path):
+    """Lists a source file and every module of this directory it imports, directly or through those modules
+
+    Imports are read from the source rather than from sys.modules, so the list does not depend on what else
+    happens to be loaded.
+
+    Args:
+        path (str): Path of the source file.
+
+    Returns:
+        list of strs: Returns paths of the file and of the modules it imports.
+    """
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    found = set()
+    stack = [os.path.abspath(path)]
+
+    while stack:
+
+        path = stack.pop()
+
+        if path in found:
+
+            continue
+
+        found.add(path)
+
+        with open(path, "rb") as file:
+
+            tree = ast.parse(file.read())
+
+        for node in ast.walk(tree):
+
+            if isinstance(node, ast.Import):
+
+                names = [alias.name for alias in node.names]
+
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+
+                names = [node.module]
+
+            else:
+
+                continue
+
+            for name in names:
+
+                module_path = os.path.join(directory, name.split(".")[0] + ".py")
+
+                if os.path.isfile(module_path):
+
+                    stack.append(module_path)
+
+    return sorted(found)
+
+def code_version(player):
+    """Fingerprints the code a player runs and the settings it was made with
+
+    The player's module and this one are included with every module of this directory they import, directly or
+    through other modules, since the player and the rounds it plays can call into any of them.
+
+    Args:
+        player (Player): Player to fingerprint.
+
+    Returns:
+        str: Returns hex digest.
+    """
+
+    paths = repository_imports(inspect.getsourcefile(type(player))) + repository_imports(__file__)
+    settings = sorted((name, value) for name, value in vars(player).items() if isinstance(value, (int, float, str, bool, type(None))))
+
+    return hashlib.sha256((file_version(*paths) + type(player).__name__ + repr(settings)).encode()).hexdigest()
+
+class ExhaustiveEvaluation:
+    """Plays a player once against every code an SCSA can generate
+
+    Each code is played by a fresh copy of the player with the random module seeded from the code's position,
+    as in ParallelMastermind, so the numbers only change when the player's code or settings change. Players that
+    learn across rounds are not supported: nothing learned in one round reaches the next, so they are evaluated
+    as they play their first round. Reports
+    are kept in an ArtifactCache under the fingerprint of the player and the configuration.
+    """
+
+    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,71)], guess_cutoff = 100, round_time_cutoff = 5, processes = None, seed = 0, cache_dir = DEFAULT_DIRECTORY):
+        """Constructor for ExhaustiveEvaluation
+
+        Args:
+            board_length (int, optional): Number of pegs. Defaults to 4.
+            colors (list of chrs, optional): All possible colors that can be used to generate a code. Defaults to A to F.
+            guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
+            round_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            processes (int, optional): Number of worker processes, 1 to play in this process. Defaults to the number of CPUs.
+            seed (int or str, optional): Seed the rounds' seeds are derived from. Defaults to 0.
+            cache_dir (str, optional): Directory of the artifact cache, None to not cache. Defaults to ".cache/artifacts".
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.guess_cutoff = guess_cutoff
+        self.round_time_cutoff = round_time_cutoff
+        self.processes = processes if processes is not None else multiprocessing.cpu_count()
+        self.seed = seed
+        self.cache = ArtifactCache(cache_dir) if cache_dir is not None else None
+
+    def cache_params(self, player, scsa):
+        """Describes everything a report depends on
+
+        Args:
+            player (Player): Player evaluated.
+            scsa (SCSA): SCSA whose codes are played.
+
+        Returns:
+            dict: Returns fingerprint of the player and the configuration.
+        """
+
+        return {
+            "player": code_version(player),
+            "scsa": scsa.name,
+            "board_length": self.board_length,
+            "colors": "".join(self.colors),
+            "guess_cutoff": self.guess_cutoff,
+            "round_time_cutoff": self.round_time_cutoff,
+            "seed": str(self.seed),
+        }
+
+    def play_all(self, player, scsa, codes):
+        """Plays every code in parallel
+
+        Args:
+            player (Player): Player to evaluate.
+            scsa (SCSA): SCSA the codes were generated from, as passed to the player.
+            codes (SharedCodes): Codes to play.
+
+        Returns:
+            list of tuples: Returns round number, result, number of guesses and seconds of every code, in order.
+        """
+
+        player.prepare(self.board_length, self.colors, scsa)
+
+        settings = (self.board_length, self.colors, self.guess_cutoff, self.round_time_cutoff, player, scsa, self.seed)
+        chunk_size = max(1, len(codes)//(self.processes*8))
+        chunks = [range(i, min(i + chunk_size, len(codes))) for i in range(0, len(codes), chunk_size)]
+
+        if self.processes == 1:
+
+            parallel.start_worker(settings, codes.handle)
+
+            try:
+
+                played = [item for chunk in chunks for item in play_codes(chunk)]
+
+            finally:
+
+                parallel.worker_codes.close()
+
+            return played
+
+        with multiprocessing.Pool(self.processes, initializer = parallel.start_worker, initargs = (settings, codes.handle)) as pool:
+
+            return [item for chunk in pool.imap(play_codes, chunks) for item in chunk]
+
+    def report(self, player, scsa, codes, played):
+        """Summarizes the results of every code
+
+        Args:
+            player (Player): Player evaluated.
+            scsa (SCSA): SCSA whose codes were played.
+            codes (list of strs): Codes played, in order.
+            played (list of tuples): Round number, result, number of guesses and seconds of every code.
+
+        Returns:
+            dict: Returns report.
+        """
+
+        results = {"win": 0, "loss": 0, "failure": 0}
+        distribution = collections.Counter()
+        total = 0
+        weighted = 0
+        weight = 0
+        slowest = None
+
+        for code, (_, result, guesses, duration) in zip(codes, played):
+
+            results[result] += 1
+
+            if result == "win":
+
+                probability = scsa.pmf(code, self.colors)
+
+                distribution[guesses] += 1
+                total += guesses
+                weighted += probability*guesses
+                weight += probability
+
+            if slowest is None or duration > slowest[1]:
+
+                slowest = (code, duration)
+
+        times = [duration for _, _, _, duration in played]
+
+        return {
+            "player": player.player_name,
+            "scsa": scsa.name,
+            "board_length": self.board_length,
+            "num_colors": len(self.colors),
+            "codes": len(codes),
+            "results": results,
+            "distribution": {str(guesses): distribution[guesses] for guesses in sorted(distribution)},
+            "worst": max(distribution) if results["win"] == len(codes) else None,
+            "mean": total/results["win"] if results["win"] else None,
+            "expected": weighted/weight if weight else None,
+            "mean_time": sum(times)/len(times) if times else 0,
+            "max_time": slowest[1] if slowest else 0,
+            "slowest_code": slowest[0] if slowest else None,
+            "per_code": [[code, result, guesses, duration] for code, (_, result, guesses, duration) in zip(codes, played)],
+        }
+
+    def evaluate(self, player, scsa, use_cache = True):
+        """Plays every code of the SCSA, or loads the report of an earlier identical evaluation
+
+        Args:
+            player (Player): Player to evaluate.
+            scsa (SCSA): SCSA whose codes are played.
+            use_cache (bool, optional): Whether to read and write cached reports. Defaults to True.
+
+        Returns:
+            dict: Returns report, as from report.
+        """
+
+        def build():
+
+            codes = scsa.code_space(self.board_length, self.colors)
+            shared = SharedCodes(codes, self.colors, self.board_length)
+
+            try:
+
+                played = self.play_all(player, scsa, shared) if codes else []
+
+            finally:
+
+                shared.unlink()
+
+            return self.report(player, scsa, codes, played)
+
+        if not use_cache or self.cache is None:
+
+            return build()
+
+        return self.cache.fetch_json("exhaustive", self.cache_params(player, scsa), build)
+
+def print_report(report):
+    """Prints the summary of an exhaustive evaluation
+
+    Args:
+        report (dict): Report, as from ExhaustiveEvaluation.report.
+    """
+
+    print("Player:", report["player"])
+    print("Game:", report["board_length"], "Pegs", report["num_colors"], "Colors")
+    print("SCSA:", report["scsa"], "Codes:", report["codes"])
+    print("Results:", report["results"])
+    print("Guesses:", report["distribution"])
+    print("Worst case:", report["worst"], "Mean:", report["mean"], "Expected:", report["expected"])
+    print("Time per code: mean", report["mean_time"], "max", report["max_time"], "(" + str(report["slowest_code"]) + ")")
+
+    return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Play a player against every code an SCSA can generate.")
+    parser.add_argument("player_name")
+    parser.add_argument("scsa_name")
+    parser.add_argument("board_length", type = int)
+    parser.add_argument("num_colors", type = int)
+    parser.add_argument("--processes", type = int, default = None)
+    parser.add_argument("--seed", default = "0")
+    parser.add_argument("--no-cache", action = "store_true")
+    args = parser.parse_args()
+
+    player = player_by_name(args.player_name)
+    scsa = scsa_by_name(args.scsa_name)
+
+    if player is None:
+
+        print("Unrecognized player.")
+        sys.exit(1)
+
+    if scsa is None:
+
+        print("Unrecognized SCSA.")
+        sys.exit(1)
+
+    if learns_across_rounds(player):
+
+        print("Warning:", args.player_name, "learns across rounds, but every code is played by a fresh copy of it")
+
+    colors = [chr(i) for i in range(65,91)][:args.num_colors]
+    evaluation = ExhaustiveEvaluation(args.board_length, colors, processes = args.processes, seed = args.seed)
+
+    print_report(evaluation.evaluate(player, scsa, not args.no_cache))
@@ -0,0 +1,593 @@
+# File contains a player that runs in a separate process and talks to the engine over stdin and stdout
+# Run python external.py play 4 6 PreferFewer 100 --player "python external.py serve RAM" to play RAM over stdio
+#
+# The engine sends one request per line and the player answers guess requests with one line:
+#     guess <board length> <colors> <scsa name> <exact> <other> <guesses> [<seconds left> <guesses left>]
+#                                                                            answered with the guess
+#     answer <code>                                                          the round was won; no answer
+#     quit                                                                   the player should exit
+#
+# Any Player registered in registry.py can be served this way, e.g. python external.py serve RAM
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import os
+import shlex
+import sys
+import threading
+from mastermind import *
+from registry import *
+
+background_loop = None
+background_lock = threading.Lock()
+
+def event_loop():
+    """Returns the event loop that drives external players, starting it in a background thread on first use
+
+    Returns:
+        asyncio.AbstractEventLoop: Returns running event loop.
+    """
+
+    global background_loop
+
+    with background_lock:
+
+        if background_loop is None:
+
+            background_loop = asyncio.new_event_loop()
+
+            threading.Thread(target = background_loop.run_forever, daemon = True).start()
+
+    return background_loop
+
+def run(coroutine):
+    """Runs a coroutine on the background event loop and waits for its result
+
+    Args:
+        coroutine (coroutine): Coroutine to run.
+
+    Returns:
+        Returns result of the coroutine.
+    """
+
+    return asyncio.run_coroutine_threadsafe(coroutine, event_loop()).result()
+
+def encode_request(board_length, colors, scsa, last_response, budget = None):
+    """Writes a guess request as a line
+
+    Args:
+        board_length (int): Number of pegs of secret code.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        scsa (SCSA): SCSA used to generate secret code.
+        last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+        budget (Budget, optional): Time and guesses left, sent as the seconds and guesses left. Defaults to None.
+
+    Returns:
+        str: Returns request line, without the newline.
+    """
+
+    fields = ["guess", board_length, "".join(colors), scsa.name or "-", last_response[0], last_response[1], last_response[2]]
+
+    if budget is not None:
+
+        fields += ["{:.6f}".format(max(budget.remaining(), 0)), budget.guesses]
+
+    return " ".join(str(field) for field in fields)
+
+def command_name(command):
+    """Names an external player after the program it runs
+
+    Args:
+        command (list of strs): Command that starts the player.
+
+    Returns:
+        str: Returns the name of the script run by an interpreter such as python, followed by the served player's name
+             for external.py serve, otherwise the executable's name.
+    """
+
+    name = os.path.basename(command[0])
+
+    if name.startswith(("python", "pypy")) and len(command) > 1:
+
+        if command[1] == "-m" and len(command) > 2:
+
+            return command[2]
+
+        if not command[1].startswith("-"):
+
+            script = os.path.splitext(os.path.basename(command[1]))[0]
+
+            # Every player served by this file runs the same script, so the served player's name tells them apart
+            if script == "external" and len(command) > 3 and command[2] == "serve":
+
+                return script + "-" + command[3]
+
+            return script
+
+    return name
+
+def decode_request(fields):
+    """Reads the arguments of make_timed_guess from the fields of a guess request
+
+    Args:
+        fields (list of strs): Request line split on spaces, starting with "guess".
+
+    Returns:
+        tuple: Returns board length, colors, SCSA, last response and the budget, or None if the request has none.
+    """
+
+    scsa = scsa_by_name(fields[3])
+
+    # SCSAs only known to the engine, such as mystery ones, are passed on by name
+    if scsa is None:
+
+        scsa = SCSA()
+        scsa.name = "" if fields[3] == "-" else fields[3]
+
+    budget = Budget(float(fields[7]), guesses = float(fields[8])) if len(fields) > 8 else None
+
+    return int(fields[1]), list(fields[2]), scsa, (int(fields[4]), int(fields[5]), int(fields[6])), budget
+
+
+class ExternalPlayer(Player):
+    """Mastermind Player that runs an executable and asks it for every guess
+
+    The process is started on the first guess and kept for the following rounds. Each guess may take the time
+    left in the round plus the round's buffer, as given by Round's budget; if the process does not answer by then
+    it is killed, the guess counts as a loss, and a new process is started at the next round. A process that exits
+    counts as a failure.
+
+    Requests are sent from an event loop in a background thread, so many external players can wait on their
+    processes at the same time; see play_concurrently. Rounds played at once by one player are each played by a
+    fork of it with a process of its own, which is kept for later rounds; see ForkedSession.
+    """
+
+    fork_counters = ("restarts",)
+
+    def __init__(self, command, player_name = None, time_cutoff = 5, time_buffer = 0.1):
+        """Constructor for ExternalPlayer
+
+        Args:
+            command (str or list of strs): Command that starts the player, split like a shell would if it is a str.
+            player_name (str, optional): Name printed with the results. Defaults to the name of the script or executable.
+            time_cutoff (int, optional): Amount of time in seconds allowed for the round, used when no budget is given. Defaults to 5.
+            time_buffer (float, optional): Extra seconds Round allows past time_cutoff, used when no budget is given. Defaults to 0.1.
+        """
+
+        self.command = shlex.split(command) if isinstance(command, str) else list(command)
+        self.player_name = player_name if player_name is not None else command_name(self.command)
+        self.time_cutoff = time_cutoff
+        self.time_buffer = time_buffer
+        self.process = None
+        self.time_used = 0
+        self.restarts = 0
+        self.idle_forks = [self]
+        self.forks_lock = threading.Lock()
+
+    def new_session(self):
+        """Creates the state of a new round, played by an idle fork of the player and its process
+
+        Returns:
+            ForkedSession: Returns session that makes the guesses of one round.
+        """
+
+        return ForkedSession(self)
+
+    def fork(self):
+        """Makes a player for one session that starts a process of its own
+
+        Returns:
+            ExternalPlayer: Returns player with the same command and cutoffs and no process yet.
+        """
+
+        fork = copy.copy(self)
+
+        fork.process = None
+        fork.time_used = 0
+        fork.restarts = 0
+        fork.idle_forks = [fork]
+        fork.forks_lock = threading.Lock()
+
+        return fork
+
+    async def start(self):
+        """Starts the player process if it is not running
+        """
+
+        if self.process is not None and self.process.returncode is None:
+
+            return
+
+        if self.process is not None:
+
+            self.restarts += 1
+
+        self.process = await asyncio.create_subprocess_exec(*self.command, stdin = asyncio.subprocess.PIPE, stdout = asyncio.subprocess.PIPE)
+
+        return
+
+    async def stop(self, kill = False):
+        """Stops the player process
+
+        Args:
+            kill (bool, optional): Whether to kill it instead of asking it to quit. Defaults to False.
+        """
+
+        if self.process is None or self.process.returncode is not None:
+
+            return
+
+        if not kill:
+
+            with contextlib.suppress(OSError):
+
+                self.process.stdin.write(b"quit\n")
+                await self.process.stdin.drain()
+
+            try:
+
+                await asyncio.wait_for(self.process.wait(), 1)
+
+                return
+
+            except asyncio.TimeoutError:
+
+                pass
+
+        with contextlib.suppress(ProcessLookupError):
+
+            self.process.kill()
+
+        await self.process.wait()
+
+        return
+
+    async def request_guess(self, board_length, colors, scsa, last_response, budget = None):
+        """Asks the player process for a guess
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget, optional): Time and guesses left, also sent to the process. Defaults to the time left of
+                                       time_cutoff, kept by the player and not sent.
+
+        Returns:
+            str: Returns guess, or an empty string if the process did not answer in time or exited.
+        """
+
+        if last_response[2] == 0:
+
+            self.time_used = 0
+
+        sent = budget
+
+        if budget is None:
+
+            budget = Budget(self.time_cutoff - self.time_used, buffer = self.time_buffer)
+
+        await self.start()
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        timeout = budget.timeout()
+        line = b""
+
+        try:
+
+            self.process.stdin.write((encode_request(board_length, colors, scsa, last_response, sent) + "\n").encode())
+
+            await self.process.stdin.drain()
+
+            line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+
+        except asyncio.TimeoutError:
+
+            await self.stop(kill = True)
+
+        except OSError:
+
+            pass
+
+        self.time_used += loop.time() - start
+
+        return line.decode().strip()
+
+    async def send_answer(self, code):
+        """Tells the player process the answer of a round it won
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        if self.process is None or self.process.returncode is not None:
+
+            return
+
+        with contextlib.suppress(OSError):
+
+            self.process.stdin.write(("answer " + code + "\n").encode())
+
+            await self.process.stdin.drain()
+
+        return
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind by asking the player process
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return run(self.request_guess(board_length, colors, scsa, last_response))
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind by asking the player process, waiting as long as the budget allows
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return run(self.request_guess(board_length, colors, scsa, last_response, budget))
+
+    def observe_answer(self, code):
+        """Passes the answer of a won round to the player process
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        run(self.send_answer(code))
+
+        return
+
+    def close(self):
+        """Stops the player process and the processes of the forks whose rounds are over
+        """
+
+        with self.forks_lock:
+
+            forks = self.idle_forks
+            self.idle_forks = [fork for fork in forks if fork is self]
+
+        for fork in forks:
+
+            if fork is not self:
+
+                fork.close()
+
+        run(self.stop())
+
+        return
+
+
+async def play_round_async(round, player, tournament_time = math.inf):
+    """Plays out a round of Mastermind with an external player without blocking the event loop
+
+    Follows the same rules as Round.play_round.
+
+    Args:
+        round (Round): Round to play.
+        player (ExternalPlayer): Player to guess secret code.
+        tournament_time (float, optional): Seconds left of the tournament's time when the round starts. Defaults to no limit.
+
+    Returns:
+        str: Result of round (win, loss, or failure).
+        int: Number of guesses until that result was achieved.
+    """
+
+    loop = asyncio.get_running_loop()
+    response = (0,0,0)
+
+    while round.guesses < round.guess_cutoff:
+
+        budget = Budget(round.time_cutoff - round.time_used, tournament_time - round.time_used, round.guess_cutoff - round.guesses, round.time_buffer)
+
+        start = loop.time()
+        guess = await player.request_guess(round.board_length, round.colors, round.scsa, response, budget)
+        end = loop.time()
+
+        round.guesses += 1
+        round.time_used += end - start
+
+        if round.time_used > round.time_cutoff + round.time_buffer:
+
+            return ("loss", round.guesses)
+
+        response = round.respond_to_guess(guess)
+
+        if response == "win":
+
+            await player.send_answer(round.answer)
+
+            return ("win", round.guesses)
+
+        elif response == "invalid":
+
+            return ("failure", round.guesses)
+
+    return ("loss", round.guesses)
+
+async def play_tournament_async(mastermind, player, scsa, codes):
+    """Plays a tournament of Mastermind with an external player without blocking the event loop
+
+    Follows the same rules as Mastermind.play_tournament, keeping the tournament's time apart from
+    mastermind.time_used so that several tournaments can share one Mastermind.
+
+    Args:
+        mastermind (Mastermind): Board and cutoffs of the tournament.
+        player (ExternalPlayer): Player who plays in tournament, making guesses.
+        scsa (SCSA): SCSA used to generate secret codes for player to guess.
+        codes (list of strs): Secret code of every round.
+
+    Returns:
+        dict: Returns number of wins, losses, and failures.
+    """
+
+    results = {"win": 0, "loss": 0, "failure": 0}
+    time_used = 0
+
+    for code in codes:
+
+        round = Round(mastermind.board_length, mastermind.colors, code, scsa, mastermind.guess_cutoff, mastermind.round_time_cutoff)
+
+        start = time.time()
+        result, guesses = await play_round_async(round, player, mastermind.tournament_time_cutoff - time_used)
+        end = time.time()
+
+        time_used += end - start
+
+        if time_used > mastermind.tournament_time_cutoff:
+
+            break
+
+        results[result] += 1
+
+        if result == "failure":
+
+            break
+
+    return results
+
+def play_concurrently(mastermind, players, scsa, num_rounds):
+    """Plays one tournament per external player at the same time, all against the same secret codes
+
+    Args:
+        mastermind (Mastermind): Board and cutoffs of the tournaments.
+        players (list of ExternalPlayers): Players, each of which plays its own tournament.
+        scsa (SCSA): SCSA used to generate secret codes for players to guess.
+        num_rounds (int): Number of rounds to play Mastermind.
+
+    Returns:
+        list of dicts: Returns number of wins, losses, and failures of every player.
+    """
+
+    codes = [code for batch in scsa.iter_codes(mastermind.board_length, mastermind.colors, max(num_rounds, 1), num_rounds) for code in batch]
+
+    async def play_all():
+
+        return await asyncio.gather(*(play_tournament_async(mastermind, player, scsa, codes) for player in players))
+
+    all_results = run(play_all())
+
+    for player, results in zip(players, all_results):
+
+        mastermind.print_results(player, results, num_rounds)
+
+    return all_results
+
+def serve(player, requests = None, replies = None):
+    """Answers the engine's requests with an in-process player, until told to quit
+
+    Anything the player prints is sent to stderr, so that it cannot be mistaken for a guess.
+
+    Args:
+        player (Player): Player that makes the guesses.
+        requests (file, optional): Stream to read requests from. Defaults to stdin.
+        replies (file, optional): Stream to write guesses to. Defaults to stdout.
+    """
+
+    requests = requests if requests is not None else sys.stdin
+    replies = replies if replies is not None else sys.stdout
+
+    for line in requests:
+
+        fields = line.split()
+
+        if not fields:
+
+            continue
+
+        if fields[0] == "quit":
+
+            break
+
+        with contextlib.redirect_stdout(sys.stderr):
+
+            if fields[0] == "answer":
+
+                player.observe_answer(fields[1])
+
+                continue
+
+            guess = forward_guess(player, *decode_request(fields))
+
+        replies.write(str(guess) + "\n")
+        replies.flush()
+
+    return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Serve a player over stdin and stdout, or play tournaments with external players.")
+    subparsers = parser.add_subparsers(dest = "mode", required = True)
+
+    serve_parser = subparsers.add_parser("serve")
+    serve_parser.add_argument("player_name")
+
+    play_parser = subparsers.add_parser("play")
+    play_parser.add_argument("board_length", type = int)
+    play_parser.add_argument("num_colors", type = int)
+    play_parser.add_argument("scsa_name")
+    play_parser.add_argument("num_rounds", type = int)
+    play_parser.add_argument("--player", action = "append", required = True, help = "command that starts a player; repeat to play several at once")
+    play_parser.add_argument("--name", action = "append", default = [], help = "name of the player started by the --player in the same place; defaults to its script's name")
+
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+
+        player = player_by_name(args.player_name)
+
+        if player is None:
+
+            print("Unrecognized player.", file = sys.stderr)
+            sys.exit(1)
+
+        serve(player)
+
+        sys.exit(0)
+
+    scsa = scsa_by_name(args.scsa_name)
+
+    if scsa is None:
+
+        print("Unrecognized SCSA.")
+        sys.exit(1)
+
+    colors = [chr(i) for i in range(65,91)][:args.num_colors]
+    names = args.name + [None]*(len(args.player) - len(args.name))
+    players = [ExternalPlayer(command, name) for command, name in zip(args.player, names)]
+
+    try:
+
+        play_concurrently(Mastermind(args.board_length, colors), players, scsa, args.num_rounds)
+
+    finally:
+
+        for player in players:
+
+            player.close()
@@ -0,0 +1,335 @@
+# File contains a runner that plays every combination of players, SCSAs and boards in one pool of workers
+# Run grid.py with lists of players, SCSAs and boards, or with a spec file, to play every combination:
+#
+#     python grid.py --players RAM Adaptive Prior --scsas PreferFewer TwoColor --boards 4x6 5x7 --rounds 100
+#     python grid.py --spec nightly.json
+#
+# A spec file holds the same settings as JSON, e.g.
+#     {"players": ["RAM"], "scsas": ["PreferFewer"], "boards": ["4x6", [5, 7]], "rounds": 100, "seed": 0}
+
+import argparse
+import json
+import sys
+from parallel import *
+from registry import *
+from cache import *
+
+grid_settings = None
+grid_corpora = {}
+grid_players = {}
+
+def start_grid_worker(settings):
+    """Stores the grid's settings in a worker process
+
+    Args:
+        settings (tuple): Guess cutoff, round time cutoff and seed.
+    """
+
+    global grid_settings
+
+    grid_settings = settings
+
+    return
+
+def play_cell_chunk(task):
+    """Plays consecutive rounds of one cell in a worker process
+
+    Corpora are attached once per worker and reused by every later chunk. Each worker keeps one player per cell.
+    Players that learn across rounds, such as Prior and Identifying, play every round of the cell the worker is
+    given themselves, in order, so they learn from the rounds of the cell the worker played before. Other players
+    play each round on a fresh copy, so nothing they keep from one round reaches the next.
+
+    Args:
+        task (tuple): Cell number, player name, SCSA name, board length, codes handle and first and last round number.
+
+    Returns:
+        tuple: Returns cell number, first round number and play_seeded_round's result for each round up to the first failure.
+    """
+
+    cell, player_name, scsa_name, board_length, codes_handle, start, stop = task
+    guess_cutoff, round_time_cutoff, seed = grid_settings
+
+    if codes_handle[1] not in grid_corpora:
+
+        grid_corpora[codes_handle[1]] = attach(codes_handle)
+
+    codes = grid_corpora[codes_handle[1]]
+    scsa = scsa_by_name(scsa_name)
+
+    if cell not in grid_players:
+
+        grid_players[cell] = player_by_name(player_name)
+        grid_players[cell].prepare(board_length, codes.colors, scsa)
+
+    player = grid_players[cell]
+    played = []
+
+    for index in range(start, stop):
+
+        played.append(play_seeded_round(board_length, codes.colors, guess_cutoff, round_time_cutoff, player, scsa, seed, index, codes.code(index - 1), learns_across_rounds(player)))
+
+        if played[-1][1] == "failure":
+
+            break
+
+    return cell, start, played
+
+
+class Grid:
+    """Tournaments of every player against every SCSA on every board, played by one pool of workers
+
+    The secret codes of each SCSA and board are generated once from the seed and shared by every player, in
+    shared memory, so all players face the same codes. Each cell is merged with the rules of
+    Mastermind.play_tournament and the cells are summed into a leaderboard.
+
+    Players that do not learn across rounds play every round on a fresh copy, so their results are the same for
+    any number of processes. A player that learns across rounds only learns from the chunks of its cell played by
+    the same worker, so its results depend on how chunks are spread over the workers and are only repeatable with
+    one process.
+    """
+
+    def __init__(self, players, scsas, boards, num_rounds = 100, seed = 0, guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300, processes = None, chunk_size = 25, cache = None):
+        """Constructor for Grid
+
+        Args:
+            players (list of strs): Names of the players, as accepted by player_by_name.
+            scsas (list of strs): Names of the SCSAs, as accepted by scsa_by_name.
+            boards (list of tuples): Board length and number of colors of every board.
+            num_rounds (int, optional): Number of rounds per cell. Defaults to 100.
+            seed (int or str, optional): Seed of the codes and of the rounds. Defaults to 0.
+            guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
+            round_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            tournament_time_cutoff (int, optional): Amount of time in seconds allowed for each cell. Defaults to 300.
+            processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            chunk_size (int, optional): Rounds sent to a worker at a time. Defaults to 25.
+            cache (ArtifactCache, optional): Cache of the codes of every SCSA and board. Defaults to None, which generates them every run.
+        """
+
+        self.players = players
+        self.scsas = scsas
+        self.boards = [tuple(board) for board in boards]
+        self.num_rounds = num_rounds
+        self.seed = seed
+        self.guess_cutoff = guess_cutoff
+        self.round_time_cutoff = round_time_cutoff
+        self.tournament_time_cutoff = tournament_time_cutoff
+        self.processes = processes if processes is not None else multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.cells = [(player_name, scsa_name, board) for board in self.boards for scsa_name in scsas for player_name in players]
+
+    def corpus(self, scsa_name, board):
+        """Generates the secret codes of one SCSA and board
+
+        Args:
+            scsa_name (str): Name of the SCSA.
+            board (tuple): Board length and number of colors.
+
+        Returns:
+            list of strs: Returns num_rounds codes.
+        """
+
+        colors = [chr(i) for i in range(65,91)][:board[1]]
+        scsa = scsa_by_name(scsa_name)
+
+        def generate():
+
+            random.seed(round_seed(str(self.seed) + ":" + scsa_name + ":" + str(board[0]) + "x" + str(board[1]), 0))
+
+            return [code for batch in scsa.iter_codes(board[0], colors, max(self.num_rounds, 1), self.num_rounds) for code in batch]
+
+        if self.cache is None:
+
+            return generate()
+
+        params = {"scsa": scsa_name, "board_length": board[0], "colors": list_to_str(colors), "count": self.num_rounds, "seed": str(self.seed), "version": source_version(type(scsa))}
+        corpus = Corpus(self.cache.fetch("grid-corpus", params, lambda file_name: write_corpus(file_name, generate(), colors, board[0], scsa_name), ".codes"))
+        codes = list(corpus)
+
+        corpus.close()
+
+        return codes
+
+    def run(self):
+        """Plays every cell
+
+        Returns:
+            list of dicts: Returns result of every cell with player, scsa, board_length, num_colors, results, score and mean_guesses.
+        """
+
+        corpora = {}
+
+        for _, scsa_name, board in self.cells:
+
+            if (scsa_name, board) not in corpora:
+
+                colors = [chr(i) for i in range(65,91)][:board[1]]
+
+                corpora[(scsa_name, board)] = SharedCodes(self.corpus(scsa_name, board), colors, board[0])
+
+        tasks = []
+
+        for cell, (player_name, scsa_name, board) in enumerate(self.cells):
+
+            for start in range(1, self.num_rounds + 1, self.chunk_size):
+
+                tasks.append((cell, player_name, scsa_name, board[0], corpora[(scsa_name, board)].handle, start, min(start + self.chunk_size, self.num_rounds + 1)))
+
+        chunks = {}
+
+        try:
+
+            with multiprocessing.Pool(self.processes, initializer = start_grid_worker, initargs = ((self.guess_cutoff, self.round_time_cutoff, self.seed),)) as pool:
+
+                for cell, start, played in pool.imap_unordered(play_cell_chunk, tasks):
+
+                    chunks[(cell, start)] = played
+
+        finally:
+
+            for codes in corpora.values():
+
+                codes.unlink()
+
+        return [self.merge(cell, chunks) for cell in range(len(self.cells))]
+
+    def merge(self, cell, chunks):
+        """Merges the chunks of one cell in round order
+
+        Args:
+            cell (int): Cell number.
+            chunks (dict): Rounds played, by cell number and first round number.
+
+        Returns:
+            dict: Returns result of the cell.
+        """
+
+        player_name, scsa_name, board = self.cells[cell]
+        colors = [chr(i) for i in range(65,91)][:board[1]]
+        mastermind = ParallelMastermind(board[0], colors, self.guess_cutoff, self.round_time_cutoff, self.tournament_time_cutoff, 1, self.seed)
+        results = {"win": 0, "loss": 0, "failure": 0}
+
+        mastermind.merge_chunks((chunks[(cell, start)] for start in range(1, self.num_rounds + 1, self.chunk_size)), results)
+
+        wins = [guesses for _, result, guesses, _ in mastermind.round_results if result == "win"]
+
+        return {
+            "player": player_name,
+            "scsa": scsa_name,
+            "board_length": board[0],
+            "num_colors": board[1],
+            "results": results,
+            "score": score(results),
+            "mean_guesses": sum(wins)/len(wins) if wins else None,
+            "time": mastermind.time_used,
+        }
+
+
+def leaderboard(cells):
+    """Sums the cells of every player
+
+    Args:
+        cells (list of dicts): Results of every cell, as from Grid.run.
+
+    Returns:
+        list of tuples: Returns player, total score, wins, losses, failures and mean guesses per win, best total score
+                        first and fewer guesses breaking ties.
+    """
+
+    totals = {}
+
+    for cell in cells:
+
+        total = totals.setdefault(cell["player"], [0, 0, 0, 0, 0])
+
+        total[0] += cell["score"]
+        total[1] += cell["results"]["win"]
+        total[2] += cell["results"]["loss"]
+        total[3] += cell["results"]["failure"]
+        total[4] += cell["mean_guesses"]*cell["results"]["win"] if cell["results"]["win"] else 0
+
+    rows = [(player, *total[:4], total[4]/total[1] if total[1] else None) for player, total in totals.items()]
+
+    return sorted(rows, key = lambda row: (-row[1], math.inf if row[5] is None else row[5]))
+
+def print_grid(cells):
+    """Prints the result of every cell followed by the leaderboard
+
+    Args:
+        cells (list of dicts): Results of every cell, as from Grid.run.
+    """
+
+    print("{:<14}{:<22}{:<8}{:>8}{:>8}{:>8}{:>8}{:>10}".format("Player", "SCSA", "Board", "Score", "Win", "Loss", "Fail", "Guesses"))
+
+    for cell in cells:
+
+        board = str(cell["board_length"]) + "x" + str(cell["num_colors"])
+        mean = "-" if cell["mean_guesses"] is None else "{:.3f}".format(cell["mean_guesses"])
+
+        print("{:<14}{:<22}{:<8}{:>8}{:>8}{:>8}{:>8}{:>10}".format(cell["player"], cell["scsa"], board, cell["score"], cell["results"]["win"], cell["results"]["loss"], cell["results"]["failure"], mean))
+
+    print()
+    print("{:<6}{:<14}{:>8}{:>8}{:>8}{:>8}{:>10}".format("Rank", "Player", "Score", "Win", "Loss", "Fail", "Guesses"))
+
+    for rank, (player, total, wins, losses, failures, mean) in enumerate(leaderboard(cells), 1):
+
+        mean = "-" if mean is None else "{:.3f}".format(mean)
+
+        print("{:<6}{:<14}{:>8}{:>8}{:>8}{:>8}{:>10}".format(rank, player, total, wins, losses, failures, mean))
+
+    return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Play every combination of players, SCSAs and boards.")
+    parser.add_argument("--spec", help = "JSON file with players, scsas, boards and optionally rounds, seed, guess_cutoff, round_time_cutoff and tournament_time_cutoff")
+    parser.add_argument("--players", nargs = "+", default = [])
+    parser.add_argument("--scsas", nargs = "+", default = [])
+    parser.add_argument("--boards", nargs = "+", default = [], help = "boards as LENGTHxCOLORS, e.g. 4x6")
+    parser.add_argument("--rounds", type = int, default = 100)
+    parser.add_argument("--seed", default = "0")
+    parser.add_argument("--processes", type = int, default = None)
+    parser.add_argument("--json", help = "file to write the result of every cell to")
+    parser.add_argument("--no-cache", action = "store_true", help = "generate the codes instead of reusing cached ones")
+    args = parser.parse_args()
+
+    spec = {"players": args.players, "scsas": args.scsas, "boards": args.boards, "rounds": args.rounds, "seed": args.seed}
+
+    if args.spec:
+
+        with open(args.spec) as file:
+
+            spec.update(json.load(file))
+
+    boards = [(int(length), int(num_colors)) for length, num_colors in (board.split("x") if isinstance(board, str) else board for board in spec["boards"])]
+
+    for player_name in spec["players"]:
+
+        if player_by_name(player_name) is None:
+
+            print("Unrecognized player:", player_name)
+            sys.exit(1)
+
+    for scsa_name in spec["scsas"]:
+
+        if scsa_by_name(scsa_name) is None:
+
+            print("Unrecognized SCSA:", scsa_name)
+            sys.exit(1)
+
+    if not spec["players"] or not spec["scsas"] or not boards:
+
+        print("Players, SCSAs and boards are all needed.")
+        sys.exit(1)
+
+    grid = Grid(spec["players"], spec["scsas"], boards, spec["rounds"], spec["seed"], spec.get("guess_cutoff", 100), spec.get("round_time_cutoff", 5), spec.get("tournament_time_cutoff", 300), args.processes, cache = None if args.no_cache else ArtifactCache())
+    cells = grid.run()
+
+    print_grid(cells)
+
+    if args.json:
+
+        with open(args.json, "w") as file:
+
+            json.dump(cells, file, indent = 1)
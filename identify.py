@@ -0,0 +1,242 @@
+# File contains online identification of the SCSA behind unlabeled secret codes
+# Use IdentifyingPlayer(RAM()) as a player, or run python main.py 4 6 Identifying PreferFewer 100
+
+import math
+from player import *
+
+class SCSAClassifier:
+    """Scores the answers seen so far against the probability mass function of every known SCSA
+
+    Each SCSA's log-likelihood is the sum of the log-probabilities it gives the observed answers. Codes an SCSA
+    cannot generate get a small floor probability instead of zero, so one odd answer does not rule an SCSA out
+    for good. The classifier decides once it has seen min_rounds answers and the likeliest SCSA beats the
+    runner-up by the threshold log-ratio; until then a few answers that happen to fit a narrow SCSA, such as
+    codes without repeated colors, cannot decide it.
+    """
+
+    def __init__(self, board_length, colors, scsas = None, threshold = math.log(1000), floor = 1e-6, min_rounds = 5):
+        """Constructor for SCSAClassifier
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsas (list of SCSAs, optional): SCSAs to choose from. Defaults to every SCSA in scsa.py.
+            threshold (float, optional): Log-likelihood ratio at which the classifier decides. Defaults to log(1000).
+            floor (float, optional): Probability given to an impossible code, relative to a uniformly random code. Defaults to 1e-6.
+            min_rounds (int, optional): Fewest answers before the classifier decides. Defaults to 5.
+        """
+
+        if scsas is None:
+
+            scsas = [scsa_class() for scsa_class in SCSA.__subclasses__()]
+
+        self.board_length = board_length
+        self.colors = colors
+        self.threshold = threshold
+        self.floor = floor*len(colors)**(-board_length)
+        self.min_rounds = min_rounds
+        self.scsas = []
+        self.log_likelihoods = {}
+        self.observed = 0
+
+        for scsa in scsas:
+
+            # SCSAs without a probability mass function cannot be scored
+            try:
+
+                scsa.pmf(colors[0]*board_length, colors)
+
+            except NotImplementedError:
+
+                continue
+
+            self.scsas.append(scsa)
+            self.log_likelihoods[scsa.name] = 0.0
+
+    def observe(self, code):
+        """Adds an answer to every SCSA's log-likelihood
+
+        Args:
+            code (str): Answer of a round.
+        """
+
+        for scsa in self.scsas:
+
+            probability = scsa.pmf(code, self.colors)
+
+            self.log_likelihoods[scsa.name] += math.log(max(probability, self.floor))
+
+        self.observed += 1
+
+        return
+
+    def ranking(self):
+        """Orders the SCSAs from likeliest to least likely
+
+        Returns:
+            list of tuples: Returns (log-likelihood, SCSA) pairs, likeliest first.
+        """
+
+        return sorted(((self.log_likelihoods[scsa.name], scsa) for scsa in self.scsas), key = lambda item: -item[0])
+
+    def decision(self):
+        """Returns the SCSA the answers point to, if the evidence is decisive
+
+        Returns:
+            SCSA or None: Returns likeliest SCSA if at least min_rounds answers were seen and its log-likelihood ratio over
+                          the runner-up reaches the threshold, otherwise None.
+        """
+
+        if self.observed < max(self.min_rounds, 1) or not self.scsas:
+
+            return None
+
+        ranking = self.ranking()
+
+        if len(ranking) == 1 or ranking[0][0] - ranking[1][0] >= self.threshold:
+
+            return ranking[0][1]
+
+        return None
+
+
+class IdentifyingPlayer(Player):
+    """Mastermind Player that tells a wrapped player which SCSA it is really playing against
+
+    Players such as RAM_3.RAM pick their strategy from scsa.name. This wrapper classifies the answers of the
+    rounds won so far and, once the classifier decides, hands the wrapped player the identified SCSA in place
+    of the one the engine passes. Until then the wrapped player gets the fallback SCSA, or the engine's SCSA if
+    no fallback is given. The SCSA only changes between rounds.
+
+    The classifier always weighs every SCSA it is given, including ones the wrapped player has no strategy for,
+    such as InsertColors for RAM, so that uniformly random codes are not taken for the likeliest narrow SCSA.
+    When it identifies an SCSA outside playable, the wrapped player gets the fallback instead.
+    """
+
+    def __init__(self, player, fallback = None, scsas = None, threshold = math.log(1000), playable = None, min_rounds = 5):
+        """Constructor for IdentifyingPlayer
+
+        Args:
+            player (Player): Player that chooses its strategy from the SCSA it is given.
+            fallback (SCSA, optional): SCSA passed to the player before the classifier decides. Defaults to the engine's SCSA.
+            scsas (list of SCSAs, optional): SCSAs to choose from. Defaults to every SCSA in scsa.py.
+            threshold (float, optional): Log-likelihood ratio at which the classifier decides. Defaults to log(1000).
+            playable (list of SCSAs, optional): SCSAs the wrapped player has a strategy for. Defaults to every SCSA.
+            min_rounds (int, optional): Fewest won rounds before the classifier decides. Defaults to 5.
+        """
+
+        self.player = player
+        self.player_name = player.player_name
+        self.fallback = fallback
+        self.scsas = scsas
+        self.threshold = threshold
+        self.playable = None if playable is None else {scsa.name for scsa in playable}
+        self.min_rounds = min_rounds
+        self.classifiers = {}
+        self.classifier = None
+        self.identified = None
+
+    def observe_answer(self, code):
+        """Scores the answer of a won round and passes it on to the wrapped player
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        if self.classifier is not None:
+
+            with LEARNING_LOCK:
+
+                self.classifier.observe(code)
+
+        self.player.observe_answer(code)
+
+        return
+
+    def learned_state(self):
+        """Lists the objects holding what the player and the wrapped player learn across rounds
+
+        Returns:
+            list: Returns classifiers of every board, then the wrapped player's learned state.
+        """
+
+        return [self.classifiers] + self.player.learned_state()
+
+    def target(self, board_length, colors, scsa, last_response):
+        """Chooses the SCSA passed on to the wrapped player, deciding again at the start of each round
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA the engine says generated the secret code.
+            last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+
+        Returns:
+            SCSA: Returns identified SCSA, the fallback or the engine's SCSA.
+        """
+
+        if last_response[2] == 0:
+
+            key = (board_length, tuple(colors), scsa.name)
+
+            with LEARNING_LOCK:
+
+                if key not in self.classifiers:
+
+                    self.classifiers[key] = SCSAClassifier(board_length, colors, self.scsas, self.threshold, min_rounds = self.min_rounds)
+
+                self.classifier = self.classifiers[key]
+                self.identified = self.classifier.decision()
+
+            if self.identified is not None and self.playable is not None and self.identified.name not in self.playable:
+
+                self.identified = None
+
+        if self.identified is not None:
+
+            return self.identified
+
+        elif self.fallback is not None:
+
+            return self.fallback
+
+        return scsa
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind through the wrapped player
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA the engine says generated the secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+
+        target = self.target(board_length, colors, scsa, last_response)
+
+        return self.player.make_guess(board_length, colors, target, last_response)
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind through the wrapped player, passing on the budget
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA the engine says generated the secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        target = self.target(board_length, colors, scsa, last_response)
+
+        return self.player.make_timed_guess(board_length, colors, target, last_response, budget)
@@ -0,0 +1,438 @@
+# File contains a tournament runner that streams every round to a JSON lines journal and can resume from it
+# Run python main.py 4 6 RAM PreferFewer 1000 --journal run.jsonl, adding --resume to carry on after an interruption
+#
+# The first line of a journal describes the tournament and every later line is one round:
+#     {"type": "tournament", "player": "RAM", "scsa": "PreferFewer", "board_length": 4, "colors": "ABCDEF", ...}
+#     {"type": "round", "round": 1, "seed": 8325..., "code": "ABBA", "result": "win", "guesses": 6, "time": 0.004}
+#     {"type": "end", "results": {"win": 100, "loss": 0, "failure": 0}, "score": 500}
+# With latency on, round records add the percentiles of the round's guesses and the end record those of the whole
+# tournament, as from LatencyRecorder. With metrics on, they add the telemetry counters of the round and tournament,
+# and with memory accounting on, the memory of the round and the summary of the tournament.
+# Next to the journal, <journal>.checkpoint holds the player as it was after the last round flushed to disk.
+
+import json
+import os
+import pickle
+import time
+from parallel import *
+
+class Journal:
+    """Append-only file of JSON records, flushed to disk every flush_interval seconds
+
+    A journal cut short by a crash may end in a partial line, which is dropped when the journal is read back.
+    """
+
+    def __init__(self, path, flush_interval = 5):
+        """Constructor for Journal
+
+        Args:
+            path (str): Name of the journal file.
+            flush_interval (float, optional): Most seconds between flushes to disk. Defaults to 5.
+        """
+
+        self.path = path
+        self.flush_interval = flush_interval
+        self.file = None
+        self.last_flush = 0
+
+    def read(self):
+        """Reads back the complete records of the journal and drops anything after them
+
+        Returns:
+            list of dicts: Returns records in the order written, or an empty list if there is no journal.
+        """
+
+        if not os.path.exists(self.path):
+
+            return []
+
+        records = []
+        end = 0
+
+        with open(self.path, "rb") as file:
+
+            for line in file:
+
+                if not line.endswith(b"\n"):
+
+                    break
+
+                try:
+
+                    records.append(json.loads(line))
+
+                except ValueError:
+
+                    break
+
+                end += len(line)
+
+        if end < os.path.getsize(self.path):
+
+            os.truncate(self.path, end)
+
+        return records
+
+    def open(self, append = False):
+        """Opens the journal for writing
+
+        Args:
+            append (bool, optional): Whether to keep the records already in it. Defaults to False.
+        """
+
+        self.file = open(self.path, "a" if append else "w")
+        self.last_flush = time.time()
+
+        return
+
+    def rewrite(self, records):
+        """Replaces the journal with some records, all at once
+
+        Args:
+            records (list of dicts): Records to keep.
+        """
+
+        with open(self.path + ".tmp", "w") as file:
+
+            for record in records:
+
+                file.write(json.dumps(record) + "\n")
+
+        os.replace(self.path + ".tmp", self.path)
+
+        return
+
+    def write(self, record):
+        """Adds a record, flushing to disk if flush_interval has passed since the last flush
+
+        Args:
+            record (dict): Record to add.
+
+        Returns:
+            bool: Returns whether the journal was flushed.
+        """
+
+        self.file.write(json.dumps(record) + "\n")
+
+        if time.time() - self.last_flush >= self.flush_interval:
+
+            self.flush()
+
+            return True
+
+        return False
+
+    def flush(self):
+        """Writes every record added so far to disk
+        """
+
+        self.file.flush()
+
+        os.fsync(self.file.fileno())
+
+        self.last_flush = time.time()
+
+        return
+
+    def close(self):
+        """Flushes and closes the journal
+        """
+
+        if self.file is not None:
+
+            self.flush()
+            self.file.close()
+
+            self.file = None
+
+        return
+
+
+class JournaledMastermind(Mastermind):
+    """Representation to play tournaments of Mastermind that are journaled round by round and can be resumed
+
+    Rounds are played in order by the same player, as in Mastermind, but the random module is seeded from the
+    tournament seed and the round number before each round, so a round's code and guesses do not depend on the
+    rounds before it. Whenever the journal is flushed the player is pickled to a checkpoint, so a resumed
+    tournament restores the player, keeps the rounds up to the checkpoint, and plays the rest again exactly as
+    they were first played. Players that cannot be pickled, such as those running other processes, keep every
+    journaled round and are only shown the answers of the journaled wins through observe_answer.
+    """
+
+    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,91)], guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300, journal_path = "journal.jsonl", seed = 0, flush_interval = 5, latency = False, metrics = False, memory = None):
+        """Constructor for JournaledMastermind
+
+        Args:
+            board_length (int, optional): Number of pegs. Defaults to 4.
+            colors (list, optional): List of colors that can be used to generate a secret code. Defaults to [chr(i) for i in range(65,91)].
+            guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
+            round_time_cutoff (int, optional):  Amount of time in seconds allowed for the round. Defaults to 5.
+            tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the tournament. Defaults to 300.
+            journal_path (str, optional): Name of the journal file. Defaults to "journal.jsonl".
+            seed (int or str, optional): Seed of the tournament. Defaults to 0.
+            flush_interval (float, optional): Most seconds between flushes of the journal to disk. Defaults to 5.
+            latency (bool, optional): Whether to keep histograms of how long every guess and response takes. Defaults to False.
+            metrics (bool, optional): Whether to collect the telemetry players and engines report, per round. Defaults to False.
+            memory (str, optional): "tracemalloc" or "rss" to account for memory per round. Defaults to None, which does not.
+        """
+
+        super().__init__(board_length, colors, guess_cutoff, round_time_cutoff, tournament_time_cutoff, latency, metrics, memory)
+
+        self.journal = Journal(journal_path, flush_interval)
+        self.checkpoint_path = journal_path + ".checkpoint"
+        self.seed = seed
+
+    def checkpoint(self, player, played):
+        """Saves the player as it is after some rounds, replacing the last checkpoint
+
+        Args:
+            player (Player): Player who plays in tournament.
+            played (int): Number of rounds played, all of them flushed to the journal.
+        """
+
+        try:
+
+            snapshot = pickle.dumps(copy_player(player))
+
+        except (pickle.PicklingError, TypeError, AttributeError):
+
+            snapshot = None
+
+        with open(self.checkpoint_path + ".tmp", "wb") as file:
+
+            pickle.dump((played, snapshot), file)
+
+        os.replace(self.checkpoint_path + ".tmp", self.checkpoint_path)
+
+        return
+
+    def header(self, player, scsa, source):
+        """Describes the tournament, so that a journal is only resumed by the same tournament
+
+        Args:
+            player (Player): Player who plays in tournament.
+            scsa (SCSA): SCSA the secret codes come from.
+            source (str): Where the codes come from, "generated" or the name of the code file.
+
+        Returns:
+            dict: Returns first record of the journal.
+        """
+
+        return {
+            "type": "tournament",
+            "player": player.player_name,
+            "scsa": scsa.name,
+            "board_length": self.board_length,
+            "colors": "".join(self.colors),
+            "guess_cutoff": self.guess_cutoff,
+            "round_time_cutoff": self.round_time_cutoff,
+            "tournament_time_cutoff": self.tournament_time_cutoff,
+            "seed": str(self.seed),
+            "codes": source,
+        }
+
+    def count_round(self, results, record):
+        """Counts a round with the rules of Mastermind.play_tournament
+
+        Args:
+            results (dict): Dictionary of wins, losses, and failures to add to.
+            record (dict): Round record.
+
+        Returns:
+            bool: Returns whether the tournament goes on after this round.
+        """
+
+        self.time_used += record["time"]
+
+        if self.time_used > self.tournament_time_cutoff:
+
+            return False
+
+        results[record["result"]] += 1
+
+        return record["result"] != "failure"
+
+    def resume(self, player, header, results):
+        """Counts the rounds of an earlier run of the same tournament
+
+        Args:
+            player (Player): Player who plays in tournament, restored from the checkpoint.
+            header (dict): First record the journal must have.
+            results (dict): Dictionary of wins, losses, and failures to add to.
+
+        Returns:
+            tuple: Returns number of rounds journaled and whether the tournament goes on after them.
+
+        Raises:
+            ValueError: Raised if the journal is of a different tournament.
+        """
+
+        records = self.journal.read()
+
+        if not records:
+
+            return 0, True
+
+        if records[0] != header:
+
+            raise ValueError(self.journal.path + " is the journal of a different tournament")
+
+        rounds = [record for record in records if record["type"] == "round"]
+        played, snapshot = 0, b""
+
+        if os.path.exists(self.checkpoint_path):
+
+            with open(self.checkpoint_path, "rb") as file:
+
+                played, snapshot = pickle.load(file)
+
+        if snapshot is not None:
+
+            # Rounds after the checkpoint are played again by the restored player
+            rounds = rounds[:played]
+
+            if snapshot:
+
+                player.__dict__.update(pickle.loads(snapshot).__dict__)
+
+        # Leaves out the end record of a finished run, so the rounds played now follow on from the journaled ones
+        self.journal.rewrite([header] + rounds)
+
+        for record in rounds:
+
+            if not self.count_round(results, record):
+
+                return len(rounds), False
+
+            if snapshot is None and record["result"] == "win":
+
+                player.observe_answer(record["code"])
+
+        return len(rounds), True
+
+    def play_rounds(self, player, scsa, num_rounds, codes = None, source = "generated", resume = False):
+        """Plays rounds in order, journaling each one
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds to play.
+            codes (list of strs, optional): Secret code of every round. Defaults to None, which generates them from the SCSA.
+            source (str, optional): Where the codes come from, as recorded in the journal. Defaults to "generated".
+            resume (bool, optional): Whether to carry on from the journal of an earlier run. Defaults to False.
+
+        Returns:
+            dict: Returns number of wins, losses, and failures.
+        """
+
+        results = {"win": 0, "loss": 0, "failure": 0}
+        header = self.header(player, scsa, source)
+        played, going = self.resume(player, header, results) if resume else (0, True)
+
+        player.prepare(self.board_length, self.colors, scsa)
+        self.start_metrics()
+
+        self.journal.open(append = played > 0)
+
+        try:
+
+            if played == 0:
+
+                self.journal.write(header)
+                self.checkpoint(player, 0)
+
+            for i in range(played + 1, num_rounds + 1):
+
+                if not going:
+
+                    break
+
+                seed = round_seed(self.seed, i)
+
+                random.seed(seed)
+
+                code = codes[i - 1] if codes is not None else scsa.generate_codes(self.board_length, self.colors, 1)
+
+                round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff, self.latency)
+
+                start = time.time()
+                result, guesses = round.play_round(player, self.tournament_time_cutoff - self.time_used)
+                end = time.time()
+
+                record = {"type": "round", "round": i, "seed": seed, "code": code, "result": result, "guesses": guesses, "time": end - start}
+
+                record.update(self.end_round_metrics())
+
+                played = i
+
+                if self.journal.write(record):
+
+                    self.checkpoint(player, played)
+
+                going = self.count_round(results, record)
+
+            end = {"type": "end", "results": results, "score": score(results)}
+
+            if self.latency is not None:
+
+                end["latency"] = self.latency.summary()
+
+            if self.metrics:
+
+                end["metrics"] = telemetry.counters
+
+            if self.memory is not None:
+
+                end["memory"] = self.memory.summary()
+
+            self.journal.write(end)
+
+        finally:
+
+            self.journal.close()
+
+        self.checkpoint(player, played)
+
+        return results
+
+    def play_tournament(self, player, scsa, num_rounds, resume = False):
+        """Plays a journaled tournament of Mastermind
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds to play Mastermind.
+            resume (bool, optional): Whether to carry on from the journal of an earlier run. Defaults to False.
+        """
+
+        results = self.play_rounds(player, scsa, num_rounds, resume = resume)
+
+        self.print_results(player, results, num_rounds)
+
+        return
+
+    def practice_tournament(self, player, scsa, code_file, resume = False):
+        """Plays a journaled tournament of Mastermind using pregenerated codes from file
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA that codes in file are generated from.
+            code_file (str): Name of file to read secret codes from, packed or one per line.
+            resume (bool, optional): Whether to carry on from the journal of an earlier run. Defaults to False.
+        """
+
+        codes = open_codes(code_file)
+
+        try:
+
+            results = self.play_rounds(player, scsa, len(codes), codes, code_file, resume)
+
+        finally:
+
+            if isinstance(codes, Corpus):
+
+                codes.close()
+
+        self.print_results(player, results, len(codes))
+
+        return
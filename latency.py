@@ -0,0 +1,207 @@
+# File contains histograms of how long players take to guess and rounds take to respond
+# Run python main.py 4 6 RAM PreferFewer 100 --latency to print the percentiles with the results
+#
+# Durations are measured with time.perf_counter_ns and counted in logarithmic buckets, eight to every doubling,
+# so a histogram of any number of guesses holds at most a few hundred counts and its percentiles are within 9%:
+#     mastermind = Mastermind(4, colors, latency = True)
+#     mastermind.play_tournament(player, scsa, 100)
+#     mastermind.latency.summary()["make_guess"]["guess"][3]["p99"]
+
+import math
+
+BUCKETS_PER_DOUBLING = 8
+OPERATIONS = ("make_guess", "respond_to_guess")
+
+class LatencyHistogram:
+    """Counts of durations in nanoseconds, in logarithmic buckets
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        """Constructor for LatencyHistogram
+        """
+
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, duration):
+        """Counts a duration
+
+        Args:
+            duration (int): Duration in nanoseconds.
+        """
+
+        bucket = int(math.log2(duration)*BUCKETS_PER_DOUBLING) if duration > 0 else -1
+
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+        return
+
+    def merge(self, other):
+        """Adds the counts of another histogram
+
+        Args:
+            other (LatencyHistogram): Histogram to add.
+        """
+
+        for bucket, count in other.counts.items():
+
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+        return
+
+    def percentile(self, fraction):
+        """Estimates a percentile as the upper edge of the bucket it falls in
+
+        Args:
+            fraction (float): Fraction of durations at or below the percentile, e.g. 0.99.
+
+        Returns:
+            int: Returns duration in nanoseconds, never more than the largest duration counted.
+        """
+
+        if self.count == 0:
+
+            return 0
+
+        rank = math.ceil(fraction*self.count)
+        seen = 0
+
+        for bucket in sorted(self.counts):
+
+            seen += self.counts[bucket]
+
+            if seen >= rank:
+
+                return min(math.ceil(2**((bucket + 1)/BUCKETS_PER_DOUBLING)) if bucket >= 0 else 0, self.max)
+
+        return self.max
+
+    def summary(self):
+        """Summarizes the histogram
+
+        Returns:
+            dict: Returns count and mean, p50, p90, p99 and max in seconds.
+        """
+
+        return {
+            "count": self.count,
+            "mean": self.total/self.count/1e9 if self.count else 0,
+            "p50": self.percentile(0.5)/1e9,
+            "p90": self.percentile(0.9)/1e9,
+            "p99": self.percentile(0.99)/1e9,
+            "max": self.max/1e9,
+        }
+
+
+class LatencyRecorder:
+    """Latency histograms of a tournament, for every operation overall, per SCSA, per guess number and per round
+    """
+
+    def __init__(self):
+        """Constructor for LatencyRecorder
+        """
+
+        self.overall = {operation: LatencyHistogram() for operation in OPERATIONS}
+        self.by_scsa = {operation: {} for operation in OPERATIONS}
+        self.by_guess = {operation: {} for operation in OPERATIONS}
+        self.round = {operation: LatencyHistogram() for operation in OPERATIONS}
+
+    def record(self, operation, scsa_name, guess, duration):
+        """Counts the duration of one operation
+
+        Args:
+            operation (str): "make_guess" or "respond_to_guess".
+            scsa_name (str): Name of the SCSA of the round.
+            guess (int): Number of the guess in the round, starting at 1.
+            duration (int): Duration in nanoseconds.
+        """
+
+        self.overall[operation].record(duration)
+        self.by_scsa[operation].setdefault(scsa_name, LatencyHistogram()).record(duration)
+        self.by_guess[operation].setdefault(guess, LatencyHistogram()).record(duration)
+        self.round[operation].record(duration)
+
+        return
+
+    def merge_round(self, other):
+        """Adds the durations of a round recorded apart, such as one played in another thread, to the current round
+
+        Args:
+            other (LatencyRecorder): Recorder that recorded only that round.
+        """
+
+        for operation in OPERATIONS:
+
+            self.overall[operation].merge(other.overall[operation])
+            self.round[operation].merge(other.overall[operation])
+
+            for scsa_name, histogram in other.by_scsa[operation].items():
+
+                self.by_scsa[operation].setdefault(scsa_name, LatencyHistogram()).merge(histogram)
+
+            for guess, histogram in other.by_guess[operation].items():
+
+                self.by_guess[operation].setdefault(guess, LatencyHistogram()).merge(histogram)
+
+        return
+
+    def end_round(self):
+        """Closes the histograms of the current round
+
+        Returns:
+            dict: Returns summary of every operation in the round.
+        """
+
+        summary = {operation: histogram.summary() for operation, histogram in self.round.items()}
+
+        self.round = {operation: LatencyHistogram() for operation in OPERATIONS}
+
+        return summary
+
+    def summary(self):
+        """Summarizes every histogram
+
+        Returns:
+            dict: Returns, for every operation, the overall summary with the summaries per SCSA and per guess number.
+        """
+
+        return {
+            operation: {
+                "overall": self.overall[operation].summary(),
+                "scsa": {scsa_name: histogram.summary() for scsa_name, histogram in self.by_scsa[operation].items()},
+                "guess": {guess: histogram.summary() for guess, histogram in sorted(self.by_guess[operation].items())},
+            }
+            for operation in OPERATIONS
+        }
+
+    def print_summary(self):
+        """Prints the percentiles of every operation overall and per guess number, in milliseconds
+        """
+
+        row = "{:<22}{:>8}{:>10}{:>10}{:>10}{:>10}"
+
+        print(row.format("Latency (ms)", "Count", "p50", "p90", "p99", "Max"))
+
+        for operation in OPERATIONS:
+
+            histograms = [(operation, self.overall[operation])]
+            histograms += [("  guess " + str(guess), histogram) for guess, histogram in sorted(self.by_guess[operation].items())]
+
+            for label, histogram in histograms:
+
+                summary = histogram.summary()
+
+                print(row.format(label, summary["count"], *["{:.3f}".format(summary[key]*1e3) for key in ("p50", "p90", "p99", "max")]))
+
+        return
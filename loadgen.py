@@ -0,0 +1,275 @@
+# File contains a client that plays many simultaneous games against server.py to measure its throughput and latency
+# See server.py for the protocol
+#
+# Start a server, then point the load generator at it:
+#     python server.py --port 5556
+#     python loadgen.py --port 5556 --connections 50 --games 20 --duration 10
+
+import argparse
+import asyncio
+import collections
+import json
+import random
+import time
+
+def percentile(values, fraction):
+    """Picks a percentile of some values by nearest rank
+
+    Args:
+        values (list of nums): Values, sorted in increasing order.
+        fraction (float): Percentile as a fraction between 0 and 1.
+
+    Returns:
+        num: Returns value at that percentile, or 0 if there are none.
+    """
+
+    if not values:
+
+        return 0
+
+    rank = min(len(values) - 1, max(0, int(round(fraction*len(values))) - 1))
+
+    return values[rank]
+
+
+class Connection:
+    """Connection to the server that many games send requests over at once
+
+    The server answers the requests of a connection in order, so replies are matched to requests first in,
+    first out.
+    """
+
+    def __init__(self, reader, writer):
+        """Constructor for Connection
+
+        Args:
+            reader (asyncio.StreamReader): Stream to read replies from.
+            writer (asyncio.StreamWriter): Stream to write requests to.
+        """
+
+        self.reader = reader
+        self.writer = writer
+        self.waiting = collections.deque()
+        self.receiver = asyncio.get_running_loop().create_task(self.receive())
+
+    async def receive(self):
+        """Hands every reply to the request that is waiting for it
+        """
+
+        while True:
+
+            line = await self.reader.readline()
+
+            if not line:
+
+                break
+
+            self.waiting.popleft().set_result(json.loads(line))
+
+        while self.waiting:
+
+            self.waiting.popleft().set_exception(ConnectionError("server closed the connection"))
+
+        return
+
+    async def request(self, message):
+        """Sends a request and waits for its reply
+
+        Args:
+            message (dict): Request.
+
+        Returns:
+            dict: Returns reply.
+        """
+
+        reply = asyncio.get_running_loop().create_future()
+
+        self.waiting.append(reply)
+        self.writer.write((json.dumps(message) + "\n").encode())
+
+        await self.writer.drain()
+
+        return await reply
+
+    def close(self):
+        """Closes the connection
+        """
+
+        self.receiver.cancel()
+        self.writer.close()
+
+        return
+
+
+class LoadGenerator:
+    """Plays games against the server from many connections until the time is up
+
+    Each game guesses random codes until it wins or reaches the guess cutoff, so that almost all of the time is
+    spent in the server. The latency of every request is recorded from sending it to receiving its reply.
+    """
+
+    def __init__(self, host = "127.0.0.1", port = 5556, connections = 10, games = 10, duration = 10, board_length = 4, num_colors = 6, scsa_name = "InsertColors", guess_cutoff = 100):
+        """Constructor for LoadGenerator
+
+        Args:
+            host (str, optional): Address of the server. Defaults to "127.0.0.1".
+            port (int, optional): Port of the server. Defaults to 5556.
+            connections (int, optional): Number of connections to open. Defaults to 10.
+            games (int, optional): Number of games played at once over each connection. Defaults to 10.
+            duration (float, optional): Seconds to generate load for. Defaults to 10.
+            board_length (int, optional): Number of pegs. Defaults to 4.
+            num_colors (int, optional): Number of colors. Defaults to 6.
+            scsa_name (str, optional): Name of the SCSA the server generates codes with. Defaults to "InsertColors".
+            guess_cutoff (int, optional): Number of guesses allowed per game. Defaults to 100.
+        """
+
+        self.host = host
+        self.port = port
+        self.connections = connections
+        self.games = games
+        self.duration = duration
+        self.board_length = board_length
+        self.colors = [chr(i) for i in range(65,91)][:num_colors]
+        self.scsa_name = scsa_name
+        self.guess_cutoff = guess_cutoff
+        self.latencies = []
+        self.results = {"win": 0, "loss": 0, "invalid": 0}
+        self.errors = 0
+        self.elapsed = 0
+
+    async def timed_request(self, connection, message):
+        """Sends a request and records its latency
+
+        Args:
+            connection (Connection): Connection to send it over.
+            message (dict): Request.
+
+        Returns:
+            dict: Returns reply.
+        """
+
+        start = time.perf_counter_ns()
+        reply = await connection.request(message)
+        end = time.perf_counter_ns()
+
+        self.latencies.append(end - start)
+
+        return reply
+
+    async def play_games(self, connection, stop):
+        """Plays games one after another over a connection until the stop time, leaving the last one unfinished
+
+        Args:
+            connection (Connection): Connection to play over.
+            stop (float): Event loop time at which to stop playing.
+        """
+
+        loop = asyncio.get_running_loop()
+        new_session = {"op": "new", "board_length": self.board_length, "num_colors": len(self.colors), "scsa": self.scsa_name, "guess_cutoff": self.guess_cutoff}
+
+        while loop.time() < stop:
+
+            reply = await self.timed_request(connection, new_session)
+
+            if "session" not in reply:
+
+                self.errors += 1
+
+                return
+
+            session_id = reply["session"]
+
+            while loop.time() < stop:
+
+                guess = "".join(random.choice(self.colors) for _ in range(self.board_length))
+                reply = await self.timed_request(connection, {"op": "guess", "session": session_id, "guess": guess})
+
+                if "error" in reply:
+
+                    self.errors += 1
+
+                    break
+
+                if not isinstance(reply["response"], list):
+
+                    self.results[reply["response"]] += 1
+
+                    break
+
+        return
+
+    async def run(self):
+        """Generates load and summarizes it
+
+        Returns:
+            dict: Returns summary, as from summary.
+        """
+
+        loop = asyncio.get_running_loop()
+        connections = []
+
+        for _ in range(self.connections):
+
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+
+            connections.append(Connection(reader, writer))
+
+        start = loop.time()
+        stop = start + self.duration
+
+        try:
+
+            await asyncio.gather(*(self.play_games(connection, stop) for connection in connections for _ in range(self.games)))
+
+        finally:
+
+            for connection in connections:
+
+                connection.close()
+
+        self.elapsed = loop.time() - start
+
+        return self.summary()
+
+    def summary(self):
+        """Summarizes the requests made so far
+
+        Returns:
+            dict: Returns number of requests, requests per second, latency percentiles in milliseconds, results and errors.
+        """
+
+        latencies = sorted(self.latencies)
+
+        return {
+            "requests": len(latencies),
+            "requests_per_second": len(latencies)/self.elapsed if self.elapsed else 0,
+            "p50_ms": percentile(latencies, 0.5)/1e6,
+            "p90_ms": percentile(latencies, 0.9)/1e6,
+            "p99_ms": percentile(latencies, 0.99)/1e6,
+            "max_ms": latencies[-1]/1e6 if latencies else 0,
+            "results": self.results,
+            "errors": self.errors,
+        }
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Measure the throughput and latency of a Mastermind game server.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 5556)
+    parser.add_argument("--connections", type = int, default = 10)
+    parser.add_argument("--games", type = int, default = 10, help = "games played at once over each connection")
+    parser.add_argument("--duration", type = float, default = 10)
+    parser.add_argument("--board-length", type = int, default = 4)
+    parser.add_argument("--num-colors", type = int, default = 6)
+    parser.add_argument("--scsa", default = "InsertColors")
+    parser.add_argument("--guess-cutoff", type = int, default = 100)
+    args = parser.parse_args()
+
+    generator = LoadGenerator(args.host, args.port, args.connections, args.games, args.duration, args.board_length, args.num_colors, args.scsa, args.guess_cutoff)
+    summary = asyncio.run(generator.run())
+
+    print("Requests:", summary["requests"], "in", round(generator.elapsed, 2), "seconds")
+    print("Requests per second:", round(summary["requests_per_second"], 1))
+    print("Latency (ms): p50", round(summary["p50_ms"], 3), "p90", round(summary["p90_ms"], 3), "p99", round(summary["p99_ms"], 3), "max", round(summary["max_ms"], 3))
+    print("Results:", summary["results"], "Errors:", summary["errors"])
@@ -1,87 +1,110 @@
 # Main file to run game of Mastermind based on command-line arguments
 # See example.ipynb for other ways to use the Mastermind representation
 
+import argparse
 import sys
 from scsa import *
 from player import *
 from mastermind import *
-
-if len(sys.argv) != 6:
-     
-    print("Usage: python3 main.py <board length> <num colors> <player name> <scsa name> <num rounds>")
-     
-    sys.exit(1)
-
-board_length = int(sys.argv[1])
-num_colors = int(sys.argv[2])
+from registry import *
+from journal import JournaledMastermind
+from profiling import Profiler
+from speculative import SpeculativePlayer
+from supervised import SupervisedPlayer
+
+parser = argparse.ArgumentParser(usage = "python3 main.py <board length> <num colors> <player name> <scsa name> <num rounds> [--journal FILE [--resume] [--seed SEED]] [--latency] [--metrics FILE] [--profile MODE [--profile-prefix PREFIX]] [--memory MODE] [--speculate EXECUTOR | --supervise [--memory-limit MIB]]")
+parser.add_argument("board_length", type = int)
+parser.add_argument("num_colors", type = int)
+parser.add_argument("player_name")
+parser.add_argument("scsa_name")
+parser.add_argument("num_rounds", type = int)
+parser.add_argument("--journal", help = "file to stream every round to as JSON lines")
+parser.add_argument("--resume", action = "store_true", help = "carry on from the rounds already in the journal")
+parser.add_argument("--seed", default = "0", help = "seed of the journaled tournament")
+parser.add_argument("--latency", action = "store_true", help = "report percentiles of how long guesses and responses take")
+parser.add_argument("--metrics", help = "file to write the telemetry of players and engines to, as text metrics")
+parser.add_argument("--profile", choices = ["cprofile", "sample"], help = "profile the tournament, recording every call or sampling stacks")
+parser.add_argument("--profile-prefix", default = "profile", help = "start of the names of the profile files")
+parser.add_argument("--memory", choices = ["tracemalloc", "rss"], help = "account for memory per round, tracing allocations or reading the resident size")
+parser.add_argument("--speculate", choices = ["thread", "process"], help = "precompute the player's reply to every response in background threads or processes")
+parser.add_argument("--supervise", action = "store_true", help = "run the player in a worker process that is stopped when it runs out of time")
+parser.add_argument("--memory-limit", type = int, help = "largest address space in MiB of the supervised player's worker")
+args = parser.parse_args()
+
+if args.speculate and args.supervise:
+
+    parser.error("--speculate and --supervise cannot be combined")
+
+if args.memory_limit is not None and not args.supervise:
+
+    parser.error("--memory-limit only applies with --supervise")
+
+board_length = args.board_length
+num_colors = args.num_colors
 #colors = [chr(i) for i in range(65,91)][:num_colors]
 #response = (0,0,0)
-player_name = sys.argv[3]
-scsa_name = sys.argv[4]
-num_rounds = int(sys.argv[5])
+player_name = args.player_name
+scsa_name = args.scsa_name
+num_rounds = args.num_rounds
 
 
-if player_name == "RandomFolks":
+player = player_by_name(player_name)
 
-    player = RandomFolks()
+if player is None:
 
-elif player_name == "Boring":
+    print("Unrecognized player.")
+    sys.exit(1)
 
-    player = Boring()
-    
-elif player_name == "RAM":
+if args.speculate:
 
-    player = RAM()
+    player = SpeculativePlayer(player, executor = args.speculate)
 
-else:
-
-    print("Unrecognized player.")
-    sys.exit(1)
+if args.supervise:
 
+    player = SupervisedPlayer(player, memory_limit = args.memory_limit*1024*1024 if args.memory_limit else None)
 
-if scsa_name == "InsertColors":
+scsa = scsa_by_name(scsa_name)
 
-    scsa = InsertColors()
+if scsa is None:
 
-elif scsa_name == "TwoColor":
+    print("Unrecognized SCSA.")
+    sys.exit(1)
 
-    scsa = TwoColor()
+colors = [chr(i) for i in range(65,91)][:num_colors]
 
-elif scsa_name == "ABColor":
+#op = open("output.txt", "w")
+sys.stdout = open('RAM.txt', 'w')
 
-    scsa = ABColor()
+profiler = Profiler(args.profile) if args.profile else None
 
-elif scsa_name == "TwoColorAlternating":
+if profiler is not None:
 
-    scsa = TwoColorAlternating()
+    profiler.start()
 
-elif scsa_name == "OnlyOnce":
+if args.journal:
 
-    scsa = OnlyOnce()
+    mastermind = JournaledMastermind(board_length, colors, journal_path = args.journal, seed = args.seed, latency = args.latency, metrics = bool(args.metrics), memory = args.memory)
+    mastermind.play_tournament(player, scsa, num_rounds, args.resume)
 
-elif scsa_name == "FirstLast":
+else:
 
-    scsa = FirstLast()
+    mastermind = Mastermind(board_length, colors, latency = args.latency, metrics = bool(args.metrics), memory = args.memory)
+    mastermind.play_tournament(player, scsa, num_rounds)
 
-elif scsa_name == "UsuallyFewer":
+if profiler is not None:
 
-    scsa = UsuallyFewer()
+    profiler.stop()
 
-elif scsa_name == "PreferFewer":
+    print("Profile:", ", ".join(profiler.write(args.profile_prefix, player.player_name)))
 
-    scsa = PreferFewer()
+if args.speculate or args.supervise:
 
-else:
+    player.close()
 
-    print("Unrecognized SCSA.")
-    sys.exit(1)
+if args.metrics:
 
-colors = [chr(i) for i in range(65,91)][:num_colors]
+    telemetry.write(args.metrics, {"player": player.player_name, "scsa": scsa.name, "board": str(board_length) + "x" + str(num_colors)})
 
-mastermind = Mastermind(board_length, colors)
-#op = open("output.txt", "w")
-sys.stdout = open('RAM.txt', 'w')
-mastermind.play_tournament(player, scsa, num_rounds)
 sys.stdout.close()
 
 
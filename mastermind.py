@@ -1,11 +1,17 @@
 # File contains implementation of a representation for Mastermind and Rounds of Mastermind
 # See main.py or examples.ipynb for example usages
 
+import concurrent.futures
+import itertools
+import math
 import random
 import time
 from operator import sub
 from scsa import *
 from player import *
+from corpus import *
+from latency import *
+from memory import *
 
 def letter_to_num(letter):
     """Converts letter to number based on position its in alphabet
@@ -31,12 +37,46 @@ def score(results):
 
     return 5*results["win"] - 2*results["failure"]
 
+def feedback(guess, answer):
+    """Computes the response to a guess without building a Round
+
+    Gives the same exact and other counts as Round.process_guess, for use by players and tools that score
+    many guesses against many candidate answers.
+
+    Args:
+        guess (str): Guess of secret code.
+        answer (str): Code the guess is scored against.
+
+    Returns:
+        exact (int): Number of pegs that match exactly with the answer.
+        other (int): Number of pegs that are the right color, but in the wrong location.
+    """
+
+    exact = 0
+
+    for g, a in zip(guess, answer):
+
+        if g == a:
+
+            exact += 1
+
+    common = 0
+
+    for color in set(guess):
+
+        common += min(guess.count(color), answer.count(color))
+
+    return exact, common - exact
+
 
 class Round:
     """Representation for round of the game of Mastermind
     """
 
-    def __init__(self, board_length, colors, answer, scsa, guess_cutoff = 100, time_cutoff = 5):
+    # Rounds are kept by the thousand in server.py, so they carry no per-instance dict
+    __slots__ = ("board_length", "colors", "answer", "scsa", "guesses", "guess_cutoff", "time_cutoff", "time_buffer", "time_used", "latency")
+
+    def __init__(self, board_length, colors, answer, scsa, guess_cutoff = 100, time_cutoff = 5, latency = None):
         """Constuctor for Round
 
         Args:
@@ -46,6 +86,7 @@ class Round:
             scsa (SCSA): Instance of secret-code selection algorithm.
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            latency (LatencyRecorder, optional): Recorder of how long every guess and response takes. Defaults to None.
         """
 
         self.board_length = board_length
@@ -57,6 +98,7 @@ class Round:
         self.time_cutoff = time_cutoff
         self.time_buffer = 0.1 # Seconds
         self.time_used = 0
+        self.latency = latency
 
     def valid_guess(self, guess):
         """Checks whether a guess is valid
@@ -168,11 +210,12 @@ class Round:
 
         return response
 
-    def play_round(self, player):
+    def play_round(self, player, tournament_time = math.inf):
         """Plays out a round of Mastermind
 
         Args:
             player (Player): Player to guess secret code.
+            tournament_time (float, optional): Seconds left of the tournament's time when the round starts. Defaults to no limit.
 
         Returns:
             str: Result of round (win, loss, or failure).
@@ -183,26 +226,50 @@ class Round:
 
         while self.guesses < self.guess_cutoff:
 
-            start = time.time()
-            guess = player.make_guess(self.board_length, self.colors, self.scsa, response)
-            end = time.time()
+            budget = Budget(self.time_cutoff - self.time_used, tournament_time - self.time_used, self.guess_cutoff - self.guesses, self.time_buffer)
+
+            start = time.perf_counter_ns()
+
+            try:
+
+                guess = player.make_timed_guess(self.board_length, self.colors, self.scsa, response, budget)
+
+            except GuessLimitExceeded:
+
+                self.guesses += 1
+                self.time_used += (time.perf_counter_ns() - start)/1e9
+
+                return ("loss", self.guesses)
+
+            end = time.perf_counter_ns()
 
             self.guesses += 1
 
             duration = end - start
 
-            self.time_used += duration
+            self.time_used += duration/1e9
+
+            if self.latency is not None:
+
+                self.latency.record("make_guess", self.scsa.name if self.scsa is not None else None, self.guesses, duration)
 
             if self.time_used > self.time_cutoff + self.time_buffer:
 
                 return ("loss", self.guesses)
 
+            start = time.perf_counter_ns()
             response = self.respond_to_guess(guess)
 
+            if self.latency is not None:
+
+                self.latency.record("respond_to_guess", self.scsa.name if self.scsa is not None else None, self.guesses, time.perf_counter_ns() - start)
+
             #print("Response:", response, "Time:", self.time_used)
 
             if response == "win":
 
+                player.observe_answer(self.answer)
+
                 return ("win", self.guesses)
 
             elif response == "invalid":
@@ -211,12 +278,34 @@ class Round:
 
         return ("loss", self.guesses)
 
+    def play_session(self, player, tournament_time = math.inf):
+        """Plays out a round of Mastermind with a new session of the player, closing the session after the round
+
+        Args:
+            player (Player): Player whose session guesses the secret code.
+            tournament_time (float, optional): Seconds left of the tournament's time when the round starts. Defaults to no limit.
+
+        Returns:
+            str: Result of round (win, loss, or failure).
+            int: Number of rounds until that result was achieved.
+        """
+
+        session = player.new_session()
+
+        try:
+
+            return self.play_round(session, tournament_time)
+
+        finally:
+
+            session.close()
+
 
 class Mastermind:
     """Representation to play the game of Mastermind
     """
 
-    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,91)], guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300):
+    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,91)], guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300, latency = False, metrics = False, memory = None):
         """Constructor for Mastermind
 
         Args:
@@ -225,6 +314,9 @@ class Mastermind:
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             round_time_cutoff (int, optional):  Amount of time in seconds allowed for the round. Defaults to 5.
             tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 300.
+            latency (bool, optional): Whether to keep histograms of how long every guess and response takes. Defaults to False.
+            metrics (bool, optional): Whether to collect the telemetry players and engines report, per round. Defaults to False.
+            memory (str, optional): "tracemalloc" or "rss" to account for memory per round. Defaults to None, which does not.
         """
 
         self.board_length = board_length
@@ -234,6 +326,48 @@ class Mastermind:
         self.round_time_cutoff = round_time_cutoff
         self.tournament_time_cutoff = tournament_time_cutoff
         self.time_used = 0
+        self.latency = LatencyRecorder() if latency else None
+        self.metrics = metrics
+        self.memory = MemoryRecorder(memory) if memory else None
+
+    def start_metrics(self):
+        """Starts collecting telemetry and accounting for memory afresh for a tournament, for whichever are on
+        """
+
+        if self.metrics:
+
+            telemetry.reset()
+
+            telemetry.enabled = True
+
+        if self.memory is not None:
+
+            self.memory.start()
+
+        return
+
+    def end_round_metrics(self):
+        """Closes the latency histograms, telemetry counters and memory accounting of a round that was just played
+
+        Returns:
+            dict: Returns latency summary, telemetry counters and memory of the round, for whichever are on.
+        """
+
+        summary = {}
+
+        if self.latency is not None:
+
+            summary["latency"] = self.latency.end_round()
+
+        if self.metrics:
+
+            summary["metrics"] = telemetry.end_round()
+
+        if self.memory is not None:
+
+            summary["memory"] = self.memory.end_round()
+
+        return summary
 
     def print_results(self, player, results, num_rounds):
         """Prints results for a tournament
@@ -250,6 +384,21 @@ class Mastermind:
         print("Results:", results)
         print("Score:", score(results))
 
+        if self.latency is not None:
+
+            self.latency.print_summary()
+
+        if self.metrics:
+
+            telemetry.enabled = False
+
+            telemetry.print_summary()
+
+        if self.memory is not None:
+
+            self.memory.print_summary()
+            self.memory.stop()
+
         return 
 
     def play_tournament(self, player, scsa, num_rounds):
@@ -263,18 +412,24 @@ class Mastermind:
         
         results = {"win": 0, "loss": 0, "failure": 0}
 
-        
+        player.prepare(self.board_length, self.colors, scsa)
+        self.start_metrics()
+
+        # Codes are generated a batch at a time between rounds, outside the time of any round
+        codes = itertools.chain.from_iterable(scsa.iter_codes(self.board_length, self.colors, 1024, num_rounds))
 
         for i in range(1,num_rounds+1):
 
-            code = scsa.generate_codes(self.board_length, self.colors, 1)
+            code = next(codes, None)
 
-            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff)
+            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff, self.latency)
 
             start = time.time()
-            result, guesses = round.play_round(player)
+            result, guesses = round.play_round(player, self.tournament_time_cutoff - self.time_used)
             end = time.time()
 
+            self.end_round_metrics()
+
             duration = end - start
             
             self.time_used += duration
@@ -302,27 +457,32 @@ class Mastermind:
         Args:
             player (Player): Player who plays in tournament, making guesses.
             scsa (SCSA): SCSA that codes in file are generated from.
-            code_file (str): Name of file to read secret codes from.
+            code_file (str): Name of file to read secret codes from, packed or one per line.
         """
 
-        codes = read_from_file(code_file)
+        codes = open_codes(code_file)
 
         num_rounds = len(codes)
 
         results = {"win": 0, "loss": 0, "failure": 0}
 
+        player.prepare(self.board_length, self.colors, scsa)
+        self.start_metrics()
+
         cur_round = 0
 
         for code in codes:
 
             cur_round += 1
 
-            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff)
+            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff, self.latency)
 
             start = time.time()
-            result, guesses = round.play_round(player)
+            result, guesses = round.play_round(player, self.tournament_time_cutoff - self.time_used)
             end = time.time()
 
+            self.end_round_metrics()
+
             duration = end - start
             
             self.time_used += duration
@@ -339,6 +499,88 @@ class Mastermind:
 
                 break
 
+        if isinstance(codes, Corpus):
+
+            codes.close()
+
         self.print_results(player, results, num_rounds)
 
         return
+
+
+    def play_concurrent_tournament(self, player, scsa, num_rounds, concurrency = 8):
+        """Plays a tournament of Mastermind with several rounds in progress at once
+
+        Every round is played by its own session of the player in a thread. Results are counted in round order
+        with the same rules as play_tournament. Useful for players that wait on other processes or machines.
+
+        Each round's latencies are recorded apart and added to the tournament's when the round is counted, so
+        they are the same as in play_tournament. Rounds overlap, so telemetry counters and memory are closed
+        whenever a round is counted and hold whatever all rounds in progress did since the last one was.
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds to play Mastermind.
+            concurrency (int, optional): Number of rounds in progress at once. Defaults to 8.
+        """
+
+        results = {"win": 0, "loss": 0, "failure": 0}
+
+        codes = [code for batch in scsa.iter_codes(self.board_length, self.colors, max(num_rounds, 1), num_rounds) for code in batch]
+
+        player.prepare(self.board_length, self.colors, scsa)
+        self.start_metrics()
+
+        def play(code):
+
+            latency = LatencyRecorder() if self.latency is not None else None
+            round = Round(self.board_length, self.colors, code, scsa, self.guess_cutoff, self.round_time_cutoff, latency)
+
+            start = time.time()
+            result, guesses = round.play_session(player, self.tournament_time_cutoff - self.time_used)
+            end = time.time()
+
+            return result, guesses, end - start, latency
+
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+
+            # Rounds are submitted as earlier ones finish, so that a stopped tournament does not play the rest
+            pending = [pool.submit(play, code) for code in codes[:concurrency]]
+            submitted = len(pending)
+
+            for i in range(num_rounds):
+
+                result, guesses, duration, latency = pending.pop(0).result()
+
+                if submitted < num_rounds:
+
+                    pending.append(pool.submit(play, codes[submitted]))
+                    submitted += 1
+
+                if latency is not None:
+
+                    self.latency.merge_round(latency)
+
+                self.end_round_metrics()
+
+                self.time_used += duration
+
+                if self.time_used > self.tournament_time_cutoff:
+
+                    break
+
+                results[result] += 1
+
+                if result == "failure":
+
+                    break
+
+            for future in pending:
+
+                future.cancel()
+
+        self.print_results(player, results, num_rounds)
+
+        return
+
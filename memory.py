@@ -0,0 +1,290 @@
+# File contains per-round memory accounting for tournaments, to catch players and engines that keep growing
+# Run python main.py 4 6 RAM PreferFewer 300 --memory tracemalloc to print the memory of every tournament
+#
+# The "tracemalloc" mode traces every Python allocation, so it measures each round's peak exactly and can name the
+# lines that allocated what was retained, but slows the tournament down. What the instrumentation itself keeps, such
+# as the per-round records of this file, latency.py and telemetry.py, is left out of what it measures. The "rss"
+# mode only reads the resident size of the process from the operating system, which costs nothing but cannot see a
+# round's peak.
+#     mastermind = Mastermind(4, colors, memory = "tracemalloc")
+
+import os
+import resource
+import sys
+import tracemalloc
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# Files whose allocations are the per-round records of the instrumentation rather than the tournament's
+INSTRUMENTATION_FILES = ["memory.py", "latency.py", "telemetry.py"]
+
+def instrumentation_filters():
+    """Makes the filters that leave the instrumentation's own allocations out of a snapshot
+
+    Returns:
+        list of tracemalloc.Filters: Returns filters excluding tracemalloc and every file in INSTRUMENTATION_FILES.
+    """
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    for name in INSTRUMENTATION_FILES:
+
+        filters.append(tracemalloc.Filter(False, os.path.join(DIRECTORY, name)))
+        filters.append(tracemalloc.Filter(False, name))
+
+    return filters
+
+def resident_size():
+    """Reads the resident set size of this process
+
+    Returns:
+        int: Returns bytes of memory resident, or the peak resident size where the current one cannot be read.
+    """
+
+    try:
+
+        with open("/proc/self/statm") as file:
+
+            return int(file.read().split()[1])*os.sysconf("SC_PAGE_SIZE")
+
+    except (OSError, ValueError, IndexError):
+
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        return peak if sys.platform == "darwin" else peak*1024
+
+def format_bytes(size):
+    """Formats a number of bytes for reading
+
+    Args:
+        size (int): Number of bytes, which may be negative.
+
+    Returns:
+        str: Returns size in B, KiB, MiB or GiB.
+    """
+
+    for unit in ["B", "KiB", "MiB"]:
+
+        if abs(size) < 1024:
+
+            return "{:.1f} {}".format(size, unit) if unit != "B" else str(size) + " B"
+
+        size /= 1024
+
+    return "{:.1f} GiB".format(size)
+
+
+class MemoryRecorder:
+    """Memory of a tournament, round by round
+
+    After every round the memory in use is recorded together with how much it grew since the end of the round
+    before (retained) and, in the tracemalloc mode, the most in use at any point of the round above where it
+    started (peak). Memory that keeps growing in nearly every round, as it does for players that keep every
+    round's state in class-level lists, is flagged.
+
+    In the tracemalloc mode, memory in use is measured from a snapshot without the instrumentation's
+    allocations, so the records kept every round by this recorder, the latency histograms and telemetry do not
+    count as growth. The peak is measured from everything traced during the round, since it starts afresh
+    every round and the little the instrumentation adds to it does not build up.
+    """
+
+    def __init__(self, mode = "tracemalloc", min_rounds = 10, growth_fraction = 0.8):
+        """Constructor for MemoryRecorder
+
+        Args:
+            mode (str, optional): "tracemalloc" or "rss". Defaults to "tracemalloc".
+            min_rounds (int, optional): Fewest rounds before growth is flagged. Defaults to 10.
+            growth_fraction (float, optional): Fraction of rounds that must retain memory for growth to be flagged. Defaults to 0.8.
+
+        Raises:
+            ValueError: Raised if the mode is unknown.
+        """
+
+        if mode not in ("tracemalloc", "rss"):
+
+            raise ValueError("Unknown memory accounting mode " + str(mode))
+
+        self.mode = mode
+        self.min_rounds = min_rounds
+        self.growth_fraction = growth_fraction
+        self.rounds = []
+        self.start_memory = 0
+        self.last_memory = 0
+        self.last_traced = 0
+        self.snapshot = None
+        self.started_tracing = False
+
+    def current(self):
+        """Measures the memory in use
+
+        Returns:
+            int: Returns bytes traced by tracemalloc, leaving out the instrumentation's, or resident, depending on the mode.
+        """
+
+        if self.mode == "tracemalloc":
+
+            snapshot = tracemalloc.take_snapshot().filter_traces(instrumentation_filters())
+
+            return sum(statistic.size for statistic in snapshot.statistics("filename"))
+
+        return resident_size()
+
+    def start(self):
+        """Starts accounting for a tournament
+        """
+
+        if self.mode == "tracemalloc":
+
+            if not tracemalloc.is_tracing():
+
+                tracemalloc.start()
+
+                self.started_tracing = True
+
+            tracemalloc.reset_peak()
+
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(instrumentation_filters())
+            self.last_traced = tracemalloc.get_traced_memory()[0]
+
+        self.rounds = []
+        self.start_memory = self.current()
+        self.last_memory = self.start_memory
+
+        return
+
+    def end_round(self):
+        """Records the memory of the round that was just played
+
+        Returns:
+            dict: Returns bytes in use after the round, retained by the round and, in the tracemalloc mode, the
+                  round's peak above the memory in use when it started.
+        """
+
+        if self.mode == "tracemalloc":
+
+            peak = tracemalloc.get_traced_memory()[1] - self.last_traced
+            current = self.current()
+
+        else:
+
+            current, peak = self.current(), None
+
+        record = {"current": current, "retained": current - self.last_memory, "peak": peak}
+
+        self.rounds.append(record)
+        self.last_memory = current
+
+        # The peak of the next round is measured from what is traced once this round's record is made
+        if self.mode == "tracemalloc":
+
+            tracemalloc.reset_peak()
+
+            self.last_traced = tracemalloc.get_traced_memory()[0]
+
+        return record
+
+    def growing(self):
+        """Checks whether memory grew across the tournament in nearly every round
+
+        Returns:
+            bool: Returns True if at least min_rounds were played, growth_fraction of them retained memory and the
+                  memory in use ended higher than it started.
+        """
+
+        if len(self.rounds) < self.min_rounds:
+
+            return False
+
+        grew = sum(1 for record in self.rounds if record["retained"] > 0)
+
+        return grew >= self.growth_fraction*len(self.rounds) and self.last_memory > self.start_memory
+
+    def top_growth(self, limit = 5):
+        """Finds the lines that allocated the most memory still in use since the tournament started
+
+        Args:
+            limit (int, optional): Number of lines. Defaults to 5.
+
+        Returns:
+            list of tuples: Returns file:line and bytes grown, largest first, or an empty list in the rss mode.
+        """
+
+        if self.mode != "tracemalloc" or self.snapshot is None or not tracemalloc.is_tracing():
+
+            return []
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(instrumentation_filters())
+        growth = []
+
+        for difference in snapshot.compare_to(self.snapshot, "lineno")[:limit]:
+
+            if difference.size_diff > 0:
+
+                frame = difference.traceback[0]
+
+                growth.append((os.path.basename(frame.filename) + ":" + str(frame.lineno), difference.size_diff))
+
+        return growth
+
+    def summary(self):
+        """Summarizes the tournament
+
+        Returns:
+            dict: Returns mode, rounds, memory at start and end, largest peak and retained of a round and their
+                  rounds, whether memory kept growing and the lines it grew at.
+        """
+
+        summary = {"mode": self.mode, "rounds": len(self.rounds), "start": self.start_memory, "end": self.last_memory, "growing": self.growing()}
+
+        for key in ("peak", "retained"):
+
+            values = [(record[key], i + 1) for i, record in enumerate(self.rounds) if record[key] is not None]
+
+            summary["max_" + key], summary["max_" + key + "_round"] = max(values) if values else (None, None)
+
+        summary["top_growth"] = self.top_growth() if summary["growing"] else []
+
+        return summary
+
+    def stop(self):
+        """Stops tracing if the recorder started it
+        """
+
+        if self.started_tracing:
+
+            tracemalloc.stop()
+
+            self.started_tracing = False
+
+        self.snapshot = None
+
+        return
+
+    def print_summary(self, summary = None):
+        """Prints the memory of the tournament
+
+        Args:
+            summary (dict, optional): Summary to print. Defaults to the summary of the tournament so far.
+        """
+
+        summary = summary if summary is not None else self.summary()
+
+        print("Memory (" + summary["mode"] + "):", format_bytes(summary["start"]), "at start,", format_bytes(summary["end"]), "at end")
+
+        if summary["max_peak"] is not None:
+
+            print("Largest round peak:", format_bytes(summary["max_peak"]), "in round", summary["max_peak_round"])
+
+        if summary["max_retained"] is not None:
+
+            print("Largest round retained:", format_bytes(summary["max_retained"]), "in round", summary["max_retained_round"])
+
+        if summary["growing"]:
+
+            print("Warning: memory grew in nearly every round, by", format_bytes((summary["end"] - summary["start"])//max(summary["rounds"], 1)), "per round on average")
+
+            for line, size in summary["top_growth"]:
+
+                print("  " + format_bytes(size), "more allocated at", line)
+
+        return
@@ -0,0 +1,987 @@
+# File contains an exact solver for the optimal guessing strategy on small boards
+# Run python3 oracle.py <board length> <num colors> [scsa name] to print the optimal guess counts
+
+import argparse
+import collections
+import math
+import multiprocessing
+import operator
+import signal
+import sys
+import threading
+from solvers import *
+from cache import *
+from sharedmem import *
+
+try:
+
+    numpy = load_numpy()
+
+except ImportError:
+
+    numpy = None
+
+def responses_needed(size, num_responses):
+    """Fewest guesses that can always identify one of size codes
+
+    Every guess either wins or splits the remaining codes into at most num_responses - 1 classes, so d guesses
+    tell apart at most 1 + (num_responses - 1) + ... + (num_responses - 1)**(d - 1) codes.
+
+    Args:
+        size (int): Number of remaining codes.
+        num_responses (int): Number of distinct responses, including the winning one.
+
+    Returns:
+        int: Returns lower bound on the worst-case number of guesses.
+    """
+
+    depth = 0
+    reachable = 0
+    level = 1
+
+    while reachable < size:
+
+        reachable += level
+        level *= num_responses - 1
+        depth += 1
+
+    return depth
+
+
+class Oracle:
+    """Exhaustive game-tree search for the optimal strategy on a board
+
+    The secret is drawn from the SCSA's code space with the SCSA's probabilities (or uniformly from every code
+    when no SCSA is given). Each node of the search is the set of codes still consistent with the guesses so
+    far. Nodes are memoized under a relabeling of colors and positions, so symmetric sets are solved once.
+    Guesses are pruned with lower bounds, and guesses that split a node the same way are only tried once.
+    """
+
+    def __init__(self, board_length, colors, scsa = None, objective = "expected", pool = "all"):
+        """Constructor for Oracle
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA, optional): SCSA the secret is drawn from. Defaults to every code being equally likely.
+            objective (str, optional): "expected" to minimize the expected number of guesses or "worst" to minimize
+                                       the worst-case number. Defaults to "expected".
+            pool (str, optional): "all" to allow every code as a guess or "candidates" to only guess codes that could
+                                  still be the secret, which is much faster but not always optimal. Defaults to "all".
+        """
+
+        if objective not in ("expected", "worst"):
+
+            raise ValueError("Unrecognized objective: " + str(objective))
+
+        if pool not in ("all", "candidates"):
+
+            raise ValueError("Unrecognized pool: " + str(pool))
+
+        self.board_length = board_length
+        self.colors = colors
+        self.scsa = scsa
+        self.objective = objective
+        self.pool = pool
+        self.win = board_length*(board_length + 1)
+        self.num_responses = (board_length + 1)*(board_length + 2)//2 - 1
+
+        if scsa is None:
+
+            self.codes = all_codes(board_length, colors)
+            self.weights = [1]*len(self.codes)
+
+        else:
+
+            self.codes = scsa.code_space(board_length, colors)
+            self.weights = [scsa.pmf(code, colors) for code in self.codes]
+
+            # Equal weights are kept as integers so that costs stay exact
+            if max(self.weights) - min(self.weights) <= 1e-12*max(self.weights):
+
+                self.weights = [1]*len(self.codes)
+
+        self.uniform = all(weight == 1 for weight in self.weights)
+        self.symmetric = self.color_symmetric()
+        self.rows = {}
+        self.table = None
+        self.guess_rows = {guess: i for i, guess in enumerate(all_codes(board_length, colors))}
+        self.matrix = None
+        self.pools = {}
+        self.size_bounds = [0]
+        self.memo = {}
+        self.bounds = {}
+        self.nodes = 0
+
+    def color_symmetric(self):
+        """Checks whether swapping any two colors maps the weighted code space onto itself
+
+        Returns:
+            bool: Returns True if colors are interchangeable.
+        """
+
+        weight_of = dict(zip(self.codes, self.weights))
+
+        for i in range(len(self.colors) - 1):
+
+            swap = {self.colors[i]: self.colors[i + 1], self.colors[i + 1]: self.colors[i]}
+
+            for code, weight in weight_of.items():
+
+                swapped = list_to_str([swap.get(peg, peg) for peg in code])
+
+                if abs(weight_of.get(swapped, 0) - weight) > 1e-12*abs(weight):
+
+                    return False
+
+        return True
+
+    def row(self, guess):
+        """Scores a guess against every code in the code space
+
+        Args:
+            guess (str): Guess to score.
+
+        Returns:
+            bytes or memoryview: Returns response id (exact*(board_length + 1) + other) for every code.
+        """
+
+        if self.table is not None:
+
+            return self.table.row(self.guess_rows[guess])
+
+        if not self.rows:
+
+            # Nearly every guess is tried somewhere in the search, so every row is scored at once
+            guesses = all_codes(self.board_length, self.colors)
+
+            self.rows = dict(zip(guesses, response_rows(guesses, self.codes, self.board_length)))
+
+        return self.rows[guess]
+
+    def response_matrix(self):
+        """Gives the rows of every guess as one NumPy array, so that many guesses are scored at once
+
+        Returns:
+            numpy.ndarray: Returns array of response ids with a row per code of the board, in lexicographic order,
+                           and a column per code in the code space.
+        """
+
+        if self.matrix is None:
+
+            if self.table is not None:
+
+                buffer = self.table.buffer
+
+            else:
+
+                self.row(self.codes[0])
+
+                buffer = b"".join(self.rows.values())
+
+            self.matrix = numpy.frombuffer(buffer, dtype = numpy.uint8).reshape(-1, len(self.codes))
+
+        return self.matrix
+
+    def share_rows(self, handle):
+        """Looks guesses up in a response table built by another process instead of scoring them again
+
+        Args:
+            handle (tuple): The handle attribute of a ResponseTable of every code of the board against self.codes.
+        """
+
+        self.table = attach(handle)
+
+        return
+
+    def partition(self, subset, guess):
+        """Splits a set of codes by their response to a guess
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            guess (str): Guess to split by.
+
+        Returns:
+            dict: Returns map from response id to list of indices.
+        """
+
+        row = self.row(guess)
+        parts = {}
+
+        for i in subset:
+
+            parts.setdefault(row[i], []).append(i)
+
+        return parts
+
+    def lower_bound(self, subset):
+        """Lower bound on the cost of a set of codes
+
+        The k-th guess can find at most (num_responses - 1)**(k - 1) codes, one per history that reaches it, so the
+        cost is at least that of finding the likeliest code first, the next num_responses - 1 with the second
+        guess, and so on.
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+
+        Returns:
+            num: Returns lower bound on the total weighted number of guesses, or on the worst-case number of guesses.
+        """
+
+        if self.objective == "worst":
+
+            return responses_needed(len(subset), self.num_responses)
+
+        if self.uniform:
+
+            return self.size_bound(len(subset))
+
+        weights = sorted((self.weights[i] for i in subset), reverse = True)
+        total = 0
+        start = 0
+        level = 1
+        depth = 1
+
+        while start < len(weights):
+
+            total += depth*sum(weights[start:start + level])
+            start += level
+            level *= self.num_responses - 1
+            depth += 1
+
+        return total
+
+    def size_bound(self, size):
+        """Lower bound on the cost of size equally likely codes
+
+        Args:
+            size (int): Number of codes.
+
+        Returns:
+            int: Returns lower bound on the total number of guesses.
+        """
+
+        while len(self.size_bounds) <= size:
+
+            # The m-th code found is found no earlier than guess responses_needed(m)
+            m = len(self.size_bounds)
+            self.size_bounds.append(self.size_bounds[-1] + responses_needed(m, self.num_responses))
+
+        return self.size_bounds[size]
+
+    def canonical(self, subset):
+        """Relabels colors and positions of a set of codes into a canonical form
+
+        Positions are ordered by how their colors are distributed and colors by where they occur, with ties kept
+        in their original order. Two sets with the same canonical form are the same up to relabeling and so have
+        the same cost.
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+
+        Returns:
+            tuple: Returns canonical key.
+            list of ints: Original position of every canonical position.
+            dict: Map from original color to canonical color.
+        """
+
+        codes = [self.codes[i] for i in subset]
+        counts = [collections.Counter(code[p] for code in codes) for p in range(self.board_length)]
+
+        order = sorted(range(self.board_length), key = lambda p: (sorted(counts[p].values()), p))
+
+        ranked = sorted(range(len(self.colors)), key = lambda c: ([-counts[p][self.colors[c]] for p in order], c))
+        color_map = {}
+
+        for rank, c in enumerate(ranked):
+
+            color_map[self.colors[c]] = self.colors[rank]
+
+        relabeled = [list_to_str([color_map[code[p]] for p in order]) for code in codes]
+
+        if self.uniform:
+
+            key = tuple(sorted(relabeled))
+
+        else:
+
+            key = tuple(sorted(zip(relabeled, [self.weights[i] for i in subset])))
+
+        return key, order, color_map
+
+    def guess_pool(self, subset, free):
+        """Lists the guesses worth trying on a set of codes
+
+        Colors that occur in none of the codes split the set the same way, so only one of them is used. When colors
+        are interchangeable, colors not used by any earlier guess are only tried in a fixed order.
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            free (frozenset of chrs): Colors not used by any earlier guess.
+
+        Returns:
+            list of strs: Returns guesses.
+        """
+
+        return self.pooled(subset, free)[0]
+
+    def pooled(self, subset, free):
+        """Lists the guesses worth trying on a set of codes together with their rows in the response matrix
+
+        Pools only depend on the colors the codes use and the free colors, so they are built once for each.
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            free (frozenset of chrs): Colors not used by any earlier guess.
+
+        Returns:
+            list of strs: Returns guesses, as guess_pool does.
+            numpy.ndarray or None: Returns row of every guess, or None if NumPy is not installed.
+        """
+
+        if self.pool == "candidates":
+
+            guesses = [self.codes[i] for i in subset]
+
+            return guesses, None if numpy is None else numpy.array([self.guess_rows[guess] for guess in guesses])
+
+        present = set()
+
+        for i in subset:
+
+            present.update(self.codes[i])
+
+        alphabet = [color for color in self.colors if color in present]
+        absent = [color for color in self.colors if color not in present]
+
+        if absent:
+
+            alphabet.append(absent[0])
+
+        interchangeable = [color for color in alphabet if color in free] if self.symmetric else []
+        key = (tuple(alphabet), tuple(interchangeable))
+
+        if key in self.pools:
+
+            return self.pools[key]
+
+        guesses = []
+
+        for guess in itertools.product(alphabet, repeat = self.board_length):
+
+            # Interchangeable colors must first appear in the order they are listed
+            used = [color for color in dict.fromkeys(guess) if color in interchangeable]
+
+            if used != interchangeable[:len(used)]:
+
+                continue
+
+            guesses.append(list_to_str(guess))
+
+        self.pools[key] = (guesses, None if numpy is None else numpy.array([self.guess_rows[guess] for guess in guesses]))
+
+        return self.pools[key]
+
+    def options(self, subset, free, limit = math.inf):
+        """Scores every useful guess on a set of codes by its lower bound
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            free (frozenset of chrs): Colors not used by any earlier guess.
+            limit (num, optional): Lower bound at or above which a guess is left out. Defaults to math.inf.
+
+        Returns:
+            list of tuples: Returns (lower bound, guess, responses) sorted by lower bound, where responses holds the
+                            response id of every code in subset.
+        """
+
+        if numpy is not None and (self.objective == "worst" or self.uniform):
+
+            return self.counted_options(subset, free, limit)
+
+        options = []
+        seen = set()
+        responses_of = operator.itemgetter(*subset)
+
+        if len(subset) == 1:
+
+            # itemgetter of a single index returns the item rather than a tuple
+            responses_of = lambda row: (row[subset[0]],)
+
+        total = sum(self.weights[i] for i in subset)
+
+        for guess in self.guess_pool(subset, free):
+
+            responses = responses_of(self.row(guess))
+
+            # Guesses that give every code the same response as an earlier guess lead to the same subtree
+            if responses in seen:
+
+                continue
+
+            seen.add(responses)
+
+            counts = collections.Counter(responses)
+
+            if len(counts) == 1 and self.win not in counts:
+
+                continue
+
+            if self.objective == "worst":
+
+                # The bound only grows with the size of a class, so only the largest one needs it
+                bound = 1 + responses_needed(max((count for response, count in counts.items() if response != self.win), default = 0), self.num_responses)
+
+            elif self.uniform:
+
+                bound = total + sum(self.size_bound(count) for response, count in counts.items() if response != self.win)
+
+            else:
+
+                bound = total + sum(self.lower_bound(part) for response, part in self.split(subset, responses).items() if response != self.win)
+
+            if bound < limit:
+
+                options.append((bound, guess, responses))
+
+        options.sort(key = lambda option: (option[0], option[1]))
+
+        return options
+
+    def counted_options(self, subset, free, limit = math.inf):
+        """Scores every useful guess on a set of codes by its lower bound, counting the classes of all guesses at once
+
+        Gives the same options as options, for the bounds that only depend on the sizes of the classes.
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            free (frozenset of chrs): Colors not used by any earlier guess.
+            limit (num, optional): Lower bound at or above which a guess is left out. Defaults to math.inf.
+
+        Returns:
+            list of tuples: Returns (lower bound, guess, responses) sorted by lower bound, where responses holds the
+                            response id of every code in subset.
+        """
+
+        matrix = self.response_matrix()
+        guesses, rows = self.pooled(subset, free)
+        responses = matrix[numpy.ix_(rows, subset)]
+        width = self.win + 1
+
+        # Class sizes of every guess, one row per guess and one column per response
+        counts = numpy.bincount((responses + numpy.arange(len(guesses))[:, None]*width).ravel(), minlength = len(guesses)*width).reshape(len(guesses), width)
+        wins = counts[:, self.win].copy()
+        counts[:, self.win] = 0
+
+        if self.objective == "worst":
+
+            needed = numpy.array([responses_needed(size, self.num_responses) for size in range(len(subset) + 1)])
+            bounds = 1 + needed[counts.max(axis = 1)]
+
+        else:
+
+            size_bounds = numpy.array([self.size_bound(size) for size in range(len(subset) + 1)])
+            bounds = len(subset) + size_bounds[counts].sum(axis = 1)
+
+        # A guess that neither wins nor splits the codes tells nothing
+        useful = (numpy.count_nonzero(counts, axis = 1) != 1) | (wins > 0)
+        options = []
+        seen = set()
+
+        for i in numpy.flatnonzero(useful & (bounds < limit)):
+
+            row = responses[i].tobytes()
+
+            # Guesses that give every code the same response as an earlier guess lead to the same subtree
+            if row in seen:
+
+                continue
+
+            seen.add(row)
+            options.append((int(bounds[i]), guesses[i], tuple(row)))
+
+        options.sort(key = lambda option: (option[0], option[1]))
+
+        return options
+
+    def split(self, subset, responses):
+        """Groups a set of codes by response
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            responses (tuple of ints): Response id of every code in subset.
+
+        Returns:
+            dict: Returns map from response id to list of indices.
+        """
+
+        parts = {}
+
+        for i, response in zip(subset, responses):
+
+            parts.setdefault(response, []).append(i)
+
+        return parts
+
+    def evaluate(self, subset, free, guess, responses, bound, limit):
+        """Computes the cost of starting a set of codes with a guess
+
+        Args:
+            subset (tuple of ints): Indices of codes.
+            free (frozenset of chrs): Colors not used by any earlier guess.
+            guess (str): First guess.
+            responses (tuple of ints): Response id of every code in subset to the guess.
+            bound (num): Lower bound on the cost of the guess.
+            limit (num): Cost at or above which the guess is of no interest.
+
+        Returns:
+            num: Returns exact cost if it is below limit, otherwise a value of at least limit.
+        """
+
+        free = free - set(guess)
+        total = bound
+        worst = 0
+        parts = self.split(subset, responses)
+
+        for response, part in sorted(parts.items(), key = lambda item: -len(item[1])):
+
+            if response == self.win:
+
+                continue
+
+            part_bound = self.lower_bound(part)
+
+            if self.objective == "worst":
+
+                cost, _ = self.solve(tuple(part), free, limit - 1)
+                worst = max(worst, cost)
+                total = 1 + worst
+
+            else:
+
+                cost, _ = self.solve(tuple(part), free, limit - (total - part_bound))
+                total += cost - part_bound
+
+            if total >= limit:
+
+                return total
+
+        return total
+
+    def solve(self, subset, free = None, limit = math.inf):
+        """Finds the optimal cost and first guess for a set of codes
+
+        Args:
+            subset (tuple of ints): Indices of codes that could still be the secret.
+            free (frozenset of chrs, optional): Colors not used by any earlier guess. Defaults to every color.
+            limit (num, optional): Cost at or above which the exact value is of no interest. Defaults to math.inf.
+
+        Returns:
+            num: Returns optimal total weighted number of guesses (or worst-case number of guesses) if it is below
+                 limit, otherwise a value of at least limit.
+            str or None: Returns optimal first guess, or None if the cost is not below limit.
+        """
+
+        if free is None:
+
+            free = frozenset(self.colors)
+
+        if self.objective == "worst" and limit == math.inf and len(subset) > 2:
+
+            # Asking for one more guess at a time hands every subtree a limit, which prunes far more than solving
+            # each subtree exactly
+            depth = self.lower_bound(subset)
+
+            while True:
+
+                cost, guess = self.solve(subset, free, depth + 1)
+
+                if guess is not None:
+
+                    return cost, guess
+
+                depth += 1
+
+        if len(subset) == 1:
+
+            return (1 if self.objective == "worst" else self.weights[subset[0]]), self.codes[subset[0]]
+
+        bound = self.lower_bound(subset)
+
+        if bound >= limit:
+
+            return bound, None
+
+        if len(subset) == 2:
+
+            # Guessing the likelier code first meets the lower bound
+            first = max(subset, key = lambda i: self.weights[i])
+
+            return bound, self.codes[first]
+
+        key, order, color_map = self.canonical(subset)
+
+        if key in self.memo:
+
+            cost, canonical_guess = self.memo[key]
+            inverse = {canonical: original for original, canonical in color_map.items()}
+            guess = [None]*self.board_length
+
+            for i, p in enumerate(order):
+
+                guess[p] = inverse[canonical_guess[i]]
+
+            return cost, list_to_str(guess)
+
+        if self.bounds.get(key, bound) >= limit:
+
+            return self.bounds[key], None
+
+        self.nodes += 1
+
+        best = limit
+        best_guess = None
+
+        for option_bound, guess, responses in self.options(subset, free, limit):
+
+            if option_bound >= best:
+
+                break
+
+            cost = self.evaluate(subset, free, guess, responses, option_bound, best)
+
+            if cost < best:
+
+                best = cost
+                best_guess = guess
+
+        if best_guess is None:
+
+            # Moved to the end of the table, so that a worker sends a raised bound back as a new entry
+            self.bounds.pop(key, None)
+            self.bounds[key] = limit
+
+            return limit, None
+
+        self.memo[key] = (best, list_to_str([color_map[best_guess[p]] for p in order]))
+
+        return best, best_guess
+
+    def solve_cached(self, cache, processes = 1):
+        """Solves the whole code space, or loads the solution and memo table of an earlier identical solve
+
+        Args:
+            cache (ArtifactCache): Cache to look in.
+            processes (int, optional): Number of worker processes if it is not cached. Defaults to 1.
+
+        Returns:
+            num: Returns optimal total weighted number of guesses (or worst-case number of guesses).
+            str: Returns optimal first guess.
+        """
+
+        params = {
+            "board_length": self.board_length,
+            "colors": list_to_str(self.colors),
+            "scsa": self.scsa.name if self.scsa is not None else None,
+            "objective": self.objective,
+            "pool": self.pool,
+            "version": source_version(Oracle, type(self.scsa), feedback),
+        }
+
+        def build():
+
+            cost, guess = self.solve_root(processes)
+
+            return cost, guess, self.memo
+
+        cost, guess, memo = cache.fetch_pickle("oracle", params, build)
+
+        self.memo = memo
+
+        return cost, guess
+
+    def solve_root(self, processes = 1):
+        """Solves the whole code space
+
+        With more than one process, first guesses are tried one at a time in order of their lower bound, and the
+        (first guess, response) subtrees of each are solved in parallel tasks, limited by the best cost so far. The
+        workers' memo tables and bounds are merged back, and the root is added to the memo table. The response of
+        every code to every guess is computed once, into shared memory that every worker reads, rather than by each
+        worker for the guesses it tries. The shared memory is freed even when the process is terminated.
+
+        Args:
+            processes (int, optional): Number of worker processes. Defaults to 1.
+
+        Returns:
+            num: Returns optimal total weighted number of guesses (or worst-case number of guesses).
+            str: Returns optimal first guess.
+        """
+
+        root = tuple(range(len(self.codes)))
+        free = frozenset(self.colors)
+
+        if processes <= 1:
+
+            return self.solve(root, free)
+
+        options = self.options(root, free)
+        scsa_name = self.scsa.name if self.scsa is not None else None
+        table = None
+        best = math.inf
+        best_guess = None
+
+        # A terminated solve unwinds through finally, so the shared table is not left behind
+        if threading.current_thread() is threading.main_thread():
+
+            previous = signal.signal(signal.SIGTERM, stop_solving)
+
+        try:
+
+            table = ResponseTable(all_codes(self.board_length, self.colors), self.codes, self.board_length)
+            settings = (self.board_length, self.colors, scsa_name, self.objective, self.pool, table.handle)
+
+            with multiprocessing.Pool(processes, initializer = start_worker, initargs = settings) as pool:
+
+                # First guesses are tried in order of their bound, as in solve, so each one is pruned by the best so far
+                for option_bound, guess, responses in options:
+
+                    if option_bound >= best:
+
+                        break
+
+                    tasks = []
+
+                    for response, part in self.split(root, responses).items():
+
+                        if response == self.win:
+
+                            continue
+
+                        # A subtree can use all the slack left by the others meeting their lower bounds
+                        if self.objective == "worst":
+
+                            limit = best - 1
+
+                        else:
+
+                            limit = best - (option_bound - self.lower_bound(part))
+
+                        tasks.append((tuple(part), free - set(guess), limit))
+
+                    solved = pool.map(solve_task, tasks, chunksize = 1)
+
+                    for cost, memo, bounds in solved:
+
+                        self.memo.update(memo)
+
+                        for key, bound in bounds.items():
+
+                            self.bounds[key] = max(bound, self.bounds.get(key, bound))
+
+                    if any(cost >= limit for (_, _, limit), (cost, _, _) in zip(tasks, solved)):
+
+                        continue
+
+                    if self.objective == "worst":
+
+                        cost = 1 + max((cost for cost, _, _ in solved), default = 0)
+
+                    else:
+
+                        cost = sum(self.weights) + sum(cost for cost, _, _ in solved)
+
+                    if cost < best:
+
+                        best = cost
+                        best_guess = guess
+
+        finally:
+
+            if threading.current_thread() is threading.main_thread():
+
+                signal.signal(signal.SIGTERM, previous)
+
+            if table is not None:
+
+                table.unlink()
+
+        # Stored as solve stores it, so that policy and a cached solution find the root without solving it again
+        key, order, color_map = self.canonical(root)
+
+        self.memo[key] = (best, list_to_str([color_map[best_guess[p]] for p in order]))
+
+        return best, best_guess
+
+    def policy(self):
+        """Builds the optimal policy table
+
+        Returns:
+            dict: Returns map from history (tuple of (guess, (exact, other)) pairs) to the optimal next guess.
+        """
+
+        table = {}
+        stack = [((), tuple(range(len(self.codes))), frozenset(self.colors))]
+
+        while stack:
+
+            history, subset, free = stack.pop()
+
+            _, guess = self.solve(subset, free)
+
+            table[history] = guess
+
+            for response, part in self.partition(subset, guess).items():
+
+                if response == self.win:
+
+                    continue
+
+                exact, other = divmod(response, self.board_length + 1)
+
+                stack.append((history + ((guess, (exact, other)),), tuple(part), free - set(guess)))
+
+        return table
+
+    def write_policy(self, file_name):
+        """Writes the optimal policy table to a file
+
+        Every line holds the guesses and responses so far as guess:exact,other separated by spaces, a tab and
+        the optimal next guess. The first line has an empty history.
+
+        Args:
+            file_name (str): Name of file to write to.
+        """
+
+        table = self.policy()
+
+        file = open(file_name, "w")
+
+        for history in sorted(table, key = lambda history: (len(history), history)):
+
+            steps = " ".join(guess + ":" + str(response[0]) + "," + str(response[1]) for guess, response in history)
+
+            file.write(steps + "\t" + table[history] + "\n")
+
+        file.close()
+
+        return
+
+
+worker_oracle = None
+worker_sent = 0
+worker_bounds_sent = 0
+
+def stop_solving(signum, frame):
+    """Turns a request to terminate into SystemExit, which runs the finally blocks on the way out
+
+    Args:
+        signum (int): Number of the signal.
+        frame (frame): Frame that was running when the signal arrived.
+    """
+
+    raise SystemExit(128 + signum)
+
+def start_worker(board_length, colors, scsa_name, objective, pool, table_handle = None):
+    """Builds the oracle used by a worker process
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        scsa_name (str or None): Name of the SCSA the secret is drawn from.
+        objective (str): "expected" or "worst".
+        pool (str): "all" or "candidates".
+        table_handle (tuple, optional): Handle of the shared ResponseTable to look guesses up in. Defaults to None.
+    """
+
+    global worker_oracle
+
+    # Workers inherit stop_solving, but the pool terminates them with SIGTERM and they own nothing to free
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    scsa = scsa_by_name(scsa_name) if scsa_name is not None else None
+
+    worker_oracle = Oracle(board_length, colors, scsa, objective, pool)
+
+    if table_handle is not None:
+
+        worker_oracle.share_rows(table_handle)
+
+    return
+
+def solve_task(task):
+    """Solves one subtree in a worker process
+
+    Args:
+        task (tuple): Indices of codes, the colors not used by any earlier guess and the cost at or above which
+                      the exact value is of no interest.
+
+    Returns:
+        num: Returns optimal cost of the subtree if it is below the limit, otherwise a value of at least the limit.
+        dict: Returns the memo entries the worker added since its last task.
+        dict: Returns the bounds the worker added or raised since its last task.
+    """
+
+    global worker_sent, worker_bounds_sent
+
+    subset, free, limit = task
+
+    cost, _ = worker_oracle.solve(subset, free, limit)
+
+    # Memo tables are insertion ordered, so the new entries are at the end
+    memo = dict(itertools.islice(worker_oracle.memo.items(), worker_sent, None))
+    worker_sent = len(worker_oracle.memo)
+    bounds = dict(itertools.islice(worker_oracle.bounds.items(), worker_bounds_sent, None))
+    worker_bounds_sent = len(worker_oracle.bounds)
+
+    return cost, memo, bounds
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Compute the optimal number of guesses for a board.")
+    parser.add_argument("board_length", type = int)
+    parser.add_argument("num_colors", type = int)
+    parser.add_argument("scsa_name", nargs = "?", default = None)
+    parser.add_argument("--objective", choices = ["expected", "worst", "both"], default = "both")
+    parser.add_argument("--pool", choices = ["all", "candidates"], default = "all")
+    parser.add_argument("--processes", type = int, default = 1)
+    parser.add_argument("--policy", help = "file to write the optimal expected-case policy table to")
+    parser.add_argument("--no-cache", action = "store_true", help = "solve again instead of loading an earlier solution")
+    args = parser.parse_args()
+
+    colors = [chr(i) for i in range(65,91)][:args.num_colors]
+    scsa = None
+
+    if args.scsa_name is not None:
+
+        scsa = scsa_by_name(args.scsa_name)
+
+        if scsa is None:
+
+            print("Unrecognized SCSA.")
+            sys.exit(1)
+
+    objectives = ["expected", "worst"] if args.objective == "both" else [args.objective]
+
+    print("Game:", args.board_length, "Pegs", args.num_colors, "Colors")
+    print("SCSA:", args.scsa_name if scsa is not None else "all codes")
+
+    for objective in objectives:
+
+        oracle = Oracle(args.board_length, colors, scsa, objective, args.pool)
+
+        start = time.time()
+        cost, guess = oracle.solve_root(args.processes) if args.no_cache else oracle.solve_cached(ArtifactCache(), args.processes)
+        end = time.time()
+
+        if objective == "expected":
+
+            print("Optimal expected guesses:", cost/sum(oracle.weights), "First guess:", guess, "Time:", end - start)
+
+            if args.policy:
+
+                oracle.write_policy(args.policy)
+
+        else:
+
+            print("Optimal worst-case guesses:", cost, "First guess:", guess, "Time:", end - start)
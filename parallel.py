@@ -0,0 +1,284 @@
+# File contains a Mastermind tournament runner that plays rounds in parallel worker processes
+# Use ParallelMastermind(4, colors, processes = 4).play_tournament(RAM(), PreferFewer(), 10000) in place of Mastermind
+
+import hashlib
+import multiprocessing
+from sharedmem import *
+
+def round_seed(seed, index):
+    """Derives the random seed of one round from the tournament seed
+
+    Args:
+        seed (int or str): Seed of the tournament.
+        index (int): Number of the round, starting from 1.
+
+    Returns:
+        int: Returns seed for the round.
+    """
+
+    digest = hashlib.sha256((str(seed) + ":" + str(index)).encode()).digest()
+
+    return int.from_bytes(digest[:8], "big")
+
+def play_seeded_round(board_length, colors, guess_cutoff, round_time_cutoff, player, scsa, seed, index, code = None, learn = False):
+    """Plays one round with a fresh copy of the player and the random module seeded for that round
+
+    SCSAs and players draw from the global random module, so seeding it before the round makes both the secret
+    code and the player's guesses depend only on the tournament seed and the round number. The copy is dropped
+    after the round with whatever it learned, so with learn set the player plays the round itself instead.
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        guess_cutoff (int): Number of guesses allowed per round.
+        round_time_cutoff (int): Amount of time in seconds allowed for the round.
+        player (Player): Player to copy for the round.
+        scsa (SCSA): SCSA used to generate the secret code.
+        seed (int or str): Seed of the tournament.
+        index (int): Number of the round, starting from 1.
+        code (str, optional): Secret code to use instead of generating one. Defaults to None.
+        learn (bool, optional): Whether player plays the round itself, keeping what it learns for later rounds.
+                                Defaults to False.
+
+    Returns:
+        tuple: Returns round number, result, number of guesses and seconds spent in play_round.
+    """
+
+    random.seed(round_seed(seed, index))
+
+    if code is None:
+
+        code = scsa.generate_codes(board_length, colors, 1)
+
+    round = Round(board_length, colors, code, scsa, guess_cutoff, round_time_cutoff)
+
+    round_player = player if learn else copy_player(player)
+
+    start = time.time()
+    result, guesses = round.play_round(round_player)
+    end = time.time()
+
+    return (index, result, guesses, end - start)
+
+def learns_across_rounds(player):
+    """Checks whether a player can learn from the rounds it wins, which runners that copy it every round lose
+
+    Args:
+        player (Player): Player to check.
+
+    Returns:
+        bool: Returns True if the player overrides observe_answer.
+    """
+
+    return type(player).observe_answer is not Player.observe_answer
+
+
+worker_settings = None
+worker_codes = None
+
+def start_worker(settings, codes_handle = None):
+    """Stores the tournament settings in a worker process
+
+    Args:
+        settings (tuple): Board length, colors, guess cutoff, round time cutoff, player, SCSA and seed.
+        codes_handle (tuple, optional): Handle of the SharedCodes holding the secret codes. Defaults to None, which generates them.
+    """
+
+    global worker_settings, worker_codes
+
+    worker_settings = settings
+    worker_codes = attach(codes_handle) if codes_handle is not None else None
+
+    return
+
+def play_chunk(chunk):
+    """Plays consecutive rounds in a worker process
+
+    Args:
+        chunk (range): Numbers of the rounds to play.
+
+    Returns:
+        list of tuples: Returns play_seeded_round's result for each round, up to the first failure.
+    """
+
+    played = []
+
+    for index in chunk:
+
+        code = worker_codes.code(index - 1) if worker_codes is not None else None
+
+        played.append(play_seeded_round(*worker_settings, index, code))
+
+        # Rounds after a failure are never counted
+        if played[-1][1] == "failure":
+
+            break
+
+    return played
+
+
+class ParallelMastermind(Mastermind):
+    """Representation to play tournaments of Mastermind with rounds split across processes
+
+    Every round is played by a fresh copy of the player with the random module seeded from the tournament seed
+    and the round number, so a tournament gives the same results for the same seed whatever the number of
+    processes. Since rounds are independent, players do not carry anything over from one round to the next.
+
+    Rounds are merged in order with the same rules as Mastermind: the time of every round counts towards
+    tournament_time_cutoff and the tournament stops at the first failure. Pregenerated codes are put in shared
+    memory once and read by the workers from there.
+    """
+
+    def __init__(self, board_length = 4, colors = [chr(i) for i in range(65,91)], guess_cutoff = 100, round_time_cutoff = 5, tournament_time_cutoff = 300, processes = None, seed = 0, chunk_size = None):
+        """Constructor for ParallelMastermind
+
+        Args:
+            board_length (int, optional): Number of pegs. Defaults to 4.
+            colors (list, optional): List of colors that can be used to generate a secret code. Defaults to [chr(i) for i in range(65,91)].
+            guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
+            round_time_cutoff (int, optional):  Amount of time in seconds allowed for the round. Defaults to 5.
+            tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the tournament. Defaults to 300.
+            processes (int, optional): Number of worker processes, 1 to play in this process. Defaults to the number of CPUs.
+            seed (int or str, optional): Seed of the tournament. Defaults to 0.
+            chunk_size (int, optional): Rounds sent to a worker at a time. Defaults to about eight chunks per process.
+        """
+
+        super().__init__(board_length, colors, guess_cutoff, round_time_cutoff, tournament_time_cutoff)
+
+        self.processes = processes if processes is not None else multiprocessing.cpu_count()
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.round_results = []
+
+    def play_rounds(self, player, scsa, num_rounds, codes = None):
+        """Plays rounds in parallel and merges their results in order
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds to play.
+            codes (SharedCodes, optional): Secret code of every round. Defaults to None, which generates them from the SCSA.
+
+        Returns:
+            dict: Returns number of wins, losses, and failures.
+        """
+
+        results = {"win": 0, "loss": 0, "failure": 0}
+
+        self.round_results = []
+
+        if num_rounds == 0:
+
+            return results
+
+        # Workers get the player as prepared here, rather than each preparing its own copy
+        player.prepare(self.board_length, self.colors, scsa)
+
+        chunk_size = self.chunk_size or max(1, num_rounds//(self.processes*8))
+        chunks = [range(i, min(i + chunk_size, num_rounds + 1)) for i in range(1, num_rounds + 1, chunk_size)]
+        settings = (self.board_length, self.colors, self.guess_cutoff, self.round_time_cutoff, player, scsa, self.seed)
+        codes_handle = codes.handle if codes is not None else None
+
+        if self.processes == 1:
+
+            start_worker(settings, codes_handle)
+
+            pool = None
+            played = map(play_chunk, chunks)
+
+        else:
+
+            pool = multiprocessing.Pool(self.processes, initializer = start_worker, initargs = (settings, codes_handle))
+            played = pool.imap(play_chunk, chunks)
+
+        try:
+
+            self.merge_chunks(played, results)
+
+        finally:
+
+            if pool is not None:
+
+                # Chunks still running after the tournament stopped are not needed
+                pool.terminate()
+                pool.join()
+
+            elif worker_codes is not None:
+
+                worker_codes.close()
+
+        return results
+
+    def merge_chunks(self, played, results):
+        """Counts the results of rounds in order until the tournament stops
+
+        Stops reading chunks once the tournament runs out of time or a round ends in failure, so chunks still
+        being played are not waited for.
+
+        Args:
+            played (iterable of lists of tuples): Chunks of play_seeded_round results, in round order.
+            results (dict): Dictionary of wins, losses, and failures to add to.
+        """
+
+        for chunk in played:
+
+            for index, result, guesses, duration in chunk:
+
+                self.time_used += duration
+
+                if self.time_used > self.tournament_time_cutoff:
+
+                    return
+
+                results[result] += 1
+
+                self.round_results.append((index, result, guesses, duration))
+
+                if result == "failure":
+
+                    return
+
+        return
+
+    def play_tournament(self, player, scsa, num_rounds):
+        """Plays a tournament of Mastermind in parallel
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds to play Mastermind.
+        """
+
+        results = self.play_rounds(player, scsa, num_rounds)
+
+        self.print_results(player, results, num_rounds)
+
+        return
+
+    def practice_tournament(self, player, scsa, code_file):
+        """Plays a tournament of Mastermind in parallel using pregenerated codes from file
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA that codes in file are generated from.
+            code_file (str): Name of file to read secret codes from, packed or one per line.
+        """
+
+        code_file_codes = open_codes(code_file)
+        codes = SharedCodes(code_file_codes, self.colors, self.board_length)
+
+        if isinstance(code_file_codes, Corpus):
+
+            code_file_codes.close()
+
+        try:
+
+            results = self.play_rounds(player, scsa, len(codes), codes)
+
+        finally:
+
+            codes.unlink()
+
+        self.print_results(player, results, len(codes))
+
+        return
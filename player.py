@@ -1,8 +1,351 @@
 # File contains implementations for the players for Mastermind
 # See main.py or examples.ipynb for example usages
 
+import copy
+import math
 import random
+import threading
+import time
 from scsa import *
+from telemetry import *
+
+TIME_MARGIN = 0.05 # Seconds a supervisor waits past the round's buffer, so that a guess it stops is always a loss
+LEARNING_LOCK = threading.RLock() # Held while a player reads or changes its learned_state, which concurrent sessions share
+
+def copy_player(player, share_learned = False):
+    """Copies a player together with its per-round state
+
+    Players keep their state in class-level lists and dicts that are shared by every instance until the
+    player assigns a fresh one, so a plain copy would still mutate the original's state. Every list, dict
+    and set the player reaches through its class is first made an attribute of the copy, then the copy is
+    deep copied, so that nested state such as lists of lists is not shared either.
+
+    Args:
+        player (Player): Player to copy.
+        share_learned (bool, optional): Whether the copy keeps the player's learned_state instead of a copy of it,
+                                        so that what the copy learns is learned by the player. Defaults to False.
+
+    Returns:
+        Player: Returns a copy of the player that can make guesses independently of the original.
+
+    Raises:
+        TypeError: Raised if the player holds something that cannot be copied, such as a process or a lock.
+    """
+
+    clone = copy.copy(player)
+
+    for klass in type(player).__mro__:
+
+        for name, value in vars(klass).items():
+
+            if isinstance(value, (list, dict, set)) and name not in clone.__dict__:
+
+                clone.__dict__[name] = value
+
+    # Objects already in the memo are taken as their own copies
+    memo = {id(value): value for value in player.learned_state()} if share_learned else {}
+
+    try:
+
+        return copy.deepcopy(clone, memo)
+
+    except TypeError as error:
+
+        raise TypeError(type(player).__name__ + " cannot be copied for a session, so it needs a new_session that does not copy it: " + str(error)) from error
+
+def forward_guess(player, board_length, colors, scsa, last_response, budget = None):
+    """Asks a wrapped player for a guess, passing on the time and guesses left when they are known
+
+    Args:
+        player (Player): Player that makes the guess.
+        board_length (int): Number of pegs of secret code.
+        colors (list of chr): Colors that could be used in the secret code.
+        scsa (SCSA): SCSA used to generate secret code.
+        last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+        budget (Budget, optional): Time and guesses left. Defaults to None, for a wrapper that was called through make_guess.
+
+    Returns:
+        str: Returns guess
+    """
+
+    if budget is None:
+
+        return player.make_guess(board_length, colors, scsa, last_response)
+
+    return player.make_timed_guess(board_length, colors, scsa, last_response, budget)
+
+def anytime(steps, deadline = None, growth = 2.0):
+    """Runs an anytime search, such as iterative deepening, until its deadline and returns its best result
+
+    Each value the steps yield must be the best result found so far. A step cannot be interrupted once started,
+    so another step is only asked for if the last one, scaled by growth, would still finish before the deadline.
+
+    Args:
+        steps (iterator): Yields the best result so far after every step of the search.
+        deadline (float, optional): time.perf_counter() value by which to return. Defaults to None, which runs every step.
+        growth (float, optional): Expected ratio of the next step's time to the last one's. Defaults to 2.0.
+
+    Returns:
+        Returns last result yielded, or None if no step finished.
+    """
+
+    best = None
+    last = time.perf_counter()
+
+    for result in steps:
+
+        best = result
+
+        now = time.perf_counter()
+
+        if deadline is not None and now + (now - last)*growth > deadline:
+
+            break
+
+        last = now
+
+    return best
+
+
+class Budget:
+    """Time and guesses a player has left when asked for a guess
+    """
+
+    def __init__(self, round_time = math.inf, tournament_time = math.inf, guesses = math.inf, buffer = 0):
+        """Constructor for Budget
+
+        Args:
+            round_time (float, optional): Seconds left of the round's time_cutoff. Defaults to no limit.
+            tournament_time (float, optional): Seconds left of the tournament's tournament_time_cutoff. Defaults to no limit.
+            guesses (int, optional): Guesses left in the round, counting this one. Defaults to no limit.
+            buffer (float, optional): Extra seconds Round allows past time_cutoff before the round is lost. Defaults to 0.
+        """
+
+        self.round_time = round_time
+        self.tournament_time = tournament_time
+        self.guesses = guesses
+        self.buffer = buffer
+        self.start = time.perf_counter()
+        self.deadline = self.start + min(round_time, tournament_time)
+
+    def remaining(self):
+        """Computes the seconds left before the guess must be made
+
+        Returns:
+            float: Returns seconds left, negative once the deadline has passed.
+        """
+
+        return self.deadline - time.perf_counter()
+
+    def timeout(self):
+        """Computes how long a supervisor should wait for a guess it can stop, such as one made in another process
+
+        Returns:
+            float: Returns seconds left plus the round's buffer and TIME_MARGIN, so that a guess that is not made by
+                   then would have lost the round anyway.
+        """
+
+        return max(self.remaining(), 0) + self.buffer + TIME_MARGIN
+
+
+class PlayerSession:
+    """State of one round played by a player
+
+    Round.play_session asks the player for a new session every round and lets the session make the round's
+    guesses, so any number of rounds can be played at once by one player. Sessions keep their state in slots
+    and are closed after the round; answers of won rounds are passed on to the player that made the session.
+    """
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner):
+        """Constructor for PlayerSession
+
+        Args:
+            owner (Player): Player that made the session.
+        """
+
+        self.owner = owner
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret 
+                                           code for the previous guess and the second element is the number of pegs that are 
+                                           the right color, but in the wrong location for the previous guess.
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind knowing the time and guesses left
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return self.make_guess(board_length, colors, scsa, last_response)
+
+    def observe_answer(self, code):
+        """Passes the answer of the round, if won, on to the player that made the session
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        self.owner.observe_answer(code)
+
+        return
+
+    def close(self):
+        """Releases what the session holds once its round is over
+        """
+
+        return
+
+
+class CopiedSession(PlayerSession):
+    """Session that makes its guesses with its own copy of the player
+
+    Used for players that keep their per-round state on themselves. The copy shares the player's learned_state,
+    so the copy itself is passed the answer of a won round, with the round's board still at hand, and what it
+    learns is kept by the player. The copy is closed with the session, if it can be.
+    """
+
+    __slots__ = ("player",)
+
+    def __init__(self, owner):
+        """Constructor for CopiedSession
+
+        Args:
+            owner (Player): Player that made the session.
+        """
+
+        super().__init__(owner)
+
+        self.player = copy_player(owner, share_learned = True)
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind with the copy of the player
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return self.player.make_guess(board_length, colors, scsa, last_response)
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind with the copy of the player
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return self.player.make_timed_guess(board_length, colors, scsa, last_response, budget)
+
+    def observe_answer(self, code):
+        """Passes the answer of the round, if won, on to the copy of the player
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        self.player.observe_answer(code)
+
+        return
+
+    def close(self):
+        """Closes the copy of the player, such as the worker process a SupervisedPlayer started for the round
+        """
+
+        close = getattr(self.player, "close", None)
+
+        if close is not None:
+
+            close()
+
+        return
+
+
+class ForkedSession(CopiedSession):
+    """Session of a player that talks to a process of its own, which cannot be copied
+
+    The player keeps the forks whose rounds are over, each with its process still running, starting with the
+    player itself. The session borrows one of them, or a new fork when all are busy, so that a process plays
+    one round at a time and is kept for the rounds that follow. Closing the session gives the fork back and
+    adds its counters, named by the player's fork_counters, to the player's; the player's close stops them all.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, owner):
+        """Constructor for ForkedSession
+
+        Args:
+            owner (Player): Player that made the session, with idle_forks, forks_lock, fork_counters and fork.
+        """
+
+        PlayerSession.__init__(self, owner)
+
+        with owner.forks_lock:
+
+            self.player = owner.idle_forks.pop() if owner.idle_forks else None
+
+        if self.player is None:
+
+            self.player = owner.fork()
+
+    def close(self):
+        """Gives the fork back to the player with its process still running
+        """
+
+        with self.owner.forks_lock:
+
+            if self.player is not self.owner:
+
+                for name in self.owner.fork_counters:
+
+                    setattr(self.owner, name, getattr(self.owner, name) + getattr(self.player, name))
+                    setattr(self.player, name, 0)
+
+            self.owner.idle_forks.append(self.player)
+
+        return
+
+
+class GuessLimitExceeded(Exception):
+    """Raised by a player that could not make its guess within its time or memory limit
+
+    Round.play_round scores the round as a loss.
+    """
+
 
 class Player:
     """Player for Mastermind
@@ -31,6 +374,78 @@ class Player:
 
         raise NotImplementedError
 
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind knowing the time and guesses left
+
+        Called by Round for every guess. Players that can use the time they have left override it; by default
+        the budget is ignored and make_guess is called.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chr): Colors that could be used in the secret code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret 
+                                           code for the previous guess and the second element is the number of pegs that are 
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return self.make_guess(board_length, colors, scsa, last_response)
+
+    def new_session(self):
+        """Creates the state of a new round
+
+        Players whose per-round state fits in a slot-based PlayerSession override it; by default the session
+        makes its guesses with a copy of the player.
+
+        Returns:
+            PlayerSession: Returns session that makes the guesses of one round.
+        """
+
+        return CopiedSession(self)
+
+    def prepare(self, board_length, colors, scsa):
+        """Gets ready to play rounds on a board, before any of them is timed
+
+        Called by tournaments before their first round. Players with work that only depends on the board and the
+        SCSA, such as loading or learning a model, override it; by default nothing is done.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret codes.
+        """
+
+        return
+
+    def observe_answer(self, code):
+        """Receives the answer of a round the player won
+
+        Called by the engine after every win. Players that learn across rounds override it; by default the answer
+        is ignored.
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        return
+
+    def learned_state(self):
+        """Lists the objects holding what the player learns across rounds
+
+        Copies made for a session share these objects with the player instead of copying them. Players that
+        override observe_answer to learn override it too, and keep their learned state consistent under
+        LEARNING_LOCK; by default nothing is learned.
+
+        Returns:
+            list: Returns objects shared by the player's session copies.
+        """
+
+        return []
+
 
 class RandomFolks(Player):
     """Mastermind Player that makes random guesses
@@ -100,18 +515,34 @@ class RAM(Player):
     def __init__(self):
 
         self.player_name = "RAM"
-    #globals
-    guessnum = 0 #to find 1st color
-    guessecondnum = 0 #to find 2nd color based on the 1st color
-    guesses = [] #to store all guesses
-    prevGuesses = []        # Holds all guesses attempted
-    responses = []          # Holds all responses corresponding to previous guesses  
-    positions = {}          # Holds position data in dictionary {position: character}
-    colorsUsed = []         # Holds all correct colors in a given code
-    num_bs = 0
-    
+        self.session = None #session of the round being played through make_guess
+
+    def new_session(self):
+        return RAMSession(self)
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        if (last_response[2] == 0 or self.session is None): #a new round gets a new session
+            self.session = self.new_session()
+        return self.session.make_guess(board_length, colors, scsa, last_response)
+
+
+class RAMSession(PlayerSession):
+    """State of one round of RAM; see RAM for the strategy"""
+
+    __slots__ = ("guessnum", "guessecondnum", "guesses", "prevGuesses", "responses", "positions", "colorsUsed", "num_bs")
+
+    def __init__(self, owner):
+
+        super().__init__(owner)
+        self.guessnum = 0 #to find 1st color
+        self.guessecondnum = 0 #to find 2nd color based on the 1st color
+        self.guesses = [] #to store all guesses
+        self.prevGuesses = [] # Holds all guesses attempted
+        self.responses = [] # Holds all responses corresponding to previous guesses
+        self.positions = {} # Holds position data in dictionary {position: character}
+        self.colorsUsed = [] # Holds all correct colors in a given code
+        self.num_bs = 0
 
-    
     def make_guess(self, board_length, colors, scsa, last_response):
 #_________________________________________ Two Color Alternating _________________________________________________        
         if scsa.name == "TwoColorAlternating":
@@ -181,6 +612,7 @@ class RAM(Player):
                     guess = list_to_str(color) #generate the guess
                     if not (guess in self.guesses): #check if the guess has already been made
                         break #if not then make the guess and if so then make a new guess
+                    telemetry.count("rejections") #count every guess drawn again
             self.guesses.append(guess) #save the guess to the list to keep track of the guesses made
             return guess #return the guess
 #_____________________________________________________ First Last _______________________________________________________
@@ -287,6 +719,7 @@ class RAM(Player):
                 while (guess in self.prevGuesses):                                          #make sure guess hasnt already been 
                     guess = list_to_str(random.sample(self.colorsUsed, k = board_length))   #guessed if so make another one until
                                                                                             #you have a new guess
+                    telemetry.count("rejections")                                           #count every guess drawn again
             guess = list_to_str(guess)                   #convert guess to a string
             self.prevGuesses.append(list_to_str(guess))  #add guess to previous guesses
             #print("colorUsed:", self.colorsUsed)
@@ -310,6 +743,7 @@ class RAM(Player):
                 guess = list_to_str(random.sample(colors, k = board_length))       #guess random combo w colors
                 while (guess in self.prevGuesses):                                          #make sure guess hasnt already been 
                     guess = list_to_str(random.sample(colors, k = board_length))   #guessed if so make another one until
+                    telemetry.count("rejections")                                           #count every guess drawn again
                 guess = list_to_str(guess)                   #convert guess to a string
                 self.prevGuesses.append(list_to_str(guess))  #add guess to prev guesses
                 return guess   
@@ -336,6 +770,7 @@ class RAM(Player):
                 while (guess in self.prevGuesses):                                          #make sure guess hasnt already been 
                     guess = list_to_str(random.sample(self.colorsUsed, k = board_length))   #guessed if so make another one until
                                                                                             #you have a new guess
+                    telemetry.count("rejections")                                           #count every guess drawn again
             guess = list_to_str(guess)                   #convert guess to a string
             self.prevGuesses.append(list_to_str(guess))  #add guess to prev guesses
             #print("colorUsed:", self.colorsUsed)
@@ -396,6 +831,7 @@ class RAM(Player):
                 guess = list_to_str(random.sample(self.colorsUsed, k = board_length))          #generate a random guess using colors confirmed to be correct
                 while guess in self.prevGuesses:                                               #if that guess was already guessed
                     guess = list_to_str(random.sample(self.colorsUsed, k = board_length))      #guess again
+                    telemetry.count("rejections")                                           #count every guess drawn again
 
             #print('guessnum: ', self.guessnum)
             #print('guess: ', guess)
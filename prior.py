@@ -0,0 +1,565 @@
+# File contains a player that learns which codes the SCSA prefers from the answers of earlier rounds
+# Run python main.py 4 6 Prior PreferFewer 100, or PretrainedPrior to learn from 10000 codes before the first round
+
+import heapq
+import math
+from solvers import *
+
+def distinct_fractions(board_length, num_colors):
+    """Computes the fraction of all codes that use each number of distinct colors
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors.
+
+    Returns:
+        list of floats: Returns fraction for every number of distinct colors from 0 to board_length.
+    """
+
+    # ways[k] counts the codes built so far that use exactly k distinct colors
+    ways = [1] + [0]*board_length
+
+    for _ in range(board_length):
+
+        ways = [ways[k]*k + (ways[k - 1]*(num_colors - k + 1) if k > 0 else 0) for k in range(board_length + 1)]
+
+    return [count/num_colors**board_length for count in ways]
+
+
+class CodePrior:
+    """Model of the answers seen so far on one board
+
+    Keeps how often each color was the answer at each position and how many distinct colors each answer used.
+    Both are smoothed towards uniformly random codes, so with no answers seen every code is equally likely.
+    """
+
+    def __init__(self, board_length, colors, smoothing = 1.0):
+        """Constructor for CodePrior
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            smoothing (float, optional): Weight of the uniform model, in answers. Defaults to 1.0.
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.smoothing = smoothing
+        self.color_index = {color: i for i, color in enumerate(colors)}
+        self.position_counts = [[0]*len(colors) for _ in range(board_length)]
+        self.distinct_counts = [0]*(board_length + 1)
+        self.baseline = distinct_fractions(board_length, len(colors))
+        self.observed = 0
+
+    def observe(self, code):
+        """Adds the answer of a round to the model
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        for position, color in enumerate(code):
+
+            self.position_counts[position][self.color_index[color]] += 1
+
+        self.distinct_counts[len(set(code))] += 1
+        self.observed += 1
+
+        return
+
+    def position_log_probabilities(self):
+        """Computes the log-probability of every color at every position
+
+        Returns:
+            list of dicts: Returns map from color to log-probability for every position.
+        """
+
+        total = self.observed + self.smoothing*len(self.colors)
+        tables = []
+
+        for counts in self.position_counts:
+
+            tables.append({color: math.log((counts[i] + self.smoothing)/total) for color, i in self.color_index.items()})
+
+        return tables
+
+    def distinct_log_factors(self):
+        """Computes how much likelier each number of distinct colors is than among uniformly random codes
+
+        Returns:
+            list of floats: Returns log-factor for every number of distinct colors from 0 to board_length.
+        """
+
+        factors = []
+
+        for k in range(self.board_length + 1):
+
+            if self.baseline[k] == 0:
+
+                factors.append(-math.inf)
+
+                continue
+
+            probability = (self.distinct_counts[k] + self.smoothing*self.baseline[k])/(self.observed + self.smoothing)
+
+            factors.append(math.log(probability/self.baseline[k]))
+
+        return factors
+
+    def log_weight(self, code, tables = None, factors = None):
+        """Scores how likely a code is under the model
+
+        Args:
+            code (str): Code to score.
+            tables (list of dicts, optional): Result of position_log_probabilities, to avoid recomputing it.
+            factors (list of floats, optional): Result of distinct_log_factors, to avoid recomputing it.
+
+        Returns:
+            float: Returns unnormalized log-probability.
+        """
+
+        if tables is None:
+
+            tables = self.position_log_probabilities()
+
+        if factors is None:
+
+            factors = self.distinct_log_factors()
+
+        weight = factors[len(set(code))]
+
+        for position, color in enumerate(code):
+
+            weight += tables[position][color]
+
+        return weight
+
+    def sample(self, rng = random):
+        """Draws a code color by color from the per-position frequencies
+
+        Args:
+            rng (random.Random, optional): Random number generator to draw from. Defaults to the random module.
+
+        Returns:
+            str: Returns code.
+        """
+
+        code = []
+
+        for counts in self.position_counts:
+
+            weights = [count + self.smoothing for count in counts]
+            code.append(rng.choices(self.colors, weights = weights, k = 1)[0])
+
+        return list_to_str(code)
+
+
+class CodeRanking:
+    """Log-weights of every code of a board under a model, kept up to date as the model learns
+
+    An answer adds the same amount to the log-weight of every code, plus a term for each position at which a
+    code has the answer's color and a term if a code uses as many distinct colors as the answer. The common
+    amount does not change the order or the relative weights, so it is left out and only the codes that get
+    one of the other terms are touched. Codes are listed in lexicographic order, so the codes with a color at a
+    position are evenly spaced runs of the list, and each term is added a slice at a time. No code is scored
+    again and nothing is sorted when the model learns; the likeliest codes are picked when a guess needs them.
+    """
+
+    def __init__(self, prior):
+        """Constructor for CodeRanking
+
+        Args:
+            prior (CodePrior): Model of the board, which observe keeps the ranking in step with.
+        """
+
+        tables = prior.position_log_probabilities()
+        factors = prior.distinct_log_factors()
+
+        self.prior = prior
+        self.codes = all_codes(prior.board_length, prior.colors)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.log_weights = [prior.log_weight(code, tables, factors) for code in self.codes]
+        self.by_distinct = [[] for _ in range(prior.board_length + 1)]
+
+        for i, code in enumerate(self.codes):
+
+            self.by_distinct[len(set(code))].append(i)
+
+    def shift_position(self, position, color, delta):
+        """Adds to the log-weight of every code with a color at a position
+
+        Args:
+            position (int): Position of the peg.
+            color (chr): Color at that position.
+            delta (float): Amount added.
+        """
+
+        num_colors = len(self.prior.colors)
+        block = num_colors**(self.prior.board_length - position - 1)
+        period = block*num_colors
+        first = self.prior.color_index[color]*block
+        log_weights = self.log_weights
+
+        # The codes form one run of block codes every period codes, so whichever of the two takes fewer slices is added
+        if block >= len(log_weights)//period:
+
+            for start in range(first, len(log_weights), period):
+
+                log_weights[start:start + block] = map(delta.__add__, log_weights[start:start + block])
+
+        else:
+
+            for start in range(first, first + block):
+
+                log_weights[start::period] = list(map(delta.__add__, log_weights[start::period]))
+
+        return
+
+    def observe(self, code):
+        """Adds the answer of a round to the model and to the log-weights of the codes it changes
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        prior = self.prior
+        distinct = len(set(code))
+
+        for position, color in enumerate(code):
+
+            count = prior.position_counts[position][prior.color_index[color]]
+
+            self.shift_position(position, color, math.log((count + 1 + prior.smoothing)/(count + prior.smoothing)))
+
+        count = prior.distinct_counts[distinct] + prior.smoothing*prior.baseline[distinct]
+        delta = math.log((count + 1)/count)
+        log_weights = self.log_weights
+
+        for i in self.by_distinct[distinct]:
+
+            log_weights[i] += delta
+
+        prior.observe(code)
+
+        return
+
+    def likeliest(self, codes, count):
+        """Picks the likeliest of some codes
+
+        Args:
+            codes (list of strs): Codes to pick from, such as the codes or the candidates left of them.
+            count (int): Number of codes picked.
+
+        Returns:
+            list of strs: Returns at most count codes, likeliest first and equally likely ones in the order given.
+        """
+
+        if codes is self.codes:
+
+            return [self.codes[i] for i in heapq.nlargest(count, range(len(self.codes)), key = self.log_weights.__getitem__)]
+
+        index = self.index
+        log_weights = self.log_weights
+
+        return heapq.nlargest(count, codes, key = lambda code: log_weights[index[code]])
+
+    def weights(self, codes):
+        """Computes the weights of some codes relative to each other
+
+        Args:
+            codes (list of strs): Codes to weigh.
+
+        Returns:
+            list of floats: Returns weight of every code, the likeliest weighing 1.
+        """
+
+        log_weights = [self.log_weights[self.index[code]] for code in codes]
+        top = max(log_weights, default = 0.0)
+
+        return [math.exp(log_weight - top) for log_weight in log_weights]
+
+
+class PriorPlayer(Player):
+    """Mastermind Player that guesses consistent codes that are likely under a model learned across rounds
+
+    Every answer the player wins with is added to the model of its board, so against an SCSA that prefers some
+    codes the player's guesses get closer to the answer as the tournament goes on. Of the likeliest consistent
+    codes, the one that leaves the least expected model probability consistent after its response is guessed.
+    With learn set to False the model stays uniform. With pretrain set, the model of each board starts from that
+    many codes of the round's SCSA, learned once and then loaded from the artifact cache.
+
+    The codes of each board are scored by its model once, when the player is prepared for the board, and every won
+    round then only adds to the scores of the codes the answer changes. Each guess picks its shortlist from the
+    candidates left by their scores and scores each shortlisted code against a sample of at most max_scored
+    candidates, so neither learning nor a guess sorts every code and a guess stays cheap on large boards.
+    """
+
+    def __init__(self, learn = True, smoothing = 1.0, shortlist = 20, max_candidates = 50000, max_tries = 20000, max_scored = 1000, pretrain = 0, pretrain_seed = 0, cache = None):
+        """Constructor for PriorPlayer
+
+        Args:
+            learn (bool, optional): Whether answers are added to the model. Defaults to True.
+            smoothing (float, optional): Weight of the uniform model, in answers. Defaults to 1.0.
+            shortlist (int, optional): Number of likeliest consistent codes compared as the next guess. Defaults to 20.
+            max_candidates (int, optional): Largest code space whose candidates are enumerated. Defaults to 50000.
+            max_tries (int, optional): Codes drawn from the model per guess when candidates are not enumerated. Defaults to 20000.
+            max_scored (int, optional): Most candidates each shortlisted code is scored against. Defaults to 1000.
+            pretrain (int, optional): Number of codes of the SCSA each model starts from. Defaults to 0.
+            pretrain_seed (int, optional): Seed the pretraining codes are generated from. Defaults to 0.
+            cache (ArtifactCache, optional): Cache of pretrained models. Defaults to the default cache directory.
+        """
+
+        self.player_name = "Prior"
+        self.learn = learn
+        self.smoothing = smoothing
+        self.shortlist = shortlist
+        self.max_candidates = max_candidates
+        self.max_tries = max_tries
+        self.max_scored = max_scored
+        self.pretrain = pretrain
+        self.pretrain_seed = pretrain_seed
+        self.cache = cache
+        self.priors = {}
+        self.rankings = {}
+        self.prior = None
+        self.ranking = None
+        self.candidates = None
+        self.history = []
+        self.last_guess = None
+        self.fallback = GeneticEngine()
+
+    def observe_answer(self, code):
+        """Adds the answer of a won round to the model of the current board
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        if self.learn and self.prior is not None:
+
+            with LEARNING_LOCK:
+
+                key = (self.prior.board_length, tuple(self.prior.colors))
+
+                if key in self.rankings:
+
+                    self.rankings[key].observe(code)
+
+                else:
+
+                    self.prior.observe(code)
+
+        return
+
+    def learned_state(self):
+        """Lists the objects holding what the player learns across rounds
+
+        Returns:
+            list: Returns models and rankings of every board, as dicts and one by one.
+        """
+
+        return [self.priors, self.rankings] + list(self.priors.values()) + list(self.rankings.values())
+
+    def pretrained(self, board_length, colors, scsa):
+        """Finds the model learned from pretrain codes of an SCSA, learning it first if it is not cached
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+
+        Returns:
+            CodePrior: Returns model.
+        """
+
+        cache = self.cache if self.cache is not None else ArtifactCache()
+
+        def learn():
+
+            prior = CodePrior(board_length, colors, self.smoothing)
+            corpus = Corpus(cached_corpus(scsa, board_length, colors, self.pretrain, self.pretrain_seed, cache))
+
+            for code in corpus:
+
+                prior.observe(code)
+
+            corpus.close()
+
+            return prior
+
+        params = {
+            "scsa": scsa.name,
+            "board_length": board_length,
+            "colors": list_to_str(colors),
+            "count": self.pretrain,
+            "seed": self.pretrain_seed,
+            "smoothing": self.smoothing,
+            "version": source_version(CodePrior, type(scsa), Corpus),
+        }
+
+        return cache.fetch_pickle("prior-model", params, learn)
+
+    def prepare(self, board_length, colors, scsa):
+        """Builds the model of a board and its ranking of the codes, pretraining the model first if pretrain is set
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code, which the model is pretrained on.
+        """
+
+        key = (board_length, tuple(colors))
+
+        with LEARNING_LOCK:
+
+            if key not in self.priors:
+
+                if self.pretrain > 0 and scsa is not None:
+
+                    self.priors[key] = self.pretrained(board_length, colors, scsa)
+
+                else:
+
+                    self.priors[key] = CodePrior(board_length, colors, self.smoothing)
+
+            if len(colors)**board_length <= self.max_candidates and key not in self.rankings:
+
+                self.rankings[key] = CodeRanking(self.priors[key])
+
+        return
+
+    def start_round(self, board_length, colors, scsa = None):
+        """Resets the per-round state and takes the ranking of the codes by the model
+
+        Boards the player was not prepared for are prepared first.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA, optional): SCSA used to generate secret code, which the model is pretrained on. Defaults to None.
+        """
+
+        key = (board_length, tuple(colors))
+
+        with LEARNING_LOCK:
+
+            self.prepare(board_length, colors, scsa)
+
+            self.prior = self.priors[key]
+            self.history = []
+            self.last_guess = None
+
+            if key in self.rankings:
+
+                # Filtering makes new lists, so the ranking's list of codes is never changed
+                self.ranking = self.rankings[key]
+                self.candidates = self.ranking.codes
+
+            else:
+
+                self.ranking = None
+                self.candidates = None
+
+        return
+
+    def best_of_shortlist(self):
+        """Picks the shortlisted candidate that is expected to leave the least model probability consistent
+
+        Returns:
+            str: Returns guess.
+        """
+
+        best = None
+        best_remaining = None
+        scored = self.candidates
+
+        if len(scored) > self.max_scored:
+
+            scored = random.sample(scored, k = self.max_scored)
+
+        weights = self.ranking.weights(scored)
+
+        for guess in self.ranking.likeliest(self.candidates, self.shortlist):
+
+            classes = {}
+
+            for code, weight in zip(scored, weights):
+
+                response = feedback(guess, code)
+                classes[response] = classes.get(response, 0) + weight
+
+            telemetry.count("feedback_calls", len(scored))
+
+            # The answer is in each class with probability proportional to its weight, which is then what remains
+            remaining = sum(weight*weight for response, weight in classes.items() if response[1] != 0 or response[0] != len(guess))
+
+            if best_remaining is None or remaining < best_remaining:
+
+                best = guess
+                best_remaining = remaining
+
+        return best
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            self.start_round(board_length, colors, scsa)
+
+        else:
+
+            response = (last_response[0], last_response[1])
+
+            self.history.append((self.last_guess, response))
+
+            if self.candidates is not None:
+
+                before = len(self.candidates)
+
+                self.candidates = [code for code in self.candidates if feedback(self.last_guess, code) == response]
+
+                telemetry.count("feedback_calls", before)
+                telemetry.prune("candidates", before, len(self.candidates))
+
+        guess = None
+
+        if self.candidates:
+
+            guess = self.best_of_shortlist()
+
+        elif self.candidates is None:
+
+            guessed = set(previous for previous, _ in self.history)
+
+            for _ in range(self.max_tries):
+
+                code = self.prior.sample()
+
+                if code not in guessed and is_consistent(code, self.history):
+
+                    guess = code
+
+                    break
+
+                telemetry.count("rejections")
+
+        if guess is None:
+
+            guess = self.fallback.choose(board_length, colors, self.history, None)
+
+        self.last_guess = guess
+
+        return guess
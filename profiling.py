@@ -0,0 +1,348 @@
+# File contains a profiler for tournaments that splits time between the player, the Round engine and SCSA generation
+# Profile every player's tournament from main.py:
+#
+#     python3 main.py 4 6 RAM PreferFewer 100 --profile cprofile
+#
+# writes profile-RAM.txt, a report of where the time went, and profile-RAM.collapsed, one "a;b;c count" line per
+# stack for flame graph tools such as flamegraph.pl or speedscope. The cprofile mode also writes profile-RAM.prof
+# for pstats and snakeviz.
+
+import collections
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ENGINE_FILES = {"mastermind.py", "journal.py", "corpus.py", "cache.py"}
+SCSA_FILES = {"scsa.py"}
+# Instrumentation is counted as part of whatever reported into it
+UNATTRIBUTED_FILES = {"profiling.py", "main.py", "latency.py", "telemetry.py", "memory.py"}
+# Helpers that players call as much as the engine does, whose time goes to whoever called them
+SHARED_FUNCTIONS = {("mastermind.py", "feedback"), ("mastermind.py", "letter_to_num"), ("scsa.py", "list_to_str")}
+CATEGORIES = [("player", "Player"), ("engine", "Round engine"), ("scsa", "SCSA generation"), ("other", "Other")]
+
+def category(file_name, function_name):
+    """Finds which part of a tournament a function belongs to
+
+    Args:
+        file_name (str): File name of the code.
+        function_name (str): Name of the function.
+
+    Returns:
+        str or None: Returns "player", "engine" or "scsa", or None for shared helpers and code outside the project,
+                     such as the standard library and builtins, whose time goes to the project code that called it.
+    """
+
+    if not file_name.endswith(".py") or os.path.dirname(os.path.abspath(file_name)) != DIRECTORY:
+
+        return None
+
+    name = os.path.basename(file_name)
+
+    if (name, function_name) in SHARED_FUNCTIONS:
+
+        return None
+
+    if name in SCSA_FILES:
+
+        return "scsa"
+
+    if name in ENGINE_FILES:
+
+        return "engine"
+
+    if name in UNATTRIBUTED_FILES:
+
+        return None
+
+    return "player"
+
+def label(file_name, function_name):
+    """Names a function for reports and stacks
+
+    Args:
+        file_name (str): File name of the code.
+        function_name (str): Name of the function.
+
+    Returns:
+        str: Returns "file.py:function".
+    """
+
+    return os.path.basename(file_name) + ":" + function_name
+
+
+class Profiler:
+    """Profiler of the thread that plays a tournament
+
+    The "cprofile" mode records every call with cProfile, which is exact but slows pure Python players down.
+    Its collapsed stacks are one level deep, caller and callee, since cProfile does not keep whole stacks. The
+    "sample" mode looks at the thread's stack every interval seconds from another thread, which costs little
+    and keeps whole stacks, but only estimates time.
+    """
+
+    def __init__(self, mode = "cprofile", interval = 0.005):
+        """Constructor for Profiler
+
+        Args:
+            mode (str, optional): "cprofile" or "sample". Defaults to "cprofile".
+            interval (float, optional): Seconds between samples in the sample mode. Defaults to 0.005.
+
+        Raises:
+            ValueError: Raised if the mode is unknown.
+        """
+
+        if mode not in ("cprofile", "sample"):
+
+            raise ValueError("Unknown profiling mode " + str(mode))
+
+        self.mode = mode
+        self.interval = interval
+        self.profile = None
+        self.samples = collections.Counter()
+        self.sampler = None
+        self.stopping = threading.Event()
+        self.thread_id = None
+        self.start_time = None
+        self.wall_time = 0
+
+    def start(self):
+        """Starts profiling the calling thread
+        """
+
+        self.start_time = time.perf_counter()
+
+        if self.mode == "cprofile":
+
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+        else:
+
+            self.thread_id = threading.get_ident()
+            self.stopping.clear()
+            self.sampler = threading.Thread(target = self.sample, daemon = True)
+            self.sampler.start()
+
+        return
+
+    def stop(self):
+        """Stops profiling
+        """
+
+        if self.mode == "cprofile":
+
+            self.profile.disable()
+
+        else:
+
+            self.stopping.set()
+            self.sampler.join()
+
+        self.wall_time = time.perf_counter() - self.start_time
+
+        return
+
+    def sample(self):
+        """Counts the stack of the profiled thread every interval seconds until stopped
+        """
+
+        while not self.stopping.wait(self.interval):
+
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+
+            while frame is not None:
+
+                stack.append(frame.f_code)
+                frame = frame.f_back
+
+            if stack:
+
+                self.samples[tuple(reversed(stack))] += 1
+
+        return
+
+    def self_times(self):
+        """Finds the time spent in each function itself, not counting the functions it called
+
+        Returns:
+            dict: Returns seconds by (file name, line number, function name).
+        """
+
+        times = collections.Counter()
+
+        if self.mode == "cprofile":
+
+            for function, (_, _, own, _, _) in pstats.Stats(self.profile).stats.items():
+
+                times[function] += own
+
+        else:
+
+            total = sum(self.samples.values())
+
+            for stack, count in self.samples.items():
+
+                code = stack[-1]
+
+                times[(code.co_filename, code.co_firstlineno, code.co_qualname)] += self.wall_time*count/total
+
+        return times
+
+    def attribution(self):
+        """Splits the profiled time between the player, the Round engine, SCSA generation and everything else
+
+        Time in code outside the project and in shared helpers goes to the project code that called it, so that a
+        player's calls to random.sample or feedback count as the player's time.
+
+        Returns:
+            dict: Returns seconds by category.
+        """
+
+        times = {name: 0.0 for name, _ in CATEGORIES}
+
+        if self.mode == "cprofile":
+
+            stats = pstats.Stats(self.profile).stats
+
+            def attribute(function, seconds, depth):
+
+                kind = category(function[0], function[2])
+
+                if kind is not None:
+
+                    times[kind] += seconds
+
+                    return
+
+                callers = stats[function][4] if function in stats else {}
+                total = sum(timing[2] for timing in callers.values())
+
+                # Recursion through code outside the project is cut short rather than followed forever
+                if total <= 0 or depth > 50:
+
+                    times["other"] += seconds
+
+                    return
+
+                for caller, timing in callers.items():
+
+                    attribute(caller, seconds*timing[2]/total, depth + 1)
+
+                return
+
+            for function, (_, _, own, _, _) in stats.items():
+
+                attribute(function, own, 0)
+
+        else:
+
+            total = sum(self.samples.values())
+
+            for stack, count in self.samples.items():
+
+                kind = "other"
+
+                for code in reversed(stack):
+
+                    if category(code.co_filename, code.co_name) is not None:
+
+                        kind = category(code.co_filename, code.co_name)
+
+                        break
+
+                times[kind] += self.wall_time*count/total
+
+        return times
+
+    def collapsed(self):
+        """Formats the profile as collapsed stacks for flame graphs
+
+        Returns:
+            list of strs: Returns "outermost;...;innermost weight" lines, weighted in samples or in microseconds.
+        """
+
+        stacks = collections.Counter()
+
+        if self.mode == "cprofile":
+
+            for function, (_, _, own, _, callers) in pstats.Stats(self.profile).stats.items():
+
+                name = label(function[0], function[2])
+
+                if not callers:
+
+                    stacks[name] += own
+
+                for caller, timing in callers.items():
+
+                    stacks[label(caller[0], caller[2]) + ";" + name] += timing[2]
+
+            return [stack + " " + str(round(seconds*1e6)) for stack, seconds in sorted(stacks.items()) if round(seconds*1e6) > 0]
+
+        for stack, count in self.samples.items():
+
+            stacks[";".join(label(code.co_filename, code.co_qualname) for code in stack)] += count
+
+        return [stack + " " + str(count) for stack, count in sorted(stacks.items())]
+
+    def report(self, title, top = 25):
+        """Formats the attribution and the functions with the most time of their own
+
+        Args:
+            title (str): First line of the report, such as the player's name.
+            top (int, optional): Number of functions listed. Defaults to 25.
+
+        Returns:
+            str: Returns report.
+        """
+
+        lines = [title, "Mode: " + self.mode + ", wall time: " + "{:.3f}".format(self.wall_time) + " s", ""]
+        times = self.attribution()
+        total = sum(times.values()) or 1
+
+        for name, description in CATEGORIES:
+
+            lines.append("{:<18}{:>10.3f} s{:>8.1f}%".format(description, times[name], 100*times[name]/total))
+
+        lines.append("")
+        lines.append("{:>10}  {:<16}{}".format("Own (s)", "Part", "Function"))
+
+        for function, seconds in self.self_times().most_common(top):
+
+            lines.append("{:>10.4f}  {:<16}{}".format(seconds, category(function[0], function[2].rsplit(".", 1)[-1]) or "-", label(function[0], function[2])))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix, player_name):
+        """Writes the report and collapsed stacks of a player's tournament
+
+        Args:
+            prefix (str): Start of the file names.
+            player_name (str): Name of the player profiled.
+
+        Returns:
+            list of strs: Returns names of the files written.
+        """
+
+        base = prefix + "-" + player_name
+        files = [base + ".txt", base + ".collapsed"]
+
+        with open(files[0], "w") as file:
+
+            file.write(self.report("Profile of " + player_name))
+
+        with open(files[1], "w") as file:
+
+            file.write("\n".join(self.collapsed()) + "\n")
+
+        if self.mode == "cprofile":
+
+            files.append(base + ".prof")
+
+            self.profile.dump_stats(files[2])
+
+        return files
@@ -0,0 +1,42 @@
+# File contains lookup of players by the names used on the command line
+# Use player_by_name("RAM") to make a player from its command line name, and add to PLAYERS to name a new player
+
+from strategy import AdaptivePlayer
+from prior import PriorPlayer
+from identify import IdentifyingPlayer
+from player import *
+
+PLAYERS = {
+    "RandomFolks": RandomFolks,
+    "Boring": Boring,
+    "RAM": RAM,
+    "Adaptive": AdaptivePlayer,
+    "Prior": PriorPlayer,
+    "PretrainedPrior": lambda: PriorPlayer(pretrain = 10000),
+    "Identifying": lambda: IdentifyingPlayer(RAM(), fallback = PreferFewer(), playable = ram_scsas()),
+}
+
+def ram_scsas():
+    """Lists the SCSAs that RAM has a strategy for, which are all but InsertColors
+
+    Returns:
+        list of SCSAs: Returns one instance of each SCSA.
+    """
+
+    return [scsa_class() for scsa_class in SCSA.__subclasses__() if scsa_class is not InsertColors]
+
+def player_by_name(name):
+    """Creates the player with a given name
+
+    Args:
+        name (str): Name of the player (e.g. "RAM").
+
+    Returns:
+        Player or None: Returns new instance of the player, or None if no player has that name.
+    """
+
+    if name not in PLAYERS:
+
+        return None
+
+    return PLAYERS[name]()
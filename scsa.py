@@ -1,6 +1,8 @@
 # File contains implementation of the secret code generating algorithms
 # See main.py or examples.ipynb for example usage
 
+import itertools
+import math
 import random
 
 def list_to_str(arr):
@@ -39,6 +41,121 @@ def read_from_file(file_name):
 
     return codes
 
+def scsa_by_name(name):
+    """Creates the SCSA with a given name
+
+    Args:
+        name (str): Name of the SCSA (e.g. "TwoColor").
+
+    Returns:
+        SCSA or None: Returns new instance of the SCSA, or None if no SCSA has that name.
+    """
+
+    for scsa_class in SCSA.__subclasses__():
+
+        scsa = scsa_class()
+
+        if scsa.name == name:
+
+            return scsa
+
+    return None
+
+def load_numpy():
+    """Imports NumPy, which only the vectorized generators need
+
+    Returns:
+        module: Returns the numpy module.
+
+    Raises:
+        ImportError: Raised if NumPy is not installed.
+    """
+
+    import numpy
+
+    return numpy
+
+def codes_from_array(array, colors):
+    """Converts an array of color indices to codes
+
+    Args:
+        array (numpy.ndarray): Codes as an (N, L) uint8 array of indices into colors.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+
+    Returns:
+        list of strs: Returns codes in the order of the rows.
+    """
+
+    length = array.shape[1]
+    table = bytes.maketrans(bytes(range(len(colors))), list_to_str(colors).encode("ascii"))
+    joined = array.tobytes().translate(table).decode("ascii")
+
+    return [joined[i:i + length] for i in range(0, len(joined), length)]
+
+def random_pairs(rng, num_codes, size):
+    """Draws ordered pairs of distinct numbers below size, as random.sample(range(size), k=2) does
+
+    Args:
+        rng (numpy.random.Generator): Random number generator to draw from.
+        num_codes (int): Number of pairs.
+        size (int): Number of values to pick from.
+
+    Returns:
+        tuple of numpy.ndarrays: Returns first and second number of every pair.
+    """
+
+    first = rng.integers(0, size, num_codes)
+    second = rng.integers(0, size - 1, num_codes)
+
+    # Skipping over the first number makes every other number equally likely
+    second += second >= first
+
+    return first, second
+
+def pick_from_subsets(rng, num_colors, length, nums):
+    """Fills codes from random subsets of the colors, as random.choices(random.sample(colors, k = num), k = length) does
+
+    Args:
+        rng (numpy.random.Generator): Random number generator to draw from.
+        num_colors (int): Number of colors.
+        length (int): Number of pegs.
+        nums (numpy.ndarray): Number of colors picked for every code.
+
+    Returns:
+        numpy.ndarray: Returns (N, L) uint8 array of color indices.
+    """
+
+    numpy = load_numpy()
+
+    # The first num columns of a random permutation are a random subset of num colors
+    permutations = rng.random((len(nums), num_colors)).argsort(axis = 1)
+    picks = rng.integers(0, nums[:, None], (len(nums), length))
+
+    return numpy.take_along_axis(permutations, picks, axis = 1).astype(numpy.uint8)
+
+def subset_probability(code, colors, num):
+    """Probability that a code is drawn by picking num colors at random and then filling every peg from them
+
+    Args:
+        code (str): Code to compute the probability of.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        num (int): Number of colors picked.
+
+    Returns:
+        float: Returns probability of drawing the code.
+    """
+
+    distinct = len(set(code))
+
+    if distinct > num:
+
+        return 0.0
+
+    # Number of num-color subsets that contain every color of the code
+    subsets = math.comb(len(colors) - distinct, num - distinct)
+
+    return subsets/math.comb(len(colors), num)*num**(-len(code))
+
 class SCSA:
     """Secret-code selection algorithm
     """
@@ -49,13 +166,12 @@ class SCSA:
 
         self.name = ""
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on secret-code selection algorithm
+    def generate_code(self, length, colors):
+        """Generate one code based on secret-code selection algorithm
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Raises:
             NotImplementedError: Function must be implemented by children classes.
@@ -63,6 +179,92 @@ class SCSA:
 
         raise NotImplementedError
 
+    def generate_codes(self, length, colors, num_codes = 1):
+        """Generate codes based on secret-code selection algorithm
+
+        Args:
+            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+
+        Returns:
+            str or list of strs: Returns code(s) generated from SCSA, or None if there are too few colors. Return type is list of strs if num_codes > 1, otherwise it is a str.
+        """
+
+        if num_codes == 1:
+
+            return self.generate_code(length, colors)
+
+        codes = []
+
+        for _ in range(num_codes):
+
+            code = self.generate_code(length, colors)
+
+            if code is None:
+
+                return
+
+            codes.append(code)
+
+        return codes
+
+    def iter_codes(self, length, colors, chunk_size = 1024, num_codes = None):
+        """Generate codes in batches, for callers that want a buffer of codes ready ahead of time
+
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            chunk_size (int, optional): Number of codes per batch. Defaults to 1024.
+            num_codes (int, optional): Number of codes to generate in all. Defaults to None, which never stops.
+
+        Yields:
+            list of strs: Next batch of at most chunk_size codes. Nothing is yielded if there are too few colors.
+        """
+
+        remaining = num_codes
+
+        while remaining is None or remaining > 0:
+
+            count = chunk_size if remaining is None else min(chunk_size, remaining)
+            codes = self.generate_codes(length, colors, count)
+
+            if codes is None:
+
+                return
+
+            yield [codes] if count == 1 else codes
+
+            if remaining is not None:
+
+                remaining -= count
+
+        return
+
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes as an array of color indices, with the same distribution as generate_codes
+
+        Children classes replace this with a vectorized version; this one converts the codes of generate_codes.
+
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Not used, since generate_codes draws from the random module. Defaults to None.
+
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
+        """
+
+        numpy = load_numpy()
+
+        codes = self.generate_codes(length, colors, num_codes)
+        codes = [codes] if num_codes == 1 else codes
+        table = bytes.maketrans(list_to_str(colors).encode("ascii"), bytes(range(len(colors))))
+        packed = list_to_str(codes).encode("ascii").translate(table)
+
+        return numpy.frombuffer(packed, dtype = numpy.uint8).reshape(num_codes, length).copy()
+
     def write_to_file(self, codes, length, num_colors):
         """Writes codes to a file
 
@@ -103,6 +305,42 @@ class SCSA:
 
         return
 
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code
+
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
+    def code_space(self, length, colors):
+        """Lists every code the SCSA can generate
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            list of strs: Returns codes with non-zero probability in lexicographic order.
+        """
+
+        codes = []
+
+        for code in itertools.product(colors, repeat = length):
+
+            code = list_to_str(code)
+
+            if self.pmf(code, colors) > 0:
+
+                codes.append(code)
+
+        return codes
+
 
 class InsertColors(SCSA):
     """ SCSA that generates codes containing colors selected at random
@@ -114,35 +352,60 @@ class InsertColors(SCSA):
 
         self.name = "InsertColors"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on InsertColors SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on InsertColors SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < 1:
 
             return
 
-        if num_codes == 1:
+        return list_to_str(random.choices(colors, k = length))
 
-            codes = list_to_str(random.choices(colors, k = length))
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on InsertColors SCSA as an array of color indices, drawn with NumPy
 
-        else:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
 
-            codes = []
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
 
-            for _ in range(num_codes):
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
-                codes.append(list_to_str(random.choices(colors, k = length))) 
-                
-        return codes
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
+
+        if len(colors) < 1:
+
+            raise ValueError("InsertColors needs at least 1 colors")
+
+        return rng.integers(0, len(colors), (num_codes, length), dtype = numpy.uint8)
+
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under InsertColors SCSA
+
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns probability of the code.
+        """
+
+        return len(colors)**(-len(code))
 
 
 class TwoColor(SCSA):
@@ -155,75 +418,100 @@ class TwoColor(SCSA):
 
         self.name = "TwoColor"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on TwoColor SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on TwoColor SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < 2:
 
             return
 
-        if num_codes == 1:
+        usable_colors = random.sample(colors, k=2)
 
-            usable_colors = random.sample(colors, k=2)
+        # Create 'uninitialized' code as list
+        code = [0]*length
 
-            # Create 'uninitialized' code as list
-            codes = [0]*length
+        # Randomly pick two spots in string
+        indicies = random.sample(range(0,length), k=2)
 
-            # Randomly pick two spots in string
-            indicies = random.sample(range(0,length), k=2)
+        # Set those two spots in the string to the two colors
+        # This guarantees both colors are used at least once
+        code[indicies[0]] = usable_colors[0]
+        code[indicies[1]] = usable_colors[1]
 
-            # Set those two spots in the string to the two colors
-            # This guarantees both colors are used at least once
-            codes[indicies[0]] = usable_colors[0]
-            codes[indicies[1]] = usable_colors[1]
+        # Set rest of spots in code to one of the two colors randomly
+        for i in range(length):
 
-            # Set rest of spots in code to one of the two colors randomly
-            for i in range(length):
+            if code[i] == 0:
 
-                if codes[i] == 0:
+                code[i] = random.choice(usable_colors)
 
-                    codes[i] = random.choice(usable_colors)
+        return list_to_str(code)
 
-            codes = list_to_str(codes)
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on TwoColor SCSA as an array of color indices, drawn with NumPy
 
-        else:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
 
-            codes = []
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
 
-            for _ in range(num_codes):
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
-                usable_colors = random.sample(colors, k=2)
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-                # Create 'uninitialized' code as list
-                code = [0]*length
+        if len(colors) < 2:
 
-                # Randomly pick two spots in string
-                indicies = random.sample(range(0,length), k=2)
+            raise ValueError("TwoColor needs at least 2 colors")
 
-                # Set those two spots in the string to the two colors
-                # This guarantees both colors are used at least once
-                code[indicies[0]] = usable_colors[0]
-                code[indicies[1]] = usable_colors[1]
+        usable_colors = random_pairs(rng, num_codes, len(colors))
+        indicies = random_pairs(rng, num_codes, length)
+        rows = numpy.arange(num_codes)
 
-                # Set rest of spots in code to one of the two colors randomly
-                for i in range(length):
+        # Every peg is one of the two colors at random, then each color is put on its own spot
+        codes = numpy.where(rng.integers(0, 2, (num_codes, length)) == 0, usable_colors[0][:, None], usable_colors[1][:, None])
+        codes[rows, indicies[0]] = usable_colors[0]
+        codes[rows, indicies[1]] = usable_colors[1]
 
-                    if code[i] == 0:
+        return codes.astype(numpy.uint8)
 
-                        code[i] = random.choice(usable_colors)
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under TwoColor SCSA
 
-                codes.append(list_to_str(code))
-                
-        return codes
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns probability of the code.
+        """
+
+        length = len(code)
+
+        if length < 2 or len(set(code)) != 2:
+
+            return 0.0
+
+        count = code.count(code[0])
+
+        # Both colors are first placed on two distinct random positions, the rest are fair coin flips
+        placements = count*(length - count)/(length*(length - 1))
+
+        return placements*2**(2 - length)/math.comb(len(colors), 2)
 
 
 class ABColor(SCSA):
@@ -236,71 +524,98 @@ class ABColor(SCSA):
 
         self.name = "ABColor"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on ABColor SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on ABColor SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if colors does not include "A" and "B".
         """
 
+        if "A" not in colors or "B" not in colors:
+
+            return
+
         usable_colors = ["A", "B"]
 
-        if num_codes == 1:
+        # Create 'uninitialized' code as list
+        code = [0]*length
 
-            usable_colors = random.sample(colors, k=2)
+        # Randomly pick two spots in string
+        indicies = random.sample(range(0,length), k=2)
 
-            # Create 'uninitialized' code as list
-            codes = [0]*length
+        # Set those two spots in the string to the two colors
+        # This guarantees both colors are used at least once
+        code[indicies[0]] = usable_colors[0]
+        code[indicies[1]] = usable_colors[1]
 
-            # Randomly pick two spots in string
-            indicies = random.sample(range(0,length), k=2)
+        # Set rest of spots in code to one of the two colors randomly
+        for i in range(length):
 
-            # Set those two spots in the string to the two colors
-            # This guarantees both colors are used at least once
-            codes[indicies[0]] = usable_colors[0]
-            codes[indicies[1]] = usable_colors[1]
+            if code[i] == 0:
 
-            # Set rest of spots in code to one of the two colors randomly
-            for i in range(length):
+                code[i] = random.choice(usable_colors)
 
-                if codes[i] == 0:
+        return list_to_str(code)
 
-                    codes[i] = random.choice(usable_colors)
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on ABColor SCSA as an array of color indices, drawn with NumPy
 
-            codes = list_to_str(codes)
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
 
-        else:
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
 
-            codes = []
+        Raises:
+            ValueError: Raised if colors does not include "A" and "B".
+        """
 
-            for _ in range(num_codes):
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-                # Create 'uninitialized' code as list
-                code = [0]*length
+        if "A" not in colors or "B" not in colors:
 
-                # Randomly pick two spots in string
-                indicies = random.sample(range(0,length), k=2)
+            raise ValueError("ABColor needs colors A and B")
 
-                # Set those two spots in the string to the two colors
-                # This guarantees both colors are used at least once
-                code[indicies[0]] = usable_colors[0]
-                code[indicies[1]] = usable_colors[1]
+        usable_colors = (colors.index("A"), colors.index("B"))
+        indicies = random_pairs(rng, num_codes, length)
+        rows = numpy.arange(num_codes)
 
-                # Set rest of spots in code to one of the two colors randomly
-                for i in range(length):
+        # Every peg is one of the two colors at random, then each color is put on its own spot
+        codes = numpy.where(rng.integers(0, 2, (num_codes, length)) == 0, usable_colors[0], usable_colors[1])
+        codes[rows, indicies[0]] = usable_colors[0]
+        codes[rows, indicies[1]] = usable_colors[1]
 
-                    if code[i] == 0:
+        return codes.astype(numpy.uint8)
 
-                        code[i] = random.choice(usable_colors)
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under ABColor SCSA
 
-                codes.append(list_to_str(code))
-                
-        return codes
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns probability of the code.
+        """
+
+        length = len(code)
+
+        if length < 2 or set(code) != {"A", "B"}:
+
+            return 0.0
+
+        count = code.count("A")
+
+        # Both colors are first placed on two distinct random positions, the rest are fair coin flips
+        return count*(length - count)/(length*(length - 1))*2**(2 - length)
 
 
 class TwoColorAlternating(SCSA):
@@ -313,66 +628,93 @@ class TwoColorAlternating(SCSA):
 
         self.name = "TwoColorAlternating"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on TwoColorAlternating SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on TwoColorAlternating SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < 2:
 
             return
 
-        if num_codes == 1:
+        usable_colors = list_to_str(random.sample(colors, k=2))
 
-            usable_colors = list_to_str(random.sample(colors, k=2))
+        first_color, second_color = random.sample(usable_colors, k = 2)
 
-            first_color, second_color = list_to_str(random.sample(usable_colors, k = 2))
+        code = ""
 
-            codes = ""
+        for i in range(length):
 
-            for i in range(length):
+            if i % 2 == 0:
 
-                if i % 2 == 0:
+                code += first_color
 
-                    codes += first_color
+            else:
 
-                else:
+                code += second_color
 
-                    codes += second_color
+        return code
 
-        else:
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on TwoColorAlternating SCSA as an array of color indices, drawn with NumPy
 
-            codes = []
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
 
-            for _ in range(num_codes):
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
 
-                usable_colors = list_to_str(random.sample(colors, k=2))
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
-                first_color, second_color = random.sample(usable_colors, k = 2)
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-                code = ""
+        if len(colors) < 2:
 
-                for i in range(length):
+            raise ValueError("TwoColorAlternating needs at least 2 colors")
 
-                    if i % 2 == 0:
+        first_color, second_color = random_pairs(rng, num_codes, len(colors))
 
-                        code += first_color
+        return numpy.where(numpy.arange(length) % 2 == 0, first_color[:, None], second_color[:, None]).astype(numpy.uint8)
 
-                    else:
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under TwoColorAlternating SCSA
 
-                        code += second_color
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns probability of the code.
+        """
+
+        if len(code) == 1:
+
+            return 1/len(colors)
+
+        if code[0] == code[1]:
+
+            return 0.0
+
+        for i in range(len(code)):
+
+            if code[i] != code[i % 2]:
+
+                return 0.0
+
+        return 1/(len(colors)*(len(colors) - 1))
 
-                codes.append(code)
-                
-        #print('SCSA: ', codes)        
-        return codes
 
 class OnlyOnce(SCSA):
     """ SCSA that generates codes in which a color appears at most once
@@ -384,35 +726,65 @@ class OnlyOnce(SCSA):
 
         self.name = "OnlyOnce"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on OnlyOnce SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on OnlyOnce SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < length:
 
             return
 
-        if num_codes == 1:
+        return list_to_str(random.sample(colors, k = length))
 
-            codes = list_to_str(random.sample(colors, k = length))
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on OnlyOnce SCSA as an array of color indices, drawn with NumPy
 
-        else:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
+
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
+
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
-            codes = []
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-            for _ in range(num_codes):
+        if len(colors) < length:
 
-                codes.append(list_to_str(random.sample(colors, k = length))) 
-                
-        return codes
+            raise ValueError("OnlyOnce needs at least as many colors as pegs")
+
+        # The first length columns of a random permutation are a random sample without replacement
+        return rng.random((num_codes, len(colors))).argsort(axis = 1)[:, :length].astype(numpy.uint8)
+
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under OnlyOnce SCSA
+
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns probability of the code.
+        """
+
+        if len(set(code)) != len(code):
+
+            return 0.0
+
+        return math.factorial(len(colors) - len(code))/math.factorial(len(colors))
 
 
 class FirstLast(SCSA):
@@ -425,50 +797,75 @@ class FirstLast(SCSA):
 
         self.name = "FirstLast"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on FirstLast SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on FirstLast SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < 1:
 
             return
 
-        if num_codes == 1:
+        code = random.choices(colors, k = length-2)
+        color = random.choices(colors, k = 1)
 
-            codes = random.choices(colors, k = length-2)
-            color = random.choices(colors, k = 1)
+        code.insert(0, color[0])
+        code.append(color[0])
 
-            codes.insert(0, color[0])
-            codes.append(color[0])
+        return list_to_str(code)
 
-            codes = list_to_str(codes)
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on FirstLast SCSA as an array of color indices, drawn with NumPy
 
-        else:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
+
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
 
-            codes = []
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
-            for _ in range(num_codes):
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-                code = random.choices(colors, k = length-2)
-                color = random.choices(colors, k = 1)
+        if len(colors) < 1:
 
-                code.insert(0, color[0])
-                code.append(color[0])
+            raise ValueError("FirstLast needs at least 1 colors")
 
-                code = list_to_str(code)
+        codes = rng.integers(0, len(colors), (num_codes, length), dtype = numpy.uint8)
+        codes[:, -1] = codes[:, 0]
 
-                codes.append(code) 
-                
         return codes
 
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under FirstLast SCSA
+
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns probability of the code.
+        """
+
+        if len(code) < 2 or code[0] != code[-1]:
+
+            return 0.0
+
+        return len(colors)**(1 - len(code))
+
+
 class UsuallyFewer(SCSA):
     """ SCSA that generates codes that usually has fewer (2 or 3) colors
     """
@@ -479,61 +876,78 @@ class UsuallyFewer(SCSA):
 
         self.name = "UsuallyFewer"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on UsuallyFewer SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on UsuallyFewer SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < 3:
 
             return
 
-        if num_codes == 1:
+        probability = random.randint(0,100)
 
-            probability = random.randint(0,100)
+        if probability < 90:
 
-            if probability < 90:
+            num = random.randint(2,3)
 
-                num = random.randint(2,3)
+            picked_colors = random.sample(colors, k = num)
 
-                picked_colors = random.sample(colors, k = num)
+        else:
 
-            else:
+            picked_colors = colors
 
-                picked_colors = colors
+        return list_to_str(random.choices(picked_colors, k = length))
 
-            codes = list_to_str(random.choices(picked_colors, k = length))
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on UsuallyFewer SCSA as an array of color indices, drawn with NumPy
 
-        else:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
+
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
+
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
-            codes = []
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-            for _ in range(num_codes):
+        if len(colors) < 3:
 
-                probability = random.randint(0,100)
+            raise ValueError("UsuallyFewer needs at least 3 colors")
 
-                if probability < 90:
+        probability = rng.integers(0, 101, num_codes)
+        nums = numpy.where(probability < 90, rng.integers(2, 4, num_codes), len(colors))
 
-                    num = random.randint(2,3)
+        return pick_from_subsets(rng, len(colors), length, nums)
 
-                    picked_colors = random.sample(colors, k = num)
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under UsuallyFewer SCSA
 
-                else:
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
 
-                    picked_colors = colors
+        Returns:
+            float: Returns probability of the code.
+        """
 
-                code = list_to_str(random.choices(picked_colors, k = length))
+        # randint(0, 100) has 101 outcomes, 90 of which pick 2 or 3 colors with equal chance
+        fewer = (subset_probability(code, colors, 2) + subset_probability(code, colors, 3))/2
 
-                codes.append(code) 
-                
-        return codes
+        return 90/101*fewer + 11/101*len(colors)**(-len(code))
 
 
 class PreferFewer(SCSA):
@@ -546,110 +960,111 @@ class PreferFewer(SCSA):
 
         self.name = "PreferFewer"
 
-    def generate_codes(self, length, colors, num_codes = 1):
-        """Generate codes based on PreferFewer SCSA
+    def generate_code(self, length, colors):
+        """Generate one code based on PreferFewer SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
             colors (list of chrs): All possible colors that can be used to generate a code.
-            num_codes (int, optional): Number of codes to generate. Defaults to 1.
 
         Returns:
-            str or list of strs: Returns code(s) generated from SCSA. Return type is list of strs if num_codes > 1, otherwise it is a str.
+            str: Returns code generated from SCSA, or None if there are too few colors.
         """
 
         if len(colors) < 2:
 
             return
 
-        if num_codes == 1:
+        probability = random.randint(0,100)
 
-            probability = random.randint(0,100)
+        if probability <= 49:
 
-            if probability <= 49:
+            num = 1
 
-                num = 1
+            picked_colors = random.sample(colors, k = num)
 
-                picked_colors = random.sample(colors, k = num)
 
+        elif probability <= 74:
 
-            elif probability <= 74:
+            num = 2
 
-                num = 2
+            picked_colors = random.sample(colors, k = num)
 
-                picked_colors = random.sample(colors, k = num)
 
+        elif probability <= 87:
 
-            elif probability <= 87:
+            num = min(3, len(colors))
 
-                num = min(3, len(colors))
+            picked_colors = random.sample(colors, k = num)
 
-                picked_colors = random.sample(colors, k = num)
+        elif probability <= 95:
 
-            elif probability <= 95:
+            num = min(4, len(colors))
 
-                num = min(4, len(colors))
+            picked_colors = random.sample(colors, k = num)
 
-                picked_colors = random.sample(colors, k = num)
+        elif probability <= 98: 
 
-            elif probability <= 98: 
+            num = min(5, len(colors))
 
-                num = min(5, len(colors))
-
-                picked_colors = random.sample(colors, k = num)
-
-            else:
-
-                picked_colors = colors
-
-            codes = list_to_str(random.choices(picked_colors, k = length))
+            picked_colors = random.sample(colors, k = num)
 
         else:
 
-            codes = []
+            picked_colors = colors
 
-            for _ in range(num_codes):
+        return list_to_str(random.choices(picked_colors, k = length))
 
-                probability = random.randint(0,100)
+    def generate_array(self, length, colors, num_codes, rng = None):
+        """Generate codes based on PreferFewer SCSA as an array of color indices, drawn with NumPy
 
-                if probability <= 49:
-
-                    num = 1
-
-                    picked_colors = random.sample(colors, k = num)
-
-
-                elif probability <= 74:
+        Args:
+            length (int): The length of the codes to be generated (same as number of pegs for an instance of Mastermind).
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            num_codes (int): Number of codes to generate.
+            rng (numpy.random.Generator, optional): Random number generator to draw from. Defaults to a new unseeded one.
 
-                    num = 2
+        Returns:
+            numpy.ndarray: Returns (num_codes, length) uint8 array of indices into colors.
 
-                    picked_colors = random.sample(colors, k = num)
+        Raises:
+            ValueError: Raised if there are too few colors.
+        """
 
+        numpy = load_numpy()
+        rng = rng if rng is not None else numpy.random.default_rng()
 
-                elif probability <= 87:
+        if len(colors) < 2:
 
-                    num = min(3, len(colors))
+            raise ValueError("PreferFewer needs at least 2 colors")
 
-                    picked_colors = random.sample(colors, k = num)
+        probability = rng.integers(0, 101, num_codes)
 
-                elif probability <= 95:
+        # Upper bounds of randint(0, 100) for 1, 2, ..., 5 colors; the rest pick every color
+        tiers = numpy.array([49, 74, 87, 95, 98])
+        nums = numpy.searchsorted(tiers, probability) + 1
+        nums = numpy.where(nums > 5, len(colors), numpy.minimum(nums, len(colors)))
 
-                    num = min(4, len(colors))
+        return pick_from_subsets(rng, len(colors), length, nums)
 
-                    picked_colors = random.sample(colors, k = num)
+    def pmf(self, code, colors):
+        """Probability that generate_codes returns a code under PreferFewer SCSA
 
-                elif probability <= 98: 
+        Args:
+            code (str): Code to compute the probability of.
+            colors (list of chrs): All possible colors that can be used to generate a code.
 
-                    num = min(5, len(colors))
+        Returns:
+            float: Returns probability of the code.
+        """
 
-                    picked_colors = random.sample(colors, k = num)
+        # Number of randint(0, 100) outcomes that pick 1, 2, ..., 5 colors; the remaining 2 pick every color
+        tiers = [(50, 1), (25, 2), (13, 3), (8, 4), (3, 5)]
 
-                else:
+        probability = 2/101*len(colors)**(-len(code))
 
-                    picked_colors = colors
+        for outcomes, num in tiers:
 
-                code = list_to_str(random.choices(picked_colors, k = length))
+            probability += outcomes/101*subset_probability(code, colors, min(num, len(colors)))
 
-                codes.append(code) 
-                
-        return codes
\ No newline at end of file
+        return probability
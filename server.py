@@ -0,0 +1,316 @@
+# File contains a network server that hosts many games of Mastermind at once
+# See loadgen.py for example usage
+#
+# Clients send one JSON request per line and get one JSON reply per line, in the order sent:
+#     {"op": "new", "board_length": 4, "num_colors": 6, "scsa": "InsertColors", "guess_cutoff": 100}  ->  {"session": id}
+#     {"op": "guess", "session": id, "guess": "AABB"}  ->  {"response": [exact, other, guesses]}, or "win", "invalid" or "loss"
+#     {"op": "close", "session": id}                   ->  {"closed": id}
+#     {"op": "stats"}                                  ->  {"sessions": ..., "games": ..., "guesses": ..., "expired": ...}
+# A session ends after "win", "invalid" or "loss"; requests that cannot be served get {"error": message}.
+
+import argparse
+import asyncio
+import itertools
+import json
+from mastermind import *
+
+class Session(Round):
+    """Round hosted by the server, with the time after which it expires if no guess arrives
+    """
+
+    __slots__ = ("expires",)
+
+
+class GameServer:
+    """Serves games of Mastermind to clients over TCP with asyncio
+
+    Every session is a Round, so responses are exactly those of Round.respond_to_guess, and guesses are counted
+    as in Round.play_round: the guess_cutoff-th guess that does not win ends the session with "loss". Colors
+    and SCSAs are shared by all sessions with the same configuration. Sessions with no guess for
+    session_timeout seconds are dropped. Boards longer than max_board_length and guess cutoffs above
+    max_guess_cutoff are refused, since generating codes and holding sessions grows with both.
+    """
+
+    def __init__(self, host = "127.0.0.1", port = 5556, session_timeout = 60, sweep_interval = 1, max_board_length = 10, max_guess_cutoff = 1000):
+        """Constructor for GameServer
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 for any free port. Defaults to 5556.
+            session_timeout (float, optional): Seconds a session may go without a guess. Defaults to 60.
+            sweep_interval (float, optional): Seconds between checks for expired sessions. Defaults to 1.
+            max_board_length (int, optional): Longest board a session may ask for. Defaults to 10.
+            max_guess_cutoff (int, optional): Largest guess_cutoff a session may ask for. Defaults to 1000.
+        """
+
+        self.host = host
+        self.port = port
+        self.session_timeout = session_timeout
+        self.sweep_interval = sweep_interval
+        self.max_board_length = max_board_length
+        self.max_guess_cutoff = max_guess_cutoff
+        self.sessions = {}
+        self.configs = {}
+        self.session_ids = itertools.count(1)
+        self.games = 0
+        self.guesses = 0
+        self.expired = 0
+        self.server = None
+        self.sweeper = None
+
+    def config(self, board_length, num_colors, scsa_name):
+        """Looks up the colors and SCSA of a configuration, creating them on first use
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors.
+            scsa_name (str): Name of the SCSA.
+
+        Returns:
+            tuple: Returns colors and SCSA, or None if the configuration is not valid.
+        """
+
+        key = (board_length, num_colors, scsa_name)
+
+        if key not in self.configs:
+
+            scsa = scsa_by_name(scsa_name)
+
+            if scsa is None or not 1 <= num_colors <= 26 or not 1 <= board_length <= self.max_board_length:
+
+                return None
+
+            self.configs[key] = ([chr(i) for i in range(65,91)][:num_colors], scsa)
+
+        return self.configs[key]
+
+    def new_session(self, request, now):
+        """Starts a game
+
+        Args:
+            request (dict): New session request.
+            now (float): Current time of the event loop.
+
+        Returns:
+            dict: Returns reply.
+        """
+
+        board_length = int(request["board_length"])
+        guess_cutoff = int(request.get("guess_cutoff", 100))
+
+        if board_length > self.max_board_length:
+
+            return {"error": "board_length above " + str(self.max_board_length)}
+
+        if not 1 <= guess_cutoff <= self.max_guess_cutoff:
+
+            return {"error": "guess_cutoff outside 1 to " + str(self.max_guess_cutoff)}
+
+        config = self.config(board_length, int(request["num_colors"]), request.get("scsa", "InsertColors"))
+
+        if config is None:
+
+            return {"error": "unrecognized configuration"}
+
+        colors, scsa = config
+        code = scsa.generate_codes(board_length, colors, 1)
+
+        if code is None:
+
+            return {"error": scsa.name + " cannot generate a code for this board"}
+
+        session_id = next(self.session_ids)
+        session = Session(board_length, colors, code, scsa, guess_cutoff)
+        session.expires = now + self.session_timeout
+
+        self.sessions[session_id] = session
+        self.games += 1
+
+        return {"session": session_id}
+
+    def guess(self, request, now):
+        """Responds to a guess in a game
+
+        Args:
+            request (dict): Guess request.
+            now (float): Current time of the event loop.
+
+        Returns:
+            dict: Returns reply.
+        """
+
+        session_id = request.get("session")
+        session = self.sessions.get(session_id)
+
+        if session is None:
+
+            return {"error": "unknown session"}
+
+        guess = request.get("guess")
+
+        session.guesses += 1
+        session.expires = now + self.session_timeout
+        self.guesses += 1
+
+        response = session.respond_to_guess(guess if isinstance(guess, str) else "")
+
+        if response == "win" or response == "invalid":
+
+            del self.sessions[session_id]
+
+            return {"response": response, "guesses": session.guesses}
+
+        if session.guesses >= session.guess_cutoff:
+
+            del self.sessions[session_id]
+
+            return {"response": "loss", "guesses": session.guesses}
+
+        return {"response": response}
+
+    def handle_request(self, request, now):
+        """Serves one request
+
+        Args:
+            request (dict): Request sent by a client.
+            now (float): Current time of the event loop.
+
+        Returns:
+            dict: Returns reply.
+        """
+
+        op = request.get("op")
+
+        try:
+
+            if op == "guess":
+
+                return self.guess(request, now)
+
+            if op == "new":
+
+                return self.new_session(request, now)
+
+            if op == "close":
+
+                self.sessions.pop(request.get("session"), None)
+
+                return {"closed": request.get("session")}
+
+            if op == "stats":
+
+                return {"sessions": len(self.sessions), "games": self.games, "guesses": self.guesses, "expired": self.expired}
+
+        except (KeyError, TypeError, ValueError):
+
+            return {"error": "malformed request"}
+
+        return {"error": "unknown op"}
+
+    async def handle_connection(self, reader, writer):
+        """Serves the requests of one client connection in order
+
+        Args:
+            reader (asyncio.StreamReader): Stream to read requests from.
+            writer (asyncio.StreamWriter): Stream to write replies to.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        try:
+
+            while True:
+
+                line = await reader.readline()
+
+                if not line:
+
+                    break
+
+                try:
+
+                    request = json.loads(line)
+
+                except ValueError:
+
+                    request = {}
+
+                reply = self.handle_request(request, loop.time()) if isinstance(request, dict) else {"error": "malformed request"}
+
+                writer.write((json.dumps(reply) + "\n").encode())
+
+                await writer.drain()
+
+        except ConnectionError:
+
+            pass
+
+        finally:
+
+            writer.close()
+
+        return
+
+    async def expire_sessions(self):
+        """Drops sessions that have gone without a guess for too long, every sweep_interval seconds
+        """
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+
+            await asyncio.sleep(self.sweep_interval)
+
+            now = loop.time()
+            expired = [session_id for session_id, session in self.sessions.items() if session.expires < now]
+
+            for session_id in expired:
+
+                del self.sessions[session_id]
+
+            self.expired += len(expired)
+
+    async def start(self):
+        """Starts listening and expiring sessions
+        """
+
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.sweeper = asyncio.get_running_loop().create_task(self.expire_sessions())
+
+        return
+
+    async def serve(self):
+        """Serves clients until cancelled
+        """
+
+        await self.start()
+
+        try:
+
+            await self.server.serve_forever()
+
+        finally:
+
+            self.sweeper.cancel()
+
+        return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Host games of Mastermind over TCP.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 5556)
+    parser.add_argument("--session-timeout", type = float, default = 60)
+    parser.add_argument("--max-board-length", type = int, default = 10)
+    parser.add_argument("--max-guess-cutoff", type = int, default = 1000)
+    args = parser.parse_args()
+
+    try:
+
+        asyncio.run(GameServer(args.host, args.port, args.session_timeout, max_board_length = args.max_board_length, max_guess_cutoff = args.max_guess_cutoff).serve())
+
+    except KeyboardInterrupt:
+
+        pass
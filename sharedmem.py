@@ -0,0 +1,300 @@
+# File contains code corpora and lookup tables kept in shared memory, so worker processes can attach to them by name
+# See parallel.py for example usage
+
+from multiprocessing import shared_memory
+from mastermind import *
+
+def response_id(response, board_length):
+    """Packs an (exact, other) response into one byte
+
+    Args:
+        response (tuple of ints): Number of exact and other matches.
+        board_length (int): Number of pegs.
+
+    Returns:
+        int: Returns exact*(board_length + 1) + other.
+    """
+
+    return response[0]*(board_length + 1) + response[1]
+
+
+def response_rows(guesses, codes, board_length):
+    """Scores every guess against every code
+
+    Uses NumPy when it is installed, which scores a guess against all codes at once and is many times faster than
+    calling feedback for every pair.
+
+    Args:
+        guesses (list of strs): Guesses to score.
+        codes (list of strs): Codes to score every guess against.
+        board_length (int): Number of pegs.
+
+    Yields:
+        bytes: Response id of every code to the next guess.
+    """
+
+    try:
+
+        numpy = load_numpy()
+
+    except ImportError:
+
+        numpy = None
+
+    if numpy is None:
+
+        for guess in guesses:
+
+            yield bytes(response_id(feedback(guess, code), board_length) for code in codes)
+
+        return
+
+    alphabet = {color: i for i, color in enumerate(sorted(set(itertools.chain.from_iterable(codes))))}
+    code_array = numpy.array([[alphabet[peg] for peg in code] for code in codes], dtype = numpy.int16).reshape(len(codes), board_length)
+    code_counts = (code_array[:, :, None] == numpy.arange(len(alphabet))).sum(axis = 1)
+
+    for guess in guesses:
+
+        # Colors no code uses match nothing, so they are left out of the counts
+        pegs = numpy.array([alphabet.get(peg, -1) for peg in guess], dtype = numpy.int16)
+        exact = (code_array == pegs).sum(axis = 1)
+        common = numpy.minimum(code_counts, numpy.bincount(pegs[pegs >= 0], minlength = len(alphabet))).sum(axis = 1)
+
+        yield (exact*(board_length + 1) + common - exact).astype(numpy.uint8).tobytes()
+
+    return
+
+
+class SharedBlock:
+    """Block of shared memory that is created by one process and attached to by name in others
+
+    The creating process owns the block and should call unlink once no process needs it; every process calls
+    close when done with it. handle is a small picklable tuple from which attach rebuilds the object.
+    """
+
+    def __init__(self, size, name = None):
+        """Constructor for SharedBlock
+
+        Args:
+            size (int): Number of bytes. Ignored when attaching.
+            name (str, optional): Name of an existing block to attach to. Defaults to None, which creates a new block.
+        """
+
+        if name is None:
+
+            self.memory = shared_memory.SharedMemory(create = True, size = max(size, 1))
+            self.owner = True
+
+        else:
+
+            self.memory = shared_memory.SharedMemory(name = name)
+            self.owner = False
+
+        self.buffer = self.memory.buf
+
+    def close(self):
+        """Detaches this process from the block
+        """
+
+        self.buffer = None
+        self.memory.close()
+
+        return
+
+    def unlink(self):
+        """Closes the block and frees it, if this process created it
+        """
+
+        self.close()
+
+        if self.owner:
+
+            self.memory.unlink()
+
+        return
+
+
+class SharedCodes(SharedBlock):
+    """Codes stored one byte per peg, as the index of the peg's color
+    """
+
+    def __init__(self, codes, colors, board_length = None, name = None):
+        """Constructor for SharedCodes
+
+        Args:
+            codes (list of strs): Codes to store. Ignored when attaching.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            board_length (int, optional): Number of pegs. Defaults to the length of the first code.
+            name (str, optional): Name of an existing block to attach to. Defaults to None, which creates a new block.
+        """
+
+        if board_length is None:
+
+            board_length = len(codes[0]) if codes else 0
+
+        self.colors = colors
+        self.board_length = board_length
+
+        if name is None:
+
+            self.count = len(codes)
+
+            super().__init__(self.count*board_length)
+
+            color_index = {color: i for i, color in enumerate(colors)}
+
+            self.buffer[:self.count*board_length] = bytes(color_index[color] for code in codes for color in code)
+
+        else:
+
+            super().__init__(0, name)
+
+            self.count = len(self.memory.buf)//board_length if board_length else 0
+
+        self.handle = ("codes", self.memory.name, colors, board_length, self.count)
+
+    @classmethod
+    def attach(cls, handle):
+        """Attaches to codes created by another process
+
+        Args:
+            handle (tuple): The handle attribute of the SharedCodes that created the block.
+
+        Returns:
+            SharedCodes: Returns codes backed by the same memory.
+        """
+
+        _, name, colors, board_length, count = handle
+
+        codes = cls(None, colors, board_length, name)
+        codes.count = count
+        codes.handle = handle
+
+        return codes
+
+    def __len__(self):
+
+        return self.count
+
+    def code(self, index):
+        """Reads one code
+
+        Args:
+            index (int): Position of the code.
+
+        Returns:
+            str: Returns code.
+        """
+
+        start = index*self.board_length
+
+        return "".join(self.colors[peg] for peg in self.buffer[start:start + self.board_length])
+
+    def __iter__(self):
+
+        for index in range(self.count):
+
+            yield self.code(index)
+
+
+class ResponseTable(SharedBlock):
+    """Response of every code to every guess, one byte per pair as packed by response_id
+    """
+
+    def __init__(self, guesses, codes, board_length, name = None):
+        """Constructor for ResponseTable
+
+        Args:
+            guesses (list of strs): Guesses, the rows of the table. Only their number is used when attaching.
+            codes (list of strs): Codes, the columns of the table. Only their number is used when attaching.
+            board_length (int): Number of pegs.
+            name (str, optional): Name of an existing block to attach to. Defaults to None, which creates a new block.
+        """
+
+        self.board_length = board_length
+        self.num_guesses = len(guesses)
+        self.num_codes = len(codes)
+
+        if name is None:
+
+            super().__init__(self.num_guesses*self.num_codes)
+
+            try:
+
+                for row, responses in enumerate(response_rows(guesses, codes, board_length)):
+
+                    start = row*self.num_codes
+
+                    self.buffer[start:start + self.num_codes] = responses
+
+            except BaseException:
+
+                # Nothing else knows the block's name yet, so it would never be freed
+                self.unlink()
+
+                raise
+
+        else:
+
+            super().__init__(0, name)
+
+        self.handle = ("responses", self.memory.name, self.num_guesses, self.num_codes, board_length)
+
+    @classmethod
+    def attach(cls, handle):
+        """Attaches to a table created by another process
+
+        Args:
+            handle (tuple): The handle attribute of the ResponseTable that created the block.
+
+        Returns:
+            ResponseTable: Returns table backed by the same memory.
+        """
+
+        _, name, num_guesses, num_codes, board_length = handle
+
+        return cls(range(num_guesses), range(num_codes), board_length, name)
+
+    def row(self, guess_index):
+        """Gives the responses of every code to one guess without copying them
+
+        Args:
+            guess_index (int): Row of the guess.
+
+        Returns:
+            memoryview: Returns response ids, one per code.
+        """
+
+        start = guess_index*self.num_codes
+
+        return self.buffer[start:start + self.num_codes]
+
+    def response(self, guess_index, code_index):
+        """Looks up one response
+
+        Args:
+            guess_index (int): Row of the guess.
+            code_index (int): Column of the code.
+
+        Returns:
+            tuple of ints: Returns (exact, other) response.
+        """
+
+        packed = self.buffer[guess_index*self.num_codes + code_index]
+
+        return divmod(packed, self.board_length + 1)
+
+
+def attach(handle):
+    """Attaches to any shared object from its handle
+
+    Args:
+        handle (tuple): The handle attribute of a SharedCodes or ResponseTable.
+
+    Returns:
+        SharedBlock: Returns object backed by the same memory.
+    """
+
+    kinds = {"codes": SharedCodes, "responses": ResponseTable}
+
+    return kinds[handle[0]].attach(handle)
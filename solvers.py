@@ -0,0 +1,348 @@
+# File contains general search engines that pick a guess from the history of a round
+# See strategy.py for the player that chooses between them
+
+import itertools
+import random
+from mastermind import *
+
+def all_codes(board_length, colors):
+    """Lists every code for a board
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+
+    Returns:
+        list of strs: Returns all len(colors)**board_length codes in lexicographic order.
+    """
+
+    return [list_to_str(code) for code in itertools.product(colors, repeat = board_length)]
+
+def random_code(board_length, colors, rng = random):
+    """Draws a code uniformly from the whole code space
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        rng (random.Random, optional): Random number generator to draw from. Defaults to the random module.
+
+    Returns:
+        str: Returns random code.
+    """
+
+    return list_to_str(rng.choices(colors, k = board_length))
+
+def is_consistent(code, history):
+    """Checks whether a code could be the answer given the guesses and responses so far
+
+    Args:
+        code (str): Code to check.
+        history (list of tuples): Pairs of guess and (exact, other) response.
+
+    Returns:
+        bool: Returns True if the code would have produced every response in the history.
+    """
+
+    for guess, response in history:
+
+        if feedback(guess, code) != response:
+
+            return False
+
+    return True
+
+def inconsistency(code, history):
+    """Measures how far a code is from agreeing with the guesses and responses so far
+
+    Args:
+        code (str): Code to check.
+        history (list of tuples): Pairs of guess and (exact, other) response.
+
+    Returns:
+        int: Returns the total difference in exact and other pegs, 0 when the code is consistent.
+    """
+
+    distance = 0
+
+    for guess, response in history:
+
+        exact, other = feedback(guess, code)
+
+        distance += abs(exact - response[0]) + abs(other - response[1])
+
+    return distance
+
+
+class Engine:
+    """Search engine that chooses the next guess of a round
+    """
+
+    def __init__(self):
+        """Constructor for Engine
+        """
+
+        self.name = ""
+
+    def choose(self, board_length, colors, history, candidates, rng = random, deadline = None):
+        """Chooses the next guess
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            history (list of tuples): Pairs of guess and (exact, other) response made so far this round.
+            candidates (list of strs or None): Codes consistent with the history, or None if they are not enumerated.
+            rng (random.Random, optional): Random number generator to draw from. Defaults to the random module.
+            deadline (float, optional): time.perf_counter() value by which the engine should return. Defaults to no deadline.
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
+
+class MinimaxEngine(Engine):
+    """Engine that picks the guess whose largest response class is smallest (Knuth's worst-case strategy)
+
+    Candidates are scored before the other codes, so when the deadline cuts the search short the best guess
+    found so far is still one that could win.
+    """
+
+    def __init__(self, all_guesses = True):
+        """Constructor for MinimaxEngine
+
+        Args:
+            all_guesses (bool, optional): Whether every code is tried as a guess or only the candidates. Defaults to True.
+        """
+
+        self.all_guesses = all_guesses
+        self.name = "minimax" if all_guesses else "minimax-candidates"
+
+    def choose(self, board_length, colors, history, candidates, rng = random, deadline = None):
+        """Chooses the guess that minimizes the worst-case number of remaining candidates
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            history (list of tuples): Pairs of guess and (exact, other) response made so far this round.
+            candidates (list of strs or None): Codes consistent with the history, or None if they are not enumerated.
+            rng (random.Random, optional): Unused, the choice is deterministic.
+            deadline (float, optional): time.perf_counter() value after which the best guess so far is returned. Defaults to no deadline.
+
+        Returns:
+            str or None: Returns guess, or None if the candidates are not enumerated.
+        """
+
+        if not candidates:
+
+            return None
+
+        if len(candidates) <= 2:
+
+            return candidates[0]
+
+        return anytime(self.scan(board_length, colors, candidates), deadline, 1.0)
+
+    def scan(self, board_length, colors, candidates):
+        """Scores guesses one at a time, candidates first
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            candidates (list of strs): Codes consistent with the history.
+
+        Yields:
+            str: Best guess after each guess is scored.
+        """
+
+        candidate_set = set(candidates)
+        pool = candidates
+
+        if self.all_guesses:
+
+            pool = itertools.chain(candidates, (code for code in all_codes(board_length, colors) if code not in candidate_set))
+
+        best = None
+        best_key = None
+
+        for guess in pool:
+
+            counts = {}
+
+            for code in candidates:
+
+                response = feedback(guess, code)
+                counts[response] = counts.get(response, 0) + 1
+
+            telemetry.count("feedback_calls", len(candidates))
+
+            # Ties go to guesses that could win outright
+            key = (max(counts.values()), guess not in candidate_set)
+
+            if best_key is None or key < best_key:
+
+                best = guess
+                best_key = key
+
+            yield best
+
+
+class SamplingEngine(Engine):
+    """Engine that guesses a random code consistent with the history
+    """
+
+    def __init__(self, max_tries = 20000):
+        """Constructor for SamplingEngine
+
+        Args:
+            max_tries (int, optional): Random codes drawn before giving up when candidates are not enumerated. Defaults to 20000.
+        """
+
+        self.max_tries = max_tries
+        self.name = "sampling"
+
+    def choose(self, board_length, colors, history, candidates, rng = random, deadline = None):
+        """Chooses a random consistent code
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            history (list of tuples): Pairs of guess and (exact, other) response made so far this round.
+            candidates (list of strs or None): Codes consistent with the history, or None if they are not enumerated.
+            rng (random.Random, optional): Random number generator to draw from. Defaults to the random module.
+            deadline (float, optional): time.perf_counter() value after which no more codes are drawn. Defaults to no deadline.
+
+        Returns:
+            str or None: Returns guess, or None if no consistent code was found within max_tries draws.
+        """
+
+        if candidates is not None:
+
+            return rng.choice(candidates) if candidates else None
+
+        for _ in range(self.max_tries):
+
+            code = random_code(board_length, colors, rng)
+
+            if is_consistent(code, history):
+
+                return code
+
+            telemetry.count("rejections")
+
+            if deadline is not None and time.perf_counter() > deadline:
+
+                break
+
+        return None
+
+
+class GeneticEngine(Engine):
+    """Engine that evolves a population of codes towards consistency with the history
+    """
+
+    def __init__(self, population = 60, generations = 100, mutation_rate = 0.1):
+        """Constructor for GeneticEngine
+
+        Args:
+            population (int, optional): Number of codes per generation. Defaults to 60.
+            generations (int, optional): Largest number of generations evolved per guess. Defaults to 100.
+            mutation_rate (float, optional): Chance that a peg of a child code is recolored. Defaults to 0.1.
+        """
+
+        self.population = population
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.name = "genetic"
+
+    def breed(self, first, second, colors, rng):
+        """Produces a child code from two parents
+
+        Args:
+            first (str): First parent code.
+            second (str): Second parent code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            rng (random.Random): Random number generator to draw from.
+
+        Returns:
+            str: Returns child code.
+        """
+
+        cut = rng.randrange(1, len(first)) if len(first) > 1 else 0
+        child = list(first[:cut] + second[cut:])
+
+        for i in range(len(child)):
+
+            if rng.random() < self.mutation_rate:
+
+                child[i] = rng.choice(colors)
+
+        # Occasionally swap two pegs so that color counts found so far survive
+        if len(child) > 1 and rng.random() < self.mutation_rate:
+
+            i, j = rng.sample(range(len(child)), k = 2)
+            child[i], child[j] = child[j], child[i]
+
+        return list_to_str(child)
+
+    def choose(self, board_length, colors, history, candidates, rng = random, deadline = None):
+        """Chooses the first consistent code found, or the least inconsistent one after the last generation
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            history (list of tuples): Pairs of guess and (exact, other) response made so far this round.
+            candidates (list of strs or None): Unused, the engine never enumerates the code space.
+            rng (random.Random, optional): Random number generator to draw from. Defaults to the random module.
+            deadline (float, optional): time.perf_counter() value after which no more generations are evolved. Defaults to no deadline.
+
+        Returns:
+            str: Returns guess.
+        """
+
+        guessed = set(guess for guess, _ in history)
+        population = [random_code(board_length, colors, rng) for _ in range(self.population)]
+        best = None
+        best_distance = None
+
+        for _ in range(self.generations):
+
+            ranked = sorted((inconsistency(code, history), code) for code in population)
+
+            telemetry.count("generations")
+            telemetry.count("feedback_calls", len(population)*len(history))
+
+            for distance, code in ranked:
+
+                if code in guessed:
+
+                    continue
+
+                if distance == 0:
+
+                    return code
+
+                if best_distance is None or distance < best_distance:
+
+                    best = code
+                    best_distance = distance
+
+                break
+
+            if deadline is not None and time.perf_counter() > deadline:
+
+                break
+
+            parents = [code for _, code in ranked[:max(2, self.population // 4)]]
+            population = parents[:]
+
+            while len(population) < self.population:
+
+                first, second = rng.sample(parents, k = 2)
+                population.append(self.breed(first, second, colors, rng))
+
+        if best is None:
+
+            best = random_code(board_length, colors, rng)
+
+        return best
@@ -0,0 +1,502 @@
+# File contains a player wrapper that precomputes its next guess while the engine scores the current one
+# Run python main.py 4 6 Adaptive PreferFewer 100 --speculate thread, or use SpeculativePlayer(player) as a player
+
+import copy
+import itertools
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from mastermind import *
+
+def reply_to_response(player, board_length, colors, scsa, response):
+    """Computes a player's next guess for a hypothetical response
+
+    Args:
+        player (Player): Snapshot of the player taken right after its last guess.
+        board_length (int): Number of pegs of secret code.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        scsa (SCSA): SCSA used to generate secret code.
+        response (tuple of ints): Hypothetical response to the player's last guess.
+
+    Returns:
+        str: Guess the player makes for the response.
+        Player: Copy of the player holding the state after making that guess.
+    """
+
+    clone = copy_player(player, share_learned = True)
+
+    guess = clone.make_guess(board_length, colors, scsa, response)
+
+    return guess, clone
+
+def stoppable_reply(stopped, player, board_length, colors, scsa, response):
+    """Computes a player's next guess for a hypothetical response in a worker thread, giving up once stopped
+
+    Threads share the interpreter, so a reply nobody needs any more would keep taking time from the guess that
+    is being timed. The worker checks the event at every function call the player makes and unwinds as soon as
+    it is set.
+
+    Args:
+        stopped (threading.Event): Set when the reply is no longer needed.
+        player (Player): Snapshot of the player taken right after its last guess.
+        board_length (int): Number of pegs of secret code.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        scsa (SCSA): SCSA used to generate secret code.
+        response (tuple of ints): Hypothetical response to the player's last guess.
+
+    Returns:
+        str: Guess the player makes for the response.
+        Player: Copy of the player holding the state after making that guess.
+
+    Raises:
+        SpeculationStopped: Raised if the event was set before the guess was made.
+    """
+
+    def trace(frame, event, arg):
+
+        if stopped.is_set():
+
+            raise SpeculationStopped
+
+        # Only calls are checked, lines are left untraced
+        return None
+
+    if stopped.is_set():
+
+        raise SpeculationStopped
+
+    sys.settrace(trace)
+
+    try:
+
+        return reply_to_response(player, board_length, colors, scsa, response)
+
+    finally:
+
+        sys.settrace(None)
+
+
+def timed_reply(timeout, player, board_length, colors, scsa, response):
+    """Computes a player's next guess for a hypothetical response in a worker process, giving up after a timeout
+
+    A process cannot be stopped from outside once it has started a reply, so the worker sets an alarm that
+    unwinds the reply when the timeout passes. Without it, a player that never returns would keep the worker,
+    and the executor's shutdown, waiting forever.
+
+    Args:
+        timeout (float): Seconds the reply may take.
+        player (Player): Snapshot of the player taken right after its last guess.
+        board_length (int): Number of pegs of secret code.
+        colors (list of chrs): All possible colors that can be used to generate a code.
+        scsa (SCSA): SCSA used to generate secret code.
+        response (tuple of ints): Hypothetical response to the player's last guess.
+
+    Returns:
+        str: Guess the player makes for the response.
+        Player: Copy of the player holding the state after making that guess.
+
+    Raises:
+        SpeculationStopped: Raised if the guess was not made within the timeout.
+    """
+
+    def expire(signum, frame):
+
+        raise SpeculationStopped
+
+    previous = signal.signal(signal.SIGALRM, expire)
+
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+
+        return reply_to_response(player, board_length, colors, scsa, response)
+
+    finally:
+
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class SpeculationStopped(BaseException):
+    """Raised in a worker thread whose reply is no longer needed
+
+    Derived from BaseException so that players catching Exception do not swallow it and carry on.
+    """
+
+
+class SpeculativePlayer(Player):
+    """Mastermind Player that computes its reply to every possible response in the background
+
+    Right after returning a guess, the wrapped player is copied once per possible (exact, other) response
+    and each copy makes its next guess in a worker. When the real response arrives, the copy that saw it
+    becomes the wrapped player and its guess is returned, so the next call to make_guess is a lookup.
+
+    Responses that no remaining code could produce are not speculated on, since many players never return
+    from a response that contradicts their earlier ones. This needs the codes consistent with the round so
+    far, which are only tracked while the code space has at most max_candidates codes; on larger boards
+    nothing is speculated and every guess is made by the wrapped player when it is asked for.
+
+    Everything but the lookup is planned in a thread of its own once the guess is returned: the snapshot of
+    the wrapped player, the split of the candidates by their response to the guess and the submission of
+    every reply. The next guess only waits for the plan if the response arrived before it was done.
+
+    In the "thread" mode the workers share the interpreter with the guess being timed, so every reply that is
+    not needed any more is stopped as soon as the real response arrives or the round is won. Replies in the
+    "process" mode that have already started run in their own process until they finish or reply_timeout
+    passes. A reply that timed out is made again by the wrapped player if its response arrives.
+    """
+
+    def __init__(self, player, executor = "thread", max_workers = None, max_candidates = 50000, reply_timeout = 5):
+        """Constructor for SpeculativePlayer
+
+        Args:
+            player (Player): Player whose guesses are precomputed.
+            executor (str, optional): Either "thread" or "process". Defaults to "thread".
+            max_workers (int, optional): Number of background workers. Defaults to the executor's default.
+            max_candidates (int, optional): Largest code space for which consistent codes are tracked. Defaults to 50000.
+            reply_timeout (float, optional): Seconds a reply may take in the "process" mode. Defaults to 5.
+        """
+
+        if executor == "thread":
+
+            self.executor = ThreadPoolExecutor(max_workers = max_workers)
+
+        elif executor == "process":
+
+            self.executor = ProcessPoolExecutor(max_workers = max_workers)
+
+        else:
+
+            raise ValueError("Unrecognized executor: " + str(executor))
+
+        self.player = player
+        self.player_name = player.player_name
+        self.max_candidates = max_candidates
+        self.reply_timeout = reply_timeout
+        self.codes = {}
+        self.candidates = None
+        self.partitions = None
+        self.threaded = executor == "thread"
+        self.planner = ThreadPoolExecutor(max_workers = 1)
+        self.planning = None
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.counts_lock = threading.Lock()
+
+    def new_session(self):
+        """Creates the state of a new round, which speculates through the player's executor
+
+        Returns:
+            SpeculativeSession: Returns session that makes the guesses of one round.
+        """
+
+        return SpeculativeSession(self)
+
+    def fork(self):
+        """Makes a player for one session that shares the executor and the lists of codes of this one
+
+        Returns:
+            SpeculativePlayer: Returns player with its own copy of the wrapped player and its own planner.
+        """
+
+        fork = copy.copy(self)
+
+        fork.player = copy_player(self.player, share_learned = True)
+        fork.candidates = None
+        fork.partitions = None
+        fork.planner = ThreadPoolExecutor(max_workers = 1)
+        fork.planning = None
+        fork.pending = {}
+        fork.hits = 0
+        fork.misses = 0
+
+        return fork
+
+    def learned_state(self):
+        """Lists the objects holding what the wrapped player learns across rounds
+
+        Returns:
+            list: Returns wrapped player's learned state.
+        """
+
+        return self.player.learned_state()
+
+    def prepare(self, board_length, colors, scsa):
+        """Prepares the wrapped player for a board
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret codes.
+        """
+
+        self.player.prepare(board_length, colors, scsa)
+
+        return
+
+    def finish_planning(self):
+        """Waits for the speculation planned after the last guess, if it is still being planned
+        """
+
+        if self.planning is not None:
+
+            planning = self.planning
+
+            self.planning = None
+
+            self.partitions, self.pending = planning.result()
+
+        return
+
+    def cancel_pending(self):
+        """Cancels speculative guesses that have not started yet and stops those running in threads
+        """
+
+        self.finish_planning()
+
+        for future, stopped in self.pending.values():
+
+            future.cancel()
+
+            if stopped is not None:
+
+                stopped.set()
+
+        self.pending = {}
+
+        return
+
+    def all_codes(self, board_length, colors):
+        """Lists every code of a board, once per board, if the code space is small enough to track
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            list of strs or None: Returns every code, or None if there are more than max_candidates.
+        """
+
+        if len(colors)**board_length > self.max_candidates:
+
+            return None
+
+        key = (board_length, tuple(colors))
+
+        if key not in self.codes:
+
+            self.codes[key] = [list_to_str(code) for code in itertools.product(colors, repeat = board_length)]
+
+        return self.codes[key]
+
+    def plan(self, board_length, colors, scsa, guess, guesses, candidates, player):
+        """Starts computing the reply to every reachable response to a guess, in the planner thread
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            guess (str): Guess that was just made.
+            guesses (int): Number of guesses the engine will report with the response.
+            candidates (list of strs): Codes consistent with the round before the guess.
+            player (Player): Wrapped player right after making the guess.
+
+        Returns:
+            dict: Returns candidates left by each reachable response.
+            dict: Returns future and stop event of the reply to each reachable response.
+        """
+
+        # One snapshot is enough, each worker copies it again before guessing
+        snapshot = copy_player(player, share_learned = True)
+        partitions = {}
+
+        for code in candidates:
+
+            partitions.setdefault(feedback(guess, code), []).append(code)
+
+        telemetry.count("feedback_calls", len(candidates))
+
+        partitions.pop((board_length, 0), None)
+        responses = sorted(partitions)
+        pending = {}
+
+        for exact, other in responses:
+
+            response = (exact, other, guesses)
+
+            if self.threaded:
+
+                stopped = threading.Event()
+
+                pending[(exact, other)] = (self.executor.submit(stoppable_reply, stopped, snapshot, board_length, colors, scsa, response), stopped)
+
+            else:
+
+                pending[(exact, other)] = (self.executor.submit(timed_reply, self.reply_timeout, snapshot, board_length, colors, scsa, response), None)
+
+        return partitions, pending
+
+    def speculative_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind, using the precomputed reply when available
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+            budget (Budget or None): Time and guesses left passed on to the wrapped player when it has to guess now.
+
+        Returns:
+            str: Returns guess
+        """
+
+        self.finish_planning()
+
+        future = None
+        response = (last_response[0], last_response[1])
+
+        if last_response[2] == 0:
+
+            self.candidates = self.all_codes(board_length, colors)
+
+        else:
+
+            if self.candidates is not None:
+
+                before = len(self.candidates)
+
+                self.candidates = self.partitions.get(response, [])
+
+                telemetry.prune("candidates", before, len(self.candidates))
+
+            if response in self.pending:
+
+                future = self.pending.pop(response)[0]
+
+        self.cancel_pending()
+
+        # A reply that never started is cheaper to compute here than to wait for, and one that timed out has to be
+        if future is not None and not future.cancel() and future.exception() is None:
+
+            guess, self.player = future.result()
+
+            with self.counts_lock:
+
+                self.hits += 1
+
+            telemetry.count("speculation_hits")
+
+        else:
+
+            guess = forward_guess(self.player, board_length, colors, scsa, last_response, budget)
+
+            if last_response[2] != 0:
+
+                with self.counts_lock:
+
+                    self.misses += 1
+
+                telemetry.count("speculation_misses")
+
+        if self.candidates is not None:
+
+            self.planning = self.planner.submit(self.plan, board_length, colors, scsa, guess, last_response[2] + 1, self.candidates, self.player)
+
+        return guess
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind, using the precomputed reply when available
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return self.speculative_guess(board_length, colors, scsa, last_response, None)
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind, passing the budget on when the reply was not precomputed
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        return self.speculative_guess(board_length, colors, scsa, last_response, budget)
+
+    def observe_answer(self, code):
+        """Stops the speculation of the won round and passes its answer on to the wrapped player
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        self.cancel_pending()
+
+        self.player.observe_answer(code)
+
+        return
+
+    def close(self):
+        """Stops the background workers
+        """
+
+        self.cancel_pending()
+
+        self.planner.shutdown()
+        self.executor.shutdown(cancel_futures = True)
+
+        return
+
+
+class SpeculativeSession(CopiedSession):
+    """Session of a SpeculativePlayer
+
+    Executors cannot be copied, so instead of a copy of the player the session speculates with a fork of it,
+    which has its own copy of the wrapped player and its own planner but submits its replies to the player's
+    executor. Hits and misses are added to the player's when the session is closed.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, owner):
+        """Constructor for SpeculativeSession
+
+        Args:
+            owner (SpeculativePlayer): Player that made the session.
+        """
+
+        PlayerSession.__init__(self, owner)
+
+        self.player = owner.fork()
+
+    def close(self):
+        """Stops the session's speculation and planner, leaving the shared executor running
+        """
+
+        self.player.cancel_pending()
+        self.player.planner.shutdown()
+
+        with self.owner.counts_lock:
+
+            self.owner.hits += self.player.hits
+            self.owner.misses += self.player.misses
+
+        return
@@ -0,0 +1,373 @@
+# File contains a player that picks a search engine for every guess from the size of the code space and the time left
+# Run python main.py 5 7 Adaptive PreferFewer 100, or use AdaptivePlayer() and read its engine_uses afterwards
+
+import collections
+import math
+from solvers import *
+
+Decision = collections.namedtuple("Decision", ["round", "guess", "engine", "estimate", "enumerated", "budget", "predicted", "actual"])
+
+def number_of_responses(board_length):
+    """Counts the distinct (exact, other) responses for a board
+
+    Args:
+        board_length (int): Number of pegs.
+
+    Returns:
+        int: Returns number of possible responses, including the winning one.
+    """
+
+    return (board_length + 1)*(board_length + 2)//2 - 1
+
+
+class CostModel:
+    """Predicts how long each engine takes to choose a guess
+
+    Every engine's work is dominated by calls to feedback, so a prediction is the number of calls the engine
+    makes times the time of one call. Feedback takes time in proportion to the number of pegs, so the time per
+    peg is measured once when the model is made, outside of any timed guess. After each guess the prediction
+    is corrected by the ratio of measured to predicted time, kept per engine as a moving average.
+    """
+
+    def __init__(self, samples = 2000, smoothing = 0.3):
+        """Constructor for CostModel
+
+        Args:
+            samples (int, optional): Number of feedback calls timed when calibrating. Defaults to 2000.
+            smoothing (float, optional): Weight of the newest measurement in the correction factors. Defaults to 0.3.
+        """
+
+        self.samples = samples
+        self.smoothing = smoothing
+        self.peg_time = None
+        self.corrections = {}
+
+        self.calibrate()
+
+    def calibrate(self, board_length = 4, colors = "ABCDEF"):
+        """Measures the time feedback takes per peg
+
+        Args:
+            board_length (int, optional): Number of pegs of the codes timed. Defaults to 4.
+            colors (list of chrs, optional): Colors of the codes timed. Defaults to "ABCDEF".
+        """
+
+        pairs = [(random_code(board_length, colors), random_code(board_length, colors)) for _ in range(self.samples)]
+
+        start = time.perf_counter()
+
+        for guess, code in pairs:
+
+            feedback(guess, code)
+
+        end = time.perf_counter()
+
+        self.peg_time = (end - start)/self.samples/board_length
+
+        return
+
+    def calls(self, engine, board_length, colors, history, candidates, estimate):
+        """Estimates the number of feedback calls an engine makes for the next guess
+
+        Args:
+            engine (Engine): Engine to estimate for.
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            history (list of tuples): Pairs of guess and (exact, other) response made so far this round.
+            candidates (list of strs or None): Codes consistent with the history, or None if they are not enumerated.
+            estimate (float): Estimated number of codes consistent with the history.
+
+        Returns:
+            float: Returns estimated number of calls, math.inf if the engine cannot run.
+        """
+
+        if isinstance(engine, MinimaxEngine):
+
+            if candidates is None:
+
+                return math.inf
+
+            pool = len(colors)**board_length if engine.all_guesses else len(candidates)
+
+            return float(pool)*len(candidates)
+
+        if isinstance(engine, SamplingEngine):
+
+            if candidates is not None:
+
+                return 1.0
+
+            # Rejection sampling needs space/estimate draws on average, each checked against the whole history
+            draws = len(colors)**board_length/max(estimate, 1.0)
+
+            if draws > engine.max_tries:
+
+                return math.inf
+
+            return draws*max(len(history), 1)
+
+        if isinstance(engine, GeneticEngine):
+
+            return float(engine.population)*engine.generations*max(len(history), 1)
+
+        return math.inf
+
+    def predict(self, engine, board_length, colors, history, candidates, estimate):
+        """Predicts the time an engine takes to choose the next guess
+
+        Args:
+            engine (Engine): Engine to predict for.
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            history (list of tuples): Pairs of guess and (exact, other) response made so far this round.
+            candidates (list of strs or None): Codes consistent with the history, or None if they are not enumerated.
+            estimate (float): Estimated number of codes consistent with the history.
+
+        Returns:
+            float: Returns predicted seconds.
+        """
+
+        calls = self.calls(engine, board_length, colors, history, candidates, estimate)
+
+        return calls*self.peg_time*board_length*self.corrections.get(engine.name, 1.0)
+
+    def update(self, engine, predicted, actual):
+        """Corrects future predictions for an engine with a measured time
+
+        Args:
+            engine (Engine): Engine that ran.
+            predicted (float): Seconds predicted before running it.
+            actual (float): Seconds it took.
+        """
+
+        if predicted <= 0 or math.isinf(predicted):
+
+            return
+
+        ratio = actual/predicted*self.corrections.get(engine.name, 1.0)
+        previous = self.corrections.get(engine.name, ratio)
+
+        self.corrections[engine.name] = (1 - self.smoothing)*previous + self.smoothing*ratio
+
+        return
+
+
+class AdaptivePlayer(Player):
+    """Mastermind Player that chooses the search engine for every guess
+
+    Engines are tried from strongest to cheapest: minimax over every code, minimax over the candidates,
+    sampling a consistent code and a genetic search. The first engine whose predicted time fits the share
+    of the remaining time available to this guess is used. Candidates are enumerated while the code space has
+    at most max_candidates codes; otherwise their number is estimated by sampling.
+
+    Round passes the time left in the round and the tournament to make_timed_guess. When make_guess is called
+    directly, the player keeps track of the round's time itself from guess_cutoff and time_cutoff.
+
+    The latest choices are kept in decisions so that they can be inspected after a tournament, and every
+    choice is counted per engine in engine_uses, so that long tournaments do not keep growing. Both and the cost
+    model are the player's learned_state, so the copies concurrent sessions play on add to the player's own. Runners
+    that play rounds in other processes drop their copies, and what those copies recorded, after every round.
+    """
+
+    def __init__(self, guess_cutoff = 100, time_cutoff = 5, max_candidates = 50000, estimate_samples = 200, safety = 0.5, max_decisions = 1000):
+        """Constructor for AdaptivePlayer
+
+        Args:
+            guess_cutoff (int, optional): Number of guesses allowed per round, used when no budget is given. Defaults to 100.
+            time_cutoff (int, optional): Amount of time in seconds allowed for the round, used when no budget is given. Defaults to 5.
+            max_candidates (int, optional): Largest code space whose candidates are enumerated. Defaults to 50000.
+            estimate_samples (int, optional): Random codes drawn to estimate the number of candidates. Defaults to 200.
+            safety (float, optional): Fraction of the per-guess time share an engine may be predicted to use. Defaults to 0.5.
+            max_decisions (int, optional): Number of latest choices kept in decisions. Defaults to 1000.
+        """
+
+        self.player_name = "Adaptive"
+        self.guess_cutoff = guess_cutoff
+        self.time_cutoff = time_cutoff
+        self.max_candidates = max_candidates
+        self.estimate_samples = estimate_samples
+        self.safety = safety
+        self.engines = [MinimaxEngine(True), MinimaxEngine(False), SamplingEngine(), GeneticEngine()]
+        self.cost_model = CostModel()
+        self.decisions = collections.deque(maxlen = max_decisions)
+        self.engine_uses = collections.Counter()
+        self.rounds = 0
+        self.history = []
+        self.candidates = None
+        self.time_used = 0
+        self.last_guess = None
+
+    def start_round(self, board_length, colors):
+        """Resets the per-round state
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+        """
+
+        self.rounds += 1
+        self.history = []
+        self.time_used = 0
+        self.last_guess = None
+
+        if len(colors)**board_length <= self.max_candidates:
+
+            self.candidates = all_codes(board_length, colors)
+
+        else:
+
+            self.candidates = None
+
+        return
+
+    def estimate_candidates(self, board_length, colors):
+        """Estimates how many codes are consistent with the history
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+
+        Returns:
+            float: Returns exact count when candidates are enumerated, otherwise a sampled estimate.
+        """
+
+        if self.candidates is not None:
+
+            return float(len(self.candidates))
+
+        space = float(len(colors))**board_length
+
+        if not self.history:
+
+            return space
+
+        hits = 0
+
+        for _ in range(self.estimate_samples):
+
+            if is_consistent(random_code(board_length, colors), self.history):
+
+                hits += 1
+
+        # With no hits the fraction is below about 1/samples; halve it rather than claim zero
+        return space*max(hits, 0.5)/self.estimate_samples
+
+    def guess_budget(self, board_length, estimate, budget):
+        """Computes the time this guess may take
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            estimate (float): Estimated number of codes consistent with the history.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            float: Returns seconds available to this guess.
+        """
+
+        remaining_time = max(budget.remaining(), 0)
+        remaining_guesses = max(budget.guesses, 1)
+
+        # Each response splits the candidates at most number_of_responses ways
+        needed = 1 + math.log(max(estimate, 1.0))/math.log(number_of_responses(board_length))
+
+        return remaining_time/min(needed, remaining_guesses)
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind, keeping track of the round's time itself
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+        """
+
+        time_used = self.time_used if last_response[2] > 0 else 0
+
+        budget = Budget(self.time_cutoff - time_used, guesses = self.guess_cutoff - last_response[2])
+
+        return self.make_timed_guess(board_length, colors, scsa, last_response, budget)
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind within the time left
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+        """
+
+        start = time.time()
+
+        if last_response[2] == 0:
+
+            self.start_round(board_length, colors)
+
+        else:
+
+            response = (last_response[0], last_response[1])
+
+            self.history.append((self.last_guess, response))
+
+            if self.candidates is not None:
+
+                before = len(self.candidates)
+
+                self.candidates = [code for code in self.candidates if feedback(self.last_guess, code) == response]
+
+                telemetry.count("feedback_calls", before)
+                telemetry.prune("candidates", before, len(self.candidates))
+
+        estimate = self.estimate_candidates(board_length, colors)
+        guess_time = self.guess_budget(board_length, estimate, budget)
+        guess = None
+
+        for engine in self.engines:
+
+            predicted = self.cost_model.predict(engine, board_length, colors, self.history, self.candidates, estimate)
+
+            # The cheapest engine always runs, even when nothing fits the budget
+            if predicted > guess_time*self.safety and engine is not self.engines[-1]:
+
+                continue
+
+            engine_start = time.perf_counter()
+            guess = engine.choose(board_length, colors, self.history, self.candidates, deadline = engine_start + guess_time*self.safety)
+            actual = time.perf_counter() - engine_start
+
+            with LEARNING_LOCK:
+
+                self.cost_model.update(engine, predicted, actual)
+
+                self.engine_uses[engine.name] += 1
+                self.decisions.append(Decision(self.rounds, last_response[2] + 1, engine.name, estimate, self.candidates is not None, guess_time, predicted, actual))
+
+            if guess is not None:
+
+                break
+
+        self.last_guess = guess
+        self.time_used += time.time() - start
+
+        return guess
+
+    def learned_state(self):
+        """Lists the objects holding what the player records across rounds
+
+        Returns:
+            list: Returns latest choices, choices per engine and the cost model.
+        """
+
+        return [self.decisions, self.engine_uses, self.cost_model]
@@ -0,0 +1,333 @@
+# File contains a player wrapper that runs a player in a worker process with hard time and memory limits
+# Run python main.py 4 6 RAM PreferFewer 100 --supervise --memory-limit 512, or wrap a player in SupervisedPlayer
+
+import multiprocessing
+import copy
+import resource
+import threading
+import time
+from player import *
+
+def supervised_worker(player, connection, memory_limit):
+    """Makes guesses for the supervisor until told to quit
+
+    Args:
+        player (Player): Player that makes the guesses.
+        connection (multiprocessing.connection.Connection): Pipe to the supervisor.
+        memory_limit (int or None): Largest address space in bytes, or None for no limit.
+    """
+
+    if memory_limit is not None:
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    while True:
+
+        try:
+
+            request = connection.recv()
+
+        except EOFError:
+
+            break
+
+        if request[0] == "quit":
+
+            break
+
+        try:
+
+            if request[0] == "answer":
+
+                player.observe_answer(request[1])
+
+                continue
+
+            arguments, limits = request[1], request[2]
+
+            # The deadline is measured again in the worker from the seconds that were left when the request was sent
+            budget = Budget(limits[0], guesses = limits[1]) if limits is not None else None
+
+            connection.send(("guess", forward_guess(player, *arguments, budget)))
+
+        except MemoryError:
+
+            # The player's state cannot be trusted after running out of memory, so the worker is replaced
+            connection.send(("limit", "memory"))
+
+            break
+
+    connection.close()
+
+    return
+
+
+class SupervisedPlayer(Player):
+    """Mastermind Player that runs another player in a worker process it can stop at any time
+
+    Each guess may take the time left in the round plus the round's buffer, as given by Round's budget. A worker
+    that does not answer by then, that runs out of memory or that dies is killed and replaced with a fresh copy of the player, and
+    make_guess raises GuessLimitExceeded so that Round scores the round as a loss. The player keeps its state in
+    the worker between rounds until the worker is replaced.
+
+    Rounds played at once are each played by a fork of the player with a worker of its own, which is kept for
+    later rounds; see ForkedSession. What the player learns stays in the worker that learned it.
+    """
+
+    fork_counters = ("recycled",)
+
+    def __init__(self, player, time_cutoff = 5, time_buffer = 0.1, memory_limit = None):
+        """Constructor for SupervisedPlayer
+
+        Args:
+            player (Player): Player to run in the worker.
+            time_cutoff (int, optional): Amount of time in seconds allowed for the round, used when no budget is given. Defaults to 5.
+            time_buffer (float, optional): Extra seconds Round allows past time_cutoff, used when no budget is given. Defaults to 0.1.
+            memory_limit (int, optional): Largest address space of the worker in bytes. Defaults to None, for no limit.
+        """
+
+        self.player = player
+        self.player_name = player.player_name
+        self.time_cutoff = time_cutoff
+        self.time_buffer = time_buffer
+        self.memory_limit = memory_limit
+        self.process = None
+        self.connection = None
+        self.time_used = 0
+        self.recycled = 0
+        self.idle_forks = [self]
+        self.forks_lock = threading.Lock()
+
+    def new_session(self):
+        """Creates the state of a new round, played by an idle fork of the player and its worker
+
+        Returns:
+            ForkedSession: Returns session that makes the guesses of one round.
+        """
+
+        return ForkedSession(self)
+
+    def fork(self):
+        """Makes a player for one session that starts a worker of its own
+
+        Returns:
+            SupervisedPlayer: Returns player with the same player and limits and no worker yet.
+        """
+
+        fork = copy.copy(self)
+
+        fork.process = None
+        fork.connection = None
+        fork.time_used = 0
+        fork.recycled = 0
+        fork.idle_forks = [fork]
+        fork.forks_lock = threading.Lock()
+
+        return fork
+
+    def start(self):
+        """Starts a worker with a fresh copy of the player if none is running
+        """
+
+        if self.process is not None:
+
+            return
+
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target = supervised_worker, args = (self.player, worker_connection, self.memory_limit), daemon = True)
+        self.process.start()
+
+        worker_connection.close()
+
+        return
+
+    def stop(self, kill = False):
+        """Stops the worker
+
+        Args:
+            kill (bool, optional): Whether to kill it instead of asking it to quit. Defaults to False.
+        """
+
+        if self.process is None:
+
+            return
+
+        if not kill:
+
+            try:
+
+                self.connection.send(("quit",))
+
+            except OSError:
+
+                pass
+
+            self.process.join(1)
+
+        if self.process.is_alive():
+
+            self.process.kill()
+            self.process.join()
+
+        self.connection.close()
+
+        self.process = None
+        self.connection = None
+
+        return
+
+    def recycle(self, reason):
+        """Kills the worker so that the next guess starts a fresh one, and reports the limit that was hit
+
+        Args:
+            reason (str): Limit that was hit.
+
+        Raises:
+            GuessLimitExceeded: Always raised, so that the round is scored as a loss.
+        """
+
+        self.stop(kill = True)
+
+        self.recycled += 1
+
+        raise GuessLimitExceeded(self.player_name + " exceeded its " + reason + " limit")
+
+    def request_guess(self, board_length, colors, scsa, last_response, budget, forward):
+        """Asks the worker for a guess and waits for it as long as the budget allows
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): Exact matches, other matches and number of guesses so far.
+            budget (Budget): Time and guesses left.
+            forward (bool): Whether the budget is passed on to the player's make_timed_guess.
+
+        Returns:
+            str: Returns guess
+
+        Raises:
+            GuessLimitExceeded: Raised if the worker ran out of time or memory, or died.
+        """
+
+        self.start()
+
+        start = time.time()
+        timeout = budget.timeout()
+
+        try:
+
+            limits = (budget.remaining(), budget.guesses) if forward else None
+
+            self.connection.send(("guess", (board_length, colors, scsa, last_response), limits))
+
+            if not self.connection.poll(timeout):
+
+                self.time_used += time.time() - start
+
+                self.recycle("time")
+
+            reply = self.connection.recv()
+
+        except (EOFError, OSError):
+
+            self.time_used += time.time() - start
+
+            self.recycle("process")
+
+        self.time_used += time.time() - start
+
+        if reply[0] == "limit":
+
+            self.recycle(reply[1])
+
+        return reply[1]
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+        """Makes a guess of the secret code for Mastermind in the worker, keeping track of the round's time itself
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+
+        Returns:
+            str: Returns guess
+
+        Raises:
+            GuessLimitExceeded: Raised if the worker ran out of time or memory, or died.
+        """
+
+        if last_response[2] == 0:
+
+            self.time_used = 0
+
+        budget = Budget(self.time_cutoff - self.time_used, buffer = self.time_buffer)
+
+        return self.request_guess(board_length, colors, scsa, last_response, budget, False)
+
+    def make_timed_guess(self, board_length, colors, scsa, last_response, budget):
+        """Makes a guess of the secret code for Mastermind in the worker, passing the budget on and stopping it once it runs out
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list of chrs): All possible colors that can be used to generate a code.
+            scsa (SCSA): SCSA used to generate secret code.
+            last_response (tuple of ints): First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess and the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess.
+            budget (Budget): Time and guesses left.
+
+        Returns:
+            str: Returns guess
+
+        Raises:
+            GuessLimitExceeded: Raised if the worker ran out of time or memory, or died.
+        """
+
+        if last_response[2] == 0:
+
+            self.time_used = 0
+
+        return self.request_guess(board_length, colors, scsa, last_response, budget, True)
+
+    def observe_answer(self, code):
+        """Passes the answer of a won round to the player in the worker
+
+        Args:
+            code (str): Answer of the round.
+        """
+
+        if self.process is not None:
+
+            try:
+
+                self.connection.send(("answer", code))
+
+            except OSError:
+
+                pass
+
+        return
+
+    def close(self):
+        """Stops the worker and the workers of the forks whose rounds are over
+        """
+
+        with self.forks_lock:
+
+            forks = self.idle_forks
+            self.idle_forks = [fork for fork in forks if fork is self]
+
+        for fork in forks:
+
+            if fork is not self:
+
+                fork.close()
+
+        self.stop()
+
+        return
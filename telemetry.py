@@ -0,0 +1,292 @@
+# File contains counters and gauges that players and engines report their search work into
+# Run python main.py 4 6 RAM PreferFewer 100 --metrics metrics.txt to print the counters and write the text export
+#
+# Reporting does nothing until a tournament turns telemetry on, so players call it unconditionally:
+#     telemetry.count("rejections")
+#     telemetry.observe("candidates_after", len(self.candidates))
+# Mastermind(..., metrics = True) closes every round and main.py --metrics writes the text export, one metric per
+# line in the Prometheus text format:
+#     mastermind_rejections_total{player="RAM",scsa="TwoColor"} 1234
+#     mastermind_rejections_per_round{player="RAM",scsa="TwoColor",stat="max"} 97
+
+import threading
+
+class Summary:
+    """Count, total, smallest and largest of the values observed for one metric
+    """
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        """Constructor for Summary
+        """
+
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        """Adds a value
+
+        Args:
+            value (num): Value to add.
+        """
+
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+        return
+
+    def mean(self):
+        """Averages the values
+
+        Returns:
+            float: Returns mean of the values, 0 if there are none.
+        """
+
+        return self.total/self.count if self.count else 0
+
+
+class Telemetry:
+    """Counters, gauges and summaries of a tournament, with counters also summarized per round
+
+    Counters add up work such as scoring calls and rejection-loop iterations. Gauges keep the latest value of
+    something, and summaries keep the count, mean, min and max of values such as candidate-set sizes and
+    pruning ratios. When a round ends, each counter's count for that round goes into a per-round summary.
+    """
+
+    def __init__(self):
+        """Constructor for Telemetry
+        """
+
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets every metric
+        """
+
+        self.counters = {}
+        self.round_counters = {}
+        self.per_round = {}
+        self.gauges = {}
+        self.summaries = {}
+        self.rounds = 0
+
+        return
+
+    def count(self, name, value = 1):
+        """Adds to a counter
+
+        Args:
+            name (str): Name of the counter (e.g. "feedback_calls").
+            value (int, optional): Amount to add. Defaults to 1.
+        """
+
+        if self.enabled:
+
+            # Rounds played in threads report at once, and the lock keeps their additions from overwriting each other
+            with self.lock:
+
+                self.round_counters[name] = self.round_counters.get(name, 0) + value
+
+        return
+
+    def gauge(self, name, value):
+        """Sets a gauge
+
+        Args:
+            name (str): Name of the gauge.
+            value (num): Latest value.
+        """
+
+        if self.enabled:
+
+            with self.lock:
+
+                self.gauges[name] = value
+
+        return
+
+    def observe(self, name, value):
+        """Adds a value to a summary
+
+        Args:
+            name (str): Name of the summary (e.g. "candidates_before").
+            value (num): Value to add.
+        """
+
+        if self.enabled:
+
+            with self.lock:
+
+                if name not in self.summaries:
+
+                    self.summaries[name] = Summary()
+
+                self.summaries[name].observe(value)
+
+        return
+
+    def prune(self, name, before, after):
+        """Records the size of a candidate set before and after a response and the fraction pruned
+
+        Args:
+            name (str): Prefix of the summaries (e.g. "candidates").
+            before (int): Number of candidates before the response.
+            after (int): Number of candidates after the response.
+        """
+
+        if self.enabled:
+
+            self.observe(name + "_before", before)
+            self.observe(name + "_after", after)
+            self.observe(name + "_pruned_ratio", 1 - after/before if before else 0)
+
+        return
+
+    def hit_rate(self, name):
+        """Computes the hit rate of a cache from its name_hits and name_misses counters
+
+        Args:
+            name (str): Name of the cache.
+
+        Returns:
+            float or None: Returns fraction of lookups that hit, or None if there were none.
+        """
+
+        hits = self.counters.get(name + "_hits", 0) + self.round_counters.get(name + "_hits", 0)
+        misses = self.counters.get(name + "_misses", 0) + self.round_counters.get(name + "_misses", 0)
+
+        return hits/(hits + misses) if hits + misses else None
+
+    def end_round(self):
+        """Adds the counters of the round to the tournament's and to the per-round summaries
+
+        Returns:
+            dict: Returns counters of the round.
+        """
+
+        with self.lock:
+
+            round_counters = self.round_counters
+
+            self.round_counters = {}
+
+        self.rounds += 1
+
+        for name in set(round_counters) | set(self.per_round):
+
+            value = round_counters.get(name, 0)
+
+            if name not in self.per_round:
+
+                # Earlier rounds that never touched the counter counted zero
+                self.per_round[name] = Summary()
+
+                for _ in range(self.rounds - 1):
+
+                    self.per_round[name].observe(0)
+
+            self.per_round[name].observe(value)
+            self.counters[name] = self.counters.get(name, 0) + value
+
+        return round_counters
+
+    def export(self, labels = {}, prefix = "mastermind_"):
+        """Formats every metric as text, one value per line
+
+        Args:
+            labels (dict, optional): Labels added to every metric, such as the player and SCSA. Defaults to {}.
+            prefix (str, optional): Prefix of every metric name. Defaults to "mastermind_".
+
+        Returns:
+            str: Returns metrics in the Prometheus text format.
+        """
+
+        def line(name, value, extra = {}):
+
+            pairs = ",".join('{}="{}"'.format(key, text) for key, text in list(labels.items()) + list(extra.items()))
+
+            return prefix + name + ("{" + pairs + "}" if pairs else "") + " " + repr(value)
+
+        lines = [line("rounds_total", self.rounds)]
+
+        for name in sorted(self.counters):
+
+            lines.append("# TYPE " + prefix + name + "_total counter")
+            lines.append(line(name + "_total", self.counters[name]))
+
+            summary = self.per_round[name]
+
+            lines.append(line(name + "_per_round", summary.mean(), {"stat": "mean"}))
+            lines.append(line(name + "_per_round", summary.max, {"stat": "max"}))
+
+        for name in sorted(self.gauges):
+
+            lines.append("# TYPE " + prefix + name + " gauge")
+            lines.append(line(name, self.gauges[name]))
+
+        for name in sorted(self.summaries):
+
+            summary = self.summaries[name]
+
+            lines.append("# TYPE " + prefix + name + " summary")
+            lines.append(line(name + "_count", summary.count))
+            lines.append(line(name + "_sum", summary.total))
+            lines.append(line(name, summary.mean(), {"stat": "mean"}))
+            lines.append(line(name, summary.min, {"stat": "min"}))
+            lines.append(line(name, summary.max, {"stat": "max"}))
+
+        for name in sorted(counter[:-len("_hits")] for counter in self.counters if counter.endswith("_hits")):
+
+            lines.append(line(name + "_hit_rate", self.hit_rate(name)))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, file_name, labels = {}):
+        """Writes the text export to a file
+
+        Args:
+            file_name (str): Name of the metrics file.
+            labels (dict, optional): Labels added to every metric. Defaults to {}.
+        """
+
+        with open(file_name, "w") as file:
+
+            file.write(self.export(labels))
+
+        return
+
+    def print_summary(self):
+        """Prints the total and per-round mean and max of every counter, then the mean and max of every summary
+        """
+
+        row = "{:<30}{:>14}{:>14}{:>14}"
+
+        print(row.format("Metric", "Total", "Mean/round", "Max/round"))
+
+        for name in sorted(self.counters):
+
+            summary = self.per_round[name]
+
+            print(row.format(name, self.counters[name], "{:.1f}".format(summary.mean()), summary.max))
+
+        if self.summaries:
+
+            print(row.format("Metric", "Count", "Mean", "Max"))
+
+        for name in sorted(self.summaries):
+
+            summary = self.summaries[name]
+
+            print(row.format(name, summary.count, "{:.3f}".format(summary.mean()), "{:.3f}".format(summary.max)))
+
+        return
+
+
+telemetry = Telemetry()
@@ -0,0 +1,30 @@
+# Makes the modules at the root of the repository importable from the tests
+# Tests marked slow take minutes and only run with python -m pytest --runslow
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def pytest_addoption(parser):
+
+    parser.addoption("--runslow", action = "store_true", help = "also run the tests marked slow")
+
+def pytest_configure(config):
+
+    config.addinivalue_line("markers", "slow: takes minutes, only run with --runslow")
+
+def pytest_collection_modifyitems(config, items):
+
+    if config.getoption("--runslow"):
+
+        return
+
+    skip = pytest.mark.skip(reason = "slow, run with --runslow")
+
+    for item in items:
+
+        if "slow" in item.keywords:
+
+            item.add_marker(skip)
@@ -0,0 +1,108 @@
+import itertools
+import math
+import random
+import pytest
+from bench import compare, holm, mann_whitney, run, smallest_p, u_distribution
+
+def exact_p(first, second):
+
+    # Share of the ways to split the pooled samples whose U is at least the observed one
+    pooled = first + second
+    observed = sum(b > a for a in first for b in second)
+    splits = list(itertools.combinations(range(len(pooled)), len(first)))
+    extreme = 0
+
+    for chosen in splits:
+
+        left = [pooled[i] for i in chosen]
+        right = [pooled[i] for i in range(len(pooled)) if i not in chosen]
+
+        extreme += sum(b > a for a in left for b in right) >= observed
+
+    return extreme/len(splits)
+
+def result(samples):
+
+    return {"samples": samples, "median": sorted(samples)[len(samples)//2]}
+
+def runs(seed, **medians):
+
+    generator = random.Random(seed)
+
+    return {"results": {name: result([median*generator.uniform(0.99, 1.01) for _ in range(10)]) for name, median in medians.items()}}
+
+def test_u_distribution_counts_every_ordering():
+
+    for n, m in [(1, 1), (3, 4), (5, 5)]:
+
+        counts = u_distribution(n, m)
+
+        assert sum(counts) == math.comb(n + m, n)
+        assert counts == counts[::-1]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mann_whitney_matches_the_exact_test(seed):
+
+    generator = random.Random(seed)
+    first = [generator.random() for _ in range(4)]
+    second = [generator.random() + 0.3 for _ in range(5)]
+
+    assert mann_whitney(first, second) == pytest.approx(exact_p(first, second))
+
+def test_mann_whitney_direction_and_ties():
+
+    assert mann_whitney([1, 2, 3], [4, 5, 6]) == pytest.approx(1/20)
+    assert mann_whitney([4, 5, 6], [1, 2, 3]) == 1.0
+    assert mann_whitney([], [1]) == 1.0
+    assert mann_whitney([1, 1, 1], [1, 1, 1]) == 1.0
+
+    # Ties use the normal approximation, which is close to the exact test for clear differences
+    assert mann_whitney([1, 1, 2, 2, 3], [4, 4, 5, 6, 6]) < 0.01
+    assert mann_whitney([1, 1, 2, 2, 3], [1, 2, 2, 3, 3]) > 0.05
+
+def test_holm_adjusts_in_order():
+
+    assert holm([0.01, 0.04, 0.03, 0.005]) == pytest.approx([0.03, 0.06, 0.06, 0.02])
+    assert holm([0.5, 0.9]) == pytest.approx([1.0, 1.0])
+    assert holm([]) == []
+    assert smallest_p(10, 10) == pytest.approx(2/math.comb(20, 10))
+
+def test_compare_calls_only_clear_changes():
+
+    baseline = runs(0, same = 1e-6, slower = 1e-6, faster = 1e-6, slight = 1e-6, dropped = 1e-6)
+    current = runs(1, same = 1e-6, slower = 2e-6, faster = 0.5e-6, slight = 1.02e-6, added = 1e-6)
+
+    rows = {row[0]: row for row in compare(baseline, current)}
+
+    assert sorted(rows) == ["faster", "same", "slight", "slower"]
+    assert rows["slower"][5] == "slower" and rows["slower"][3] == pytest.approx(2, rel = 0.05)
+    assert rows["faster"][5] == "faster"
+    assert rows["same"][5] == ""
+
+    # Two percent is below the threshold, however clear it is
+    assert rows["slight"][5] == ""
+
+def test_same_code_is_rarely_called_changed():
+
+    generator = random.Random(1)
+
+    def noisy():
+
+        return {"results": {str(i): result([generator.gauss(1, 0.1) for _ in range(10)]) for i in range(40)}}
+
+    changed = sum(1 for _ in range(20) if any(row[5] for row in compare(noisy(), noisy(), threshold = 0)))
+
+    assert changed <= 3
+
+def test_run_leaves_out_failed_and_unmatched_benchmarks():
+
+    def failing(repeat):
+
+        raise RuntimeError("cannot play")
+
+    suite = [("engine:a", lambda repeat: repeat + 1.0), ("engine:b", failing), ("player:c", lambda repeat: 1.0)]
+    baseline = run(suite, repeats = 3, pattern = "engine", verbose = False)
+
+    assert baseline["results"] == {"engine:a": {"samples": [1.0, 2.0, 3.0], "median": 2.0}}
+    assert baseline["failed"] == ["engine:b"]
+    assert baseline["repeats"] == 3
@@ -0,0 +1,102 @@
+import os
+import time
+import types
+import pytest
+from cache import ArtifactCache, source_version
+
+def module(path, source):
+
+    path.write_text(source)
+
+    loaded = types.ModuleType(path.stem)
+    loaded.__file__ = str(path)
+
+    return loaded
+
+def test_keys_depend_on_kind_and_params_not_order(tmp_path):
+
+    cache = ArtifactCache(str(tmp_path))
+
+    assert cache.key("corpus", {"a": 1, "b": 2}) == cache.key("corpus", {"b": 2, "a": 1})
+    assert cache.key("corpus", {"a": 1}) != cache.key("corpus", {"a": 2})
+    assert cache.key("corpus", {"a": 1}) != cache.key("prior", {"a": 1})
+
+def test_a_changed_source_is_a_new_version(tmp_path):
+
+    first = module(tmp_path / "first.py", "x = 1\n")
+    second = module(tmp_path / "second.py", "y = 1\n")
+    version = source_version(first, second)
+
+    assert source_version(second, first, first) == version
+
+    module(tmp_path / "first.py", "x = 2\n")
+
+    assert source_version(first, second) != version
+
+def test_fetch_builds_once_per_version(tmp_path):
+
+    cache = ArtifactCache(str(tmp_path))
+    builds = []
+
+    def build():
+
+        builds.append(1)
+
+        return {"built": len(builds)}
+
+    assert cache.fetch_pickle("model", {"version": "1"}, build) == {"built": 1}
+    assert cache.fetch_pickle("model", {"version": "1"}, build) == {"built": 1}
+    assert cache.fetch_pickle("model", {"version": "2"}, build) == {"built": 2}
+    assert cache.fetch_json("report", {"version": "1"}, build) == {"built": 3}
+    assert len(builds) == 3
+
+def test_a_failed_build_leaves_nothing_behind(tmp_path):
+
+    cache = ArtifactCache(str(tmp_path))
+
+    def build():
+
+        raise RuntimeError("build failed")
+
+    with pytest.raises(RuntimeError):
+
+        cache.fetch_pickle("model", {}, build)
+
+    assert os.listdir(str(tmp_path)) == []
+    assert cache.lookup("model", {}, ".pickle") is None
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path):
+
+    cache = ArtifactCache(str(tmp_path), max_bytes = 2500)
+
+    def writer(size):
+
+        def write(file_name):
+
+            with open(file_name, "wb") as file:
+
+                file.write(bytes(size))
+
+        return write
+
+    first = cache.fetch("blob", {"n": 1}, writer(1000))
+    second = cache.fetch("blob", {"n": 2}, writer(1000))
+
+    # Reading the first artifact makes the second the least recently used
+    past = time.time() - 10
+    os.utime(second, (past, past))
+    os.utime(first, (past - 10, past - 10))
+    assert cache.lookup("blob", {"n": 1}) == first
+
+    third = cache.fetch("blob", {"n": 3}, writer(1000))
+
+    assert sorted(path for path, _, _ in cache.entries()) == sorted([first, third])
+
+    # An artifact larger than the cache is still kept until the next one is stored
+    big = cache.fetch("blob", {"n": 4}, writer(5000))
+
+    assert [path for path, _, _ in cache.entries()] == [big]
+
+    cache.clear()
+
+    assert cache.entries() == []
@@ -0,0 +1,33 @@
+import pytest
+from corpus import Corpus, write_corpus
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+CODES = ["ABCD", "FFFF", "AEAE", "DCBA", "BBBB"]
+
+@pytest.mark.parametrize("compression", [None, "gzip", "lzma"])
+def test_codes_round_trip(tmp_path, compression):
+
+    file_name = str(tmp_path/"codes.corpus")
+
+    assert write_corpus(file_name, CODES, COLORS, scsa_name = "PreferFewer", compression = compression, chunk_size = 2) == len(CODES)
+
+    corpus = Corpus(file_name, chunk_size = 2)
+
+    try:
+
+        assert len(corpus) == len(CODES)
+        assert corpus.colors == COLORS
+        assert corpus.scsa_name == "PreferFewer"
+        assert list(corpus) == CODES
+        assert corpus[3] == CODES[3]
+
+    finally:
+
+        corpus.close()
+
+@pytest.mark.parametrize("codes", [["ABCD", "ABC"], ["ABCD", "ABCDE"], ["ABCD", "ABCZ"], ["ABCD", "ABéD"]])
+def test_invalid_codes_are_rejected(tmp_path, codes):
+
+    with pytest.raises(ValueError):
+
+        write_corpus(str(tmp_path/"codes.corpus"), codes, COLORS)
@@ -0,0 +1,123 @@
+import socket
+import threading
+import time
+from distributed import Coordinator, Tournament, receive_message, run_worker, send_message
+from parallel import ParallelMastermind
+from player import RandomFolks
+from scsa import PreferFewer
+
+def start(coordinator):
+
+    outcome = {}
+
+    def run():
+
+        try:
+
+            outcome["results"] = coordinator.run()
+
+        except RuntimeError as error:
+
+            outcome["error"] = error
+
+    thread = threading.Thread(target = run, daemon = True)
+    thread.start()
+
+    while coordinator.server is None:
+
+        time.sleep(0.01)
+
+    return thread, outcome
+
+def drop_a_chunk(port):
+
+    connection = socket.create_connection(("127.0.0.1", port))
+    stream = connection.makefile("rwb")
+
+    send_message(stream, {"type": "ready"})
+
+    message = receive_message(stream)
+
+    stream.close()
+    connection.close()
+
+    return message
+
+def expected_results(num_rounds, seed):
+
+    tournament = ParallelMastermind(4, ["A", "B", "C", "D", "E", "F"], 100, 5, 300, processes = 1, seed = seed)
+
+    return tournament.play_rounds(RandomFolks(), PreferFewer(), num_rounds)
+
+def test_workers_play_every_chunk_as_one_process_would():
+
+    coordinator = Coordinator("127.0.0.1", 0, chunk_size = 3)
+    coordinator.add_tournament(Tournament("RandomFolks", "PreferFewer", 4, 6, 10, seed = 5))
+    coordinator.add_tournament(Tournament("RandomFolks", "PreferFewer", 4, 6, 4, seed = 6))
+
+    thread, outcome = start(coordinator)
+    workers = [threading.Thread(target = run_worker, args = ("127.0.0.1", coordinator.port)) for _ in range(2)]
+
+    for worker in workers:
+
+        worker.start()
+
+    thread.join(60)
+
+    for worker in workers:
+
+        worker.join(60)
+
+    assert outcome["results"] == [expected_results(10, 5), expected_results(4, 6)]
+
+def test_a_lost_worker_s_chunk_is_played_by_another():
+
+    coordinator = Coordinator("127.0.0.1", 0, chunk_size = 2)
+    coordinator.add_tournament(Tournament("RandomFolks", "PreferFewer", 4, 6, 6, seed = 5))
+
+    thread, outcome = start(coordinator)
+
+    assert drop_a_chunk(coordinator.port)["type"] == "chunk"
+
+    assert run_worker("127.0.0.1", coordinator.port) == 3
+
+    thread.join(60)
+
+    assert outcome["results"] == [expected_results(6, 5)]
+    assert sum(coordinator.retries.values()) == 1
+
+def test_a_chunk_lost_too_often_fails_the_run():
+
+    coordinator = Coordinator("127.0.0.1", 0, chunk_size = 10, max_retries = 0)
+    coordinator.add_tournament(Tournament("RandomFolks", "PreferFewer", 4, 6, 5))
+
+    thread, outcome = start(coordinator)
+
+    drop_a_chunk(coordinator.port)
+
+    thread.join(60)
+
+    assert isinstance(outcome["error"], RuntimeError)
+
+def test_worker_exits_cleanly_when_the_coordinator_is_gone():
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def close_at_once():
+
+        connection, _ = listener.accept()
+        connection.close()
+
+    thread = threading.Thread(target = close_at_once)
+    thread.start()
+
+    try:
+
+        assert run_worker("127.0.0.1", listener.getsockname()[1]) == 0
+
+    finally:
+
+        thread.join()
+        listener.close()
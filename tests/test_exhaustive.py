@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import pytest
+from exhaustive import ExhaustiveEvaluation, repository_imports
+from player import RAM
+from scsa import PreferFewer
+
+COLORS = ["A", "B", "C"]
+
+def outcomes(report):
+
+    return [(code, result, guesses) for code, result, guesses, _ in report["per_code"]]
+
+def test_every_code_is_played_once():
+
+    report = ExhaustiveEvaluation(3, COLORS, processes = 1, cache_dir = None).evaluate(RAM(), PreferFewer())
+
+    assert report["codes"] == 27
+    assert sorted(code for code, _, _ in outcomes(report)) == sorted(PreferFewer().code_space(3, COLORS))
+    assert sum(report["results"].values()) == 27
+    assert sum(report["distribution"].values()) == report["results"]["win"]
+    assert report["worst"] == max(int(guesses) for guesses in report["distribution"])
+    assert report["mean"] == pytest.approx(sum(guesses for _, result, guesses in outcomes(report) if result == "win")/report["results"]["win"])
+
+def test_reports_do_not_depend_on_process_count():
+
+    one = ExhaustiveEvaluation(3, COLORS, processes = 1, cache_dir = None).evaluate(RAM(), PreferFewer())
+    two = ExhaustiveEvaluation(3, COLORS, processes = 2, cache_dir = None).evaluate(RAM(), PreferFewer())
+
+    assert outcomes(one) == outcomes(two)
+    assert one["expected"] == pytest.approx(two["expected"])
+
+def test_reports_are_cached_per_configuration(tmp_path, monkeypatch):
+
+    evaluation = ExhaustiveEvaluation(3, COLORS, processes = 1, cache_dir = str(tmp_path))
+    report = evaluation.evaluate(RAM(), PreferFewer())
+
+    def play_all(*args):
+
+        raise AssertionError("cached report was played again")
+
+    monkeypatch.setattr(ExhaustiveEvaluation, "play_all", play_all)
+
+    assert evaluation.evaluate(RAM(), PreferFewer()) == report
+
+    # Any change to the configuration or to the player's settings is a new report
+    with pytest.raises(AssertionError):
+
+        ExhaustiveEvaluation(3, COLORS, processes = 1, seed = 1, cache_dir = str(tmp_path)).evaluate(RAM(), PreferFewer())
+
+    player = RAM()
+    player.player_name = "Other"
+
+    with pytest.raises(AssertionError):
+
+        evaluation.evaluate(player, PreferFewer())
+
+def test_the_fingerprint_does_not_depend_on_what_else_is_loaded():
+
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def fingerprint(imports):
+
+        script = imports + "from exhaustive import code_version\nfrom player import RAM\nprint(code_version(RAM()))"
+
+        return subprocess.run([sys.executable, "-c", script], cwd = repository, capture_output = True, text = True, check = True).stdout
+
+    assert fingerprint("") == fingerprint("import grid, oracle, server\n")
+
+    names = [os.path.basename(path) for path in repository_imports(os.path.join(repository, "player.py"))]
+
+    assert "scsa.py" in names and "grid.py" not in names
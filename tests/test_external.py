@@ -0,0 +1,143 @@
+import ast
+import io
+import os
+import sys
+from external import ExternalPlayer, command_name, decode_request, encode_request, play_round_async, run, serve
+from mastermind import Budget, Mastermind, Round
+from player import Player
+from scsa import PreferFewer
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+class Echo(Player):
+
+    def __init__(self):
+
+        self.answers = []
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        return colors[last_response[2]]*board_length
+
+    def observe_answer(self, code):
+
+        self.answers.append(code)
+
+def script(source):
+
+    return [sys.executable, "-c", source]
+
+def play(player, answer = "AABB"):
+
+    round = Round(4, COLORS, answer, PreferFewer(), time_cutoff = 2)
+
+    return run(play_round_async(round, player)), round
+
+def test_requests_round_trip():
+
+    budget = Budget(1.5, guesses = 7)
+    fields = encode_request(4, COLORS, PreferFewer(), (1, 2, 3), budget).split()
+
+    board_length, colors, scsa, last_response, decoded = decode_request(fields)
+
+    assert (board_length, colors, scsa.name, last_response) == (4, COLORS, "PreferFewer", (1, 2, 3))
+    assert decoded.guesses == 7 and 0 < decoded.remaining() <= 1.5
+    assert decode_request(encode_request(4, COLORS, PreferFewer(), (0, 0, 0)).split())[4] is None
+
+def test_served_players_are_named_after_the_player():
+
+    assert command_name([sys.executable, "external.py", "serve", "RAM"]) == "external-RAM"
+    assert command_name([sys.executable, "-m", "bot"]) == "bot"
+    assert command_name(["/usr/bin/solver", "--fast"]) == "solver"
+
+def test_serve_answers_until_quit():
+
+    player = Echo()
+    requests = io.StringIO("guess 4 ABCDEF PreferFewer 0 0 0\n\nanswer AAAA\nquit\nguess 4 ABCDEF PreferFewer 0 0 1\n")
+    replies = io.StringIO()
+
+    serve(player, requests, replies)
+
+    assert replies.getvalue() == "AAAA\n"
+    assert player.answers == ["AAAA"]
+
+def test_a_served_player_wins_and_quits():
+
+    player = ExternalPlayer([sys.executable, os.path.join(REPOSITORY, "external.py"), "serve", "RAM"])
+
+    try:
+
+        (result, guesses), _ = play(player)
+
+        assert result == "win" and guesses >= 1
+
+    finally:
+
+        player.close()
+
+    assert player.process.returncode == 0
+
+def test_an_exited_process_sends_an_empty_guess():
+
+    player = ExternalPlayer(script("pass"))
+
+    try:
+
+        (result, guesses), _ = play(player)
+
+    finally:
+
+        player.close()
+
+    assert (result, guesses) == ("failure", 1)
+
+    # The next round starts a new process
+    assert run(player.request_guess(4, COLORS, PreferFewer(), (0, 0, 0))) == ""
+    assert player.restarts == 1
+
+def test_a_silent_process_is_killed_and_loses():
+
+    player = ExternalPlayer(script("import time; time.sleep(60)"))
+
+    try:
+
+        (result, guesses), round = play(player)
+
+    finally:
+
+        player.close()
+
+    assert (result, guesses) == ("loss", 1)
+    assert round.time_used <= round.time_cutoff + round.time_buffer + 1
+    assert player.process.returncode is not None
+
+def test_a_played_player_plays_concurrent_rounds(capsys):
+
+    player = ExternalPlayer([sys.executable, os.path.join(REPOSITORY, "external.py"), "serve", "RAM"])
+    mastermind = Mastermind(4, COLORS, 100, 60, 600)
+
+    try:
+
+        mastermind.play_tournament(player, PreferFewer(), 2)
+
+        process = player.process
+
+        mastermind.play_concurrent_tournament(player, PreferFewer(), 8, 3)
+
+        lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Results: ")]
+
+        assert [ast.literal_eval(line[len("Results: "):])["win"] for line in lines] == [2, 8]
+
+        # The player's own process is shared with one of the sessions, and every fork keeps its own
+        assert player.process is process and process.returncode is None
+        assert 1 < len(player.idle_forks) <= 3
+        assert len({fork.process.pid for fork in player.idle_forks}) == len(player.idle_forks)
+
+        forks = list(player.idle_forks)
+
+    finally:
+
+        player.close()
+
+    assert all(fork.process.returncode is not None for fork in forks)
@@ -0,0 +1,41 @@
+from grid import Grid, leaderboard
+
+def cell(player, wins, losses, failures, mean_guesses):
+
+    results = {"win": wins, "loss": losses, "failure": failures}
+
+    return {"player": player, "results": results, "score": 5*wins - 2*failures, "mean_guesses": mean_guesses}
+
+def test_leaderboard_sums_the_cells_of_every_player():
+
+    cells = [cell("RAM", 10, 0, 0, 4.0), cell("Prior", 8, 2, 0, 5.0), cell("RAM", 0, 0, 1, None), cell("Prior", 2, 0, 0, 2.0), cell("Boring", 0, 5, 0, None)]
+
+    assert leaderboard(cells) == [("Prior", 50, 10, 2, 0, 4.4), ("RAM", 48, 10, 0, 1, 4.0), ("Boring", 0, 0, 5, 0, None)]
+
+    # Equal scores are ranked by fewer guesses per win
+    assert [row[0] for row in leaderboard([cell("Slow", 4, 0, 0, 6.0), cell("Fast", 4, 0, 0, 3.0)])] == ["Fast", "Slow"]
+
+def test_a_cell_stops_at_its_first_failure():
+
+    grid = Grid(["RAM"], ["PreferFewer"], [(4, 6)], num_rounds = 6, chunk_size = 3)
+    chunks = {(0, 1): [(1, "win", 3, 0.1), (2, "failure", 1, 0.1)], (0, 4): [(4, "win", 4, 0.1), (5, "win", 5, 0.1), (6, "win", 6, 0.1)]}
+
+    merged = grid.merge(0, chunks)
+
+    assert merged["results"] == {"win": 1, "loss": 0, "failure": 1}
+    assert merged["score"] == 3
+    assert merged["mean_guesses"] == 3
+
+def test_players_that_do_not_learn_or_time_themselves_give_the_same_cells_with_any_number_of_processes():
+
+    # RandomFolks draws its guesses from the random module, which every round seeds from the grid's seed
+    def cells(processes):
+
+        grid = Grid(["RAM", "RandomFolks"], ["PreferFewer", "TwoColor"], [(4, 6)], num_rounds = 12, seed = 1, round_time_cutoff = 60, processes = processes, chunk_size = 3)
+
+        return [{key: value for key, value in result.items() if key != "time"} for result in grid.run()]
+
+    single = cells(1)
+
+    assert single == cells(3)
+    assert all(result["results"]["win"] == 12 for result in single if result["player"] == "RAM")
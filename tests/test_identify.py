@@ -0,0 +1,51 @@
+import random
+from identify import SCSAClassifier
+from mastermind import Round
+from scsa import InsertColors, OnlyOnce
+from registry import player_by_name
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+def test_identifying_player_wins_against_unnamed_scsa():
+
+    random.seed(0)
+
+    scsa = InsertColors()
+    scsa.name = ""
+    player = player_by_name("Identifying")
+
+    for code in scsa.generate_codes(4, COLORS, 20):
+
+        result, _ = Round(4, COLORS, code, scsa, 100, 60).play_round(player, 600)
+
+        assert result == "win"
+
+    # Uniform codes are told apart from narrower SCSAs, and RAM, which has no strategy for them, keeps the fallback
+    assert player.classifier.decision().name == "InsertColors"
+    assert player.target(4, COLORS, scsa, (0, 0, 0)).name == "PreferFewer"
+
+def test_classifier_waits_for_enough_rounds():
+
+    classifier = SCSAClassifier(4, COLORS, [InsertColors(), OnlyOnce()], min_rounds = 5)
+
+    # Codes without repeated colors fit OnlyOnce better than uniform codes, but a few of them do not decide it
+    for code in ["ABCD", "CDEF", "FACE", "BEAD"]:
+
+        classifier.observe(code)
+
+        assert classifier.decision() is None
+
+    for code in ["ABCF", "DEAB", "EFCA"]:
+
+        classifier.observe(code)
+
+    assert classifier.decision().name == "OnlyOnce"
+
+    # A code OnlyOnce cannot generate costs it the floor probability, which one such code does not outweigh
+    classifier.observe("AAAA")
+
+    assert classifier.decision() is None
+
+    classifier.observe("ABAB")
+
+    assert classifier.decision().name == "InsertColors"
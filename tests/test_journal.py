@@ -0,0 +1,112 @@
+import json
+import threading
+import pytest
+from journal import JournaledMastermind
+from player import RAM
+from scsa import PreferFewer
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+class Interrupted(RAM):
+
+    def __init__(self, guesses):
+
+        super().__init__()
+
+        self.guesses = guesses
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        self.guesses -= 1
+
+        if self.guesses < 0:
+
+            raise KeyboardInterrupt
+
+        return super().make_guess(board_length, colors, scsa, last_response)
+
+class Unpicklable(RAM):
+
+    def __init__(self):
+
+        super().__init__()
+
+        self.lock = threading.Lock()
+        self.answers = []
+
+    def observe_answer(self, code):
+
+        self.answers.append(code)
+
+def records(path):
+
+    with open(path) as file:
+
+        return [json.loads(line) for line in file]
+
+def rounds(path):
+
+    return [(record["round"], record["code"], record["result"], record["guesses"]) for record in records(path) if record["type"] == "round"]
+
+def test_resumed_tournament_plays_the_same_rounds(tmp_path):
+
+    whole = str(tmp_path/"whole.jsonl")
+    cut = str(tmp_path/"cut.jsonl")
+
+    JournaledMastermind(4, COLORS, journal_path = whole, seed = 3, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 10)
+
+    # An interrupted run: six rounds, then a partial line from a crash mid-write
+    JournaledMastermind(4, COLORS, journal_path = cut, seed = 3, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 6)
+
+    with open(cut, "a") as file:
+
+        file.write('{"type": "round", "round": 7, "co')
+
+    results = JournaledMastermind(4, COLORS, journal_path = cut, seed = 3, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 10, resume = True)
+
+    assert results == {"win": 10, "loss": 0, "failure": 0}
+    assert rounds(cut) == rounds(whole)
+
+def test_journal_of_another_tournament_is_not_resumed(tmp_path):
+
+    path = str(tmp_path/"journal.jsonl")
+
+    JournaledMastermind(4, COLORS, journal_path = path, seed = 3, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 2)
+
+    with pytest.raises(ValueError):
+
+        JournaledMastermind(4, COLORS, journal_path = path, seed = 4, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 4, resume = True)
+
+def test_run_interrupted_mid_round_is_resumed(tmp_path):
+
+    whole = str(tmp_path/"whole.jsonl")
+    cut = str(tmp_path/"cut.jsonl")
+
+    JournaledMastermind(4, COLORS, journal_path = whole, seed = 3, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 10)
+
+    with pytest.raises(KeyboardInterrupt):
+
+        JournaledMastermind(4, COLORS, journal_path = cut, seed = 3, flush_interval = 0).play_rounds(Interrupted(25), PreferFewer(), 10)
+
+    assert 0 < len(rounds(cut)) < 10
+
+    results = JournaledMastermind(4, COLORS, journal_path = cut, seed = 3, flush_interval = 0).play_rounds(RAM(), PreferFewer(), 10, resume = True)
+
+    assert results == {"win": 10, "loss": 0, "failure": 0}
+    assert rounds(cut) == rounds(whole)
+
+def test_unpicklable_player_keeps_every_round_and_sees_their_answers(tmp_path):
+
+    path = str(tmp_path/"journal.jsonl")
+
+    JournaledMastermind(4, COLORS, journal_path = path, seed = 3, flush_interval = 0).play_rounds(Unpicklable(), PreferFewer(), 4)
+
+    player = Unpicklable()
+    results = JournaledMastermind(4, COLORS, journal_path = path, seed = 3, flush_interval = 0).play_rounds(player, PreferFewer(), 8, resume = True)
+
+    assert results == {"win": 8, "loss": 0, "failure": 0}
+    assert player.answers == [code for _, code, _, _ in rounds(path)]
+
+    # The end record of the first run is dropped, so the journal reads as one run
+    assert [record["type"] for record in records(path)] == ["tournament"] + ["round"]*8 + ["end"]
+    assert [number for number, _, _, _ in rounds(path)] == list(range(1, 9))
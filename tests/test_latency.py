@@ -0,0 +1,97 @@
+import math
+import random
+import pytest
+from latency import LatencyHistogram, LatencyRecorder
+from mastermind import Mastermind, Round
+from player import RAM
+from scsa import PreferFewer
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+def exact_percentile(durations, fraction):
+
+    ordered = sorted(durations)
+
+    return ordered[math.ceil(fraction*len(ordered)) - 1]
+
+def test_percentiles_are_within_the_bucket_width():
+
+    generator = random.Random(0)
+    durations = [int(generator.lognormvariate(12, 2)) + 1 for _ in range(10000)]
+    histogram = LatencyHistogram()
+
+    for duration in durations:
+
+        histogram.record(duration)
+
+    for fraction in (0.5, 0.9, 0.99):
+
+        exact = exact_percentile(durations, fraction)
+
+        assert exact <= histogram.percentile(fraction) <= exact*1.1
+
+    assert histogram.percentile(1) == max(durations)
+    assert len(histogram.counts) < 300
+
+def test_empty_and_zero_durations():
+
+    histogram = LatencyHistogram()
+
+    assert histogram.summary()["p99"] == 0
+
+    histogram.record(0)
+
+    assert histogram.percentile(0.5) == 0
+    assert histogram.summary()["count"] == 1
+
+def test_merged_histograms_equal_one_histogram():
+
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+
+    for duration in range(1, 1000, 7):
+
+        whole.record(duration)
+        (first if duration % 2 else second).record(duration)
+
+    first.merge(second)
+
+    assert (first.counts, first.count, first.total, first.max) == (whole.counts, whole.count, whole.total, whole.max)
+
+def test_rounds_record_every_guess_and_response():
+
+    recorder = LatencyRecorder()
+    result, guesses = Round(4, COLORS, "ABCD", PreferFewer(), latency = recorder).play_round(RAM())
+
+    assert result == "win"
+
+    summary = recorder.summary()
+
+    for operation in ("make_guess", "respond_to_guess"):
+
+        assert summary[operation]["overall"]["count"] == guesses
+        assert summary[operation]["scsa"]["PreferFewer"]["count"] == guesses
+        assert list(summary[operation]["guess"]) == list(range(1, guesses + 1))
+
+    assert recorder.end_round()["make_guess"]["count"] == guesses
+    assert recorder.end_round()["make_guess"]["count"] == 0
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_tournaments_merge_every_round(concurrent):
+
+    mastermind = Mastermind(4, COLORS, latency = True)
+
+    if concurrent:
+
+        mastermind.play_concurrent_tournament(RAM(), PreferFewer(), 8, 4)
+
+    else:
+
+        mastermind.play_tournament(RAM(), PreferFewer(), 8)
+
+    summary = mastermind.latency.summary()
+    guesses = summary["make_guess"]["overall"]["count"]
+
+    assert guesses >= 8
+    assert summary["respond_to_guess"]["overall"]["count"] == guesses
+    assert summary["make_guess"]["guess"][1]["count"] == 8
+    assert sum(histogram["count"] for histogram in summary["make_guess"]["guess"].values()) == guesses
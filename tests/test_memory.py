@@ -0,0 +1,92 @@
+import tracemalloc
+import pytest
+from mastermind import Mastermind
+from memory import MemoryRecorder, format_bytes
+from player import RAM
+from scsa import PreferFewer
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+class Leaky(RAM):
+
+    kept = []
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        Leaky.kept.append(bytearray(10000))
+
+        return super().make_guess(board_length, colors, scsa, last_response)
+
+def play(player):
+
+    mastermind = Mastermind(4, COLORS, latency = True, metrics = True, memory = "tracemalloc")
+
+    mastermind.play_tournament(player, PreferFewer(), 20)
+
+    return mastermind.memory.summary()
+
+def test_a_player_that_keeps_every_round_is_flagged():
+
+    summary = play(Leaky())
+
+    assert summary["rounds"] == 20
+    assert summary["growing"]
+    assert summary["end"] - summary["start"] >= 20*10000
+
+def test_the_instrumentation_is_not_counted_as_growth():
+
+    summary = play(RAM())
+
+    assert not summary["growing"]
+    assert summary["end"] - summary["start"] < 20*10000
+    assert not tracemalloc.is_tracing()
+
+def test_rounds_record_peak_and_retained_memory():
+
+    recorder = MemoryRecorder(min_rounds = 3)
+    kept = []
+
+    recorder.start()
+
+    try:
+
+        for _ in range(3):
+
+            kept.append(bytearray(100000))
+            bytearray(1000000)
+
+            record = recorder.end_round()
+
+            assert record["retained"] >= 100000
+            assert record["peak"] >= 1000000
+
+        assert recorder.growing()
+        assert any(line.startswith("test_memory.py:") for line, _ in recorder.top_growth())
+
+    finally:
+
+        recorder.stop()
+
+    assert not tracemalloc.is_tracing()
+
+def test_resident_mode_has_no_peak():
+
+    recorder = MemoryRecorder("rss")
+
+    recorder.start()
+
+    record = recorder.end_round()
+
+    assert record["current"] > 0 and record["peak"] is None
+    assert recorder.summary()["max_peak"] is None
+    assert recorder.top_growth() == []
+
+    with pytest.raises(ValueError):
+
+        MemoryRecorder("heap")
+
+def test_format_bytes():
+
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(-2048) == "-2.0 KiB"
+    assert format_bytes(3*1024**3) == "3.0 GiB"
@@ -0,0 +1,104 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from fractions import Fraction
+import pytest
+from cache import ArtifactCache
+from oracle import Oracle
+
+def colors(num_colors):
+
+    return [chr(i) for i in range(65,91)][:num_colors]
+
+# Optimal total guesses over every code and optimal worst case, checked against a plain minimax search
+SMALL_BOARDS = [(3, 3, 73, 4), (3, 4, 206, 4)]
+
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("board_length, num_colors, total, worst", SMALL_BOARDS)
+def test_small_board_optima(board_length, num_colors, total, worst, processes):
+
+    cost, _ = Oracle(board_length, colors(num_colors), objective = "expected").solve_root(processes)
+
+    assert cost == total
+
+    cost, _ = Oracle(board_length, colors(num_colors), objective = "worst").solve_root(processes)
+
+    assert cost == worst
+
+def test_options_of_a_single_code():
+
+    oracle = Oracle(3, colors(3))
+
+    options = oracle.options((5,), frozenset(oracle.colors))
+
+    assert options
+    assert all(isinstance(responses, tuple) and len(responses) == 1 for _, _, responses in options)
+
+@pytest.mark.parametrize("objective", ["expected", "worst"])
+def test_parallel_solution_is_kept_for_the_policy_and_cache(tmp_path, objective):
+
+    oracle = Oracle(3, colors(4), objective = objective)
+    cost, guess = oracle.solve_cached(ArtifactCache(str(tmp_path)), 2)
+    root = tuple(range(len(oracle.codes)))
+
+    assert oracle.canonical(root)[0] in oracle.memo
+
+    oracle.nodes = 0
+
+    assert oracle.solve(root)[0] == cost
+    assert oracle.policy()[()] is not None
+    assert oracle.nodes == 0
+
+    loaded = Oracle(3, colors(4), objective = objective)
+
+    assert loaded.solve_cached(ArtifactCache(str(tmp_path))) == (cost, guess)
+    assert loaded.solve(root)[0] == cost
+    assert loaded.nodes == 0
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason = "shared memory blocks are not files here")
+def test_a_terminated_solve_frees_its_shared_table():
+
+    before = set(os.listdir("/dev/shm"))
+    oracle = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "oracle.py")
+    process = subprocess.Popen([sys.executable, oracle, "5", "5", "--objective", "worst", "--processes", "2", "--no-cache"], stdout = subprocess.DEVNULL)
+
+    try:
+
+        deadline = time.time() + 60
+
+        while not set(os.listdir("/dev/shm")) - before and time.time() < deadline:
+
+            time.sleep(0.05)
+
+        created = set(os.listdir("/dev/shm")) - before
+
+        assert created
+
+        process.send_signal(signal.SIGTERM)
+
+        assert process.wait(30) == 128 + signal.SIGTERM
+
+    finally:
+
+        process.kill()
+        process.wait()
+
+    assert not created & set(os.listdir("/dev/shm"))
+
+@pytest.mark.slow
+def test_classic_board_expected_optimum():
+
+    oracle = Oracle(4, colors(6), objective = "expected")
+
+    cost, _ = oracle.solve_root()
+
+    assert Fraction(cost, len(oracle.codes)) == Fraction(5625, 1296)
+
+@pytest.mark.slow
+def test_classic_board_worst_case_optimum():
+
+    cost, _ = Oracle(4, colors(6), objective = "worst").solve_root(2)
+
+    assert cost == 5
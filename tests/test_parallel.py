@@ -0,0 +1,74 @@
+from identify import IdentifyingPlayer
+from mastermind import Mastermind
+from parallel import ParallelMastermind, play_seeded_round, learns_across_rounds
+from prior import PriorPlayer
+from player import Boring, RAM, RandomFolks
+from scsa import PreferFewer
+from sharedmem import SharedCodes
+
+def test_learning_rounds_are_played_by_the_player_itself():
+
+    colors = ["A", "B", "C", "D", "E", "F"]
+    scsa = PreferFewer()
+    copied = PriorPlayer()
+    learning = PriorPlayer()
+
+    for index, code in enumerate(["AABB", "CCCD", "EEFF"], start = 1):
+
+        play_seeded_round(4, colors, 100, 60, copied, scsa, 0, index, code)
+        play_seeded_round(4, colors, 100, 60, learning, scsa, 0, index, code, learn = True)
+
+    assert copied.priors == {}
+    assert learning.priors[(4, tuple(colors))].observed == 3
+
+def test_learners_are_told_apart():
+
+    assert learns_across_rounds(PriorPlayer())
+    assert not learns_across_rounds(RAM())
+
+def test_learners_keep_what_their_sessions_learn():
+
+    colors = ["A", "B", "C", "D", "E", "F"]
+    prior = PriorPlayer()
+    identifying = IdentifyingPlayer(PriorPlayer(), fallback = PreferFewer())
+
+    for player in [prior, identifying]:
+
+        Mastermind(4, colors, 100, 60, 600).play_concurrent_tournament(player, PreferFewer(), 20, 4)
+
+    assert prior.priors[(4, tuple(colors))].observed == 20
+    assert prior.prior is None
+    assert identifying.classifiers[(4, tuple(colors), "PreferFewer")].observed == 20
+    assert identifying.player.priors[(4, tuple(colors))].observed == 20
+
+def rounds(processes, seed, codes = None):
+
+    tournament = ParallelMastermind(4, ["A", "B", "C", "D", "E", "F"], 100, 60, 600, processes = processes, seed = seed, chunk_size = 3)
+
+    tournament.play_rounds(RandomFolks(), PreferFewer(), 12, codes)
+
+    return [(index, result, guesses) for index, result, guesses, _ in tournament.round_results]
+
+def test_results_do_not_depend_on_the_number_of_processes():
+
+    one = rounds(1, 7)
+
+    assert [index for index, _, _ in one] == list(range(1, 13))
+    assert rounds(2, 7) == one
+    assert rounds(3, 7) == one
+    assert rounds(1, 8) != one
+
+def test_shared_codes_are_played_in_order():
+
+    codes = SharedCodes(["AAAA", "ABCD", "BBBB", "ABCD"], ["A", "B", "C", "D", "E", "F"], 4)
+
+    try:
+
+        tournament = ParallelMastermind(4, ["A", "B", "C", "D", "E", "F"], 100, 60, 600, processes = 2, chunk_size = 1)
+
+        assert tournament.play_rounds(Boring(), PreferFewer(), len(codes), codes) == {"win": 2, "loss": 2, "failure": 0}
+        assert [(index, result) for index, result, _, _ in tournament.round_results] == [(1, "win"), (2, "loss"), (3, "win"), (4, "loss")]
+
+    finally:
+
+        codes.unlink()
@@ -0,0 +1,58 @@
+import math
+import threading
+import time
+import pytest
+from player import Budget, Player, TIME_MARGIN, anytime, copy_player
+
+def test_budget_deadline_is_the_nearer_limit():
+
+    budget = Budget(round_time = 2.0, tournament_time = 0.5, guesses = 10, buffer = 0.1)
+
+    assert 0.4 < budget.remaining() <= 0.5
+    assert 0.5 < budget.timeout() <= 0.5 + 0.1 + TIME_MARGIN
+
+def test_budget_without_limits_never_runs_out():
+
+    budget = Budget()
+
+    assert budget.remaining() == math.inf
+    assert budget.guesses == math.inf
+
+def test_timeout_of_a_spent_budget_is_the_buffer_and_margin():
+
+    budget = Budget(round_time = 0, buffer = 0.2)
+
+    assert budget.remaining() <= 0
+    assert budget.timeout() == 0.2 + TIME_MARGIN
+
+def test_anytime_without_deadline_runs_every_step():
+
+    assert anytime(iter([1, 2, 3])) == 3
+    assert anytime(iter([])) is None
+
+def test_anytime_stops_before_a_step_that_would_miss_the_deadline():
+
+    taken = []
+
+    def steps():
+
+        for step in range(100):
+
+            time.sleep(0.01)
+            taken.append(step)
+
+            yield step
+
+    result = anytime(steps(), time.perf_counter() + 0.1)
+
+    assert result == taken[-1]
+    assert 1 <= len(taken) < 10
+
+def test_a_player_that_cannot_be_copied_says_so():
+
+    player = Player()
+    player.lock = threading.Lock()
+
+    with pytest.raises(TypeError, match = "Player cannot be copied for a session"):
+
+        copy_player(player)
@@ -0,0 +1,102 @@
+import random
+import pytest
+from cache import ArtifactCache
+from mastermind import Mastermind, Round
+from prior import CodePrior, CodeRanking, PriorPlayer
+from scsa import ABColor, PreferFewer
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+def play(player, codes):
+
+    guesses = []
+
+    for code in codes:
+
+        result, count = Round(4, COLORS, code, ABColor(), 100, 60).play_round(player, 600)
+
+        assert result == "win"
+
+        guesses.append(count)
+
+    return guesses
+
+def test_learning_shortens_games_against_a_biased_scsa():
+
+    random.seed(0)
+
+    codes = ABColor().generate_codes(4, COLORS, 30)
+    learning = play(PriorPlayer(), codes)
+    uniform = play(PriorPlayer(learn = False), codes)
+
+    assert sum(learning[15:]) < sum(uniform[15:])
+
+def test_without_learning_the_prior_stays_uniform():
+
+    random.seed(0)
+
+    player = PriorPlayer(learn = False)
+
+    play(player, ABColor().generate_codes(4, COLORS, 5))
+
+    assert player.priors[(4, tuple(COLORS))].observed == 0
+    assert len(set(player.rankings[(4, tuple(COLORS))].log_weights)) == 1
+
+def test_learned_ranking_matches_a_fresh_one():
+
+    random.seed(0)
+
+    prior = CodePrior(4, COLORS)
+    ranking = CodeRanking(prior)
+
+    for code in PreferFewer().generate_codes(4, COLORS, 50):
+
+        ranking.observe(code)
+
+    fresh = CodeRanking(prior)
+
+    # Learning leaves out the amount every code gets, so the log-weights differ from a fresh ranking's by a constant
+    offsets = [learned - scored for learned, scored in zip(ranking.log_weights, fresh.log_weights)]
+
+    assert max(offsets) - min(offsets) < 1e-9
+    assert ranking.weights(ranking.likeliest(ranking.codes, 50)) == pytest.approx(fresh.weights(fresh.likeliest(fresh.codes, 50)))
+
+def test_likeliest_keeps_the_given_order_of_ties():
+
+    ranking = CodeRanking(CodePrior(4, COLORS))
+
+    assert ranking.likeliest(ranking.codes, 3) == ["AAAA", "AAAB", "AAAC"]
+
+    ranking.observe("FEDC")
+
+    assert ranking.likeliest(ranking.codes, 1) == ["FEDC"]
+    assert ranking.likeliest(["ABCD", "FAAA", "FEDA"], 2) == ["FEDA", "ABCD"]
+    assert ranking.likeliest(["BCDE", "ABCD"], 2) == ["BCDE", "ABCD"]
+    assert ranking.weights(["FEDC", "AAAA"])[0] == 1.0
+
+def test_tournaments_pretrain_the_model_before_the_first_round(tmp_path):
+
+    random.seed(0)
+
+    class Recording(PriorPlayer):
+
+        rounds = 0
+        pretrained_in_round = None
+
+        def start_round(self, board_length, colors, scsa = None):
+
+            self.rounds += 1
+
+            return super().start_round(board_length, colors, scsa)
+
+        def pretrained(self, board_length, colors, scsa):
+
+            self.pretrained_in_round = self.rounds
+
+            return super().pretrained(board_length, colors, scsa)
+
+    player = Recording(pretrain = 200, cache = ArtifactCache(str(tmp_path)))
+    Mastermind(4, COLORS, 100, 60, 600).play_tournament(player, ABColor(), 3)
+
+    assert player.pretrained_in_round == 0 and player.rounds == 3
+    assert player.priors[(4, tuple(COLORS))].observed >= 200
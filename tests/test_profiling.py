@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import pytest
+from profiling import Profiler, category
+from scsa import PreferFewer
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main(directory, *arguments):
+
+    return subprocess.run([sys.executable, os.path.join(REPOSITORY, "main.py"), *arguments], cwd = directory, capture_output = True, text = True, timeout = 120)
+
+def test_categories():
+
+    assert category(os.path.join(REPOSITORY, "player.py"), "make_guess") == "player"
+    assert category(os.path.join(REPOSITORY, "mastermind.py"), "play_round") == "engine"
+    assert category(os.path.join(REPOSITORY, "scsa.py"), "generate_code") == "scsa"
+    assert category(os.path.join(REPOSITORY, "mastermind.py"), "feedback") is None
+    assert category(os.path.join(REPOSITORY, "memory.py"), "end_round") is None
+    assert category(os.__file__, "join") is None
+    assert category("~", "<built-in method time.sleep>") is None
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_library_time_goes_to_its_caller(mode):
+
+    profiler = Profiler(mode, interval = 0.001)
+
+    profiler.start()
+    PreferFewer().generate_codes(6, ["A", "B", "C", "D", "E", "F", "G", "H"], 30000)
+    profiler.stop()
+
+    times = profiler.attribution()
+
+    # Most of generate_code's time is spent in the random module, which counts as SCSA generation
+    assert times["scsa"] > 0.9*sum(times.values())
+    assert any("generate_code" in line and "random.py" in line for line in profiler.collapsed())
+    assert "SCSA generation" in profiler.report("Profile")
+
+    with pytest.raises(ValueError):
+
+        Profiler("trace")
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_main_writes_the_profile(tmp_path, mode):
+
+    completed = main(str(tmp_path), "4", "6", "RAM", "PreferFewer", "5", "--profile", mode, "--profile-prefix", "run", "--latency", "--memory", "rss")
+
+    assert completed.returncode == 0, completed.stderr
+
+    output = (tmp_path / "RAM.txt").read_text()
+    expected = ["run-RAM.txt", "run-RAM.collapsed"] + (["run-RAM.prof"] if mode == "cprofile" else [])
+
+    assert "Profile: " + ", ".join(expected) in output
+    assert "Latency (ms)" in output and "Memory (rss)" in output
+    assert all((tmp_path / name).exists() for name in expected)
+    assert (tmp_path / "run-RAM.txt").read_text().startswith("Profile of RAM")
+
+def test_main_rejects_unknown_names_and_clashing_flags(tmp_path):
+
+    assert main(str(tmp_path), "4", "6", "Nobody", "PreferFewer", "5").returncode == 1
+    assert main(str(tmp_path), "4", "6", "RAM", "PreferFewer", "5", "--speculate", "thread", "--supervise").returncode == 2
+    assert main(str(tmp_path), "4", "6", "RAM", "PreferFewer", "5", "--memory-limit", "512").returncode == 2
+    assert main(str(tmp_path), "4", "6", "RAM", "PreferFewer", "5", "--profile", "trace").returncode == 2
@@ -0,0 +1,81 @@
+import collections
+import random
+import pytest
+from scsa import SCSA, ABColor, codes_from_array
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+SCSAS = [scsa_class() for scsa_class in SCSA.__subclasses__()]
+
+def frequencies(codes):
+
+    positions = collections.Counter((position, color) for code in codes for position, color in enumerate(code))
+    distinct = collections.Counter(len(set(code)) for code in codes)
+
+    return {key: count/len(codes) for key, count in positions.items()}, {key: count/len(codes) for key, count in distinct.items()}
+
+def largest_difference(first, second):
+
+    return max(abs(first.get(key, 0) - second.get(key, 0)) for key in set(first) | set(second))
+
+@pytest.mark.parametrize("scsa", SCSAS, ids = lambda scsa: scsa.name)
+def test_generate_array_matches_generate_codes(scsa):
+
+    numpy = pytest.importorskip("numpy")
+
+    random.seed(0)
+
+    array = scsa.generate_array(4, COLORS, 20000, numpy.random.default_rng(0))
+
+    assert array.shape == (20000, 4)
+    assert array.dtype == numpy.uint8
+
+    vectorized = frequencies(codes_from_array(array, COLORS))
+    plain = frequencies(scsa.generate_codes(4, COLORS, 20000))
+
+    assert largest_difference(vectorized[0], plain[0]) < 0.02
+    assert largest_difference(vectorized[1], plain[1]) < 0.02
+
+def test_ab_color_draws_single_codes_from_a_and_b():
+
+    random.seed(0)
+
+    scsa = ABColor()
+
+    # A single code once came from two random colors, which neither the docstring nor pmf allow
+    assert all(set(scsa.generate_codes(4, COLORS)) == {"A", "B"} for _ in range(200))
+    assert sum(scsa.pmf(code, COLORS) for code in scsa.code_space(4, COLORS)) == pytest.approx(1)
+
+def test_ab_color_needs_a_and_b():
+
+    assert ABColor().generate_code(4, ["C", "D", "E"]) is None
+
+    numpy = pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+
+        ABColor().generate_array(4, ["C", "D", "E"], 10, numpy.random.default_rng(0))
+
+@pytest.mark.parametrize("scsa", SCSAS, ids = lambda scsa: scsa.name)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_iter_codes_draws_the_same_codes_as_generate_codes(scsa, chunk_size):
+
+    random.seed(1)
+
+    batches = list(scsa.iter_codes(4, COLORS, chunk_size, 30))
+
+    random.seed(1)
+
+    assert [len(batch) for batch in batches] == [min(chunk_size, 30 - i) for i in range(0, 30, chunk_size)]
+    assert [code for batch in batches for code in batch] == scsa.generate_codes(4, COLORS, 30)
+
+@pytest.mark.parametrize("scsa", SCSAS, ids = lambda scsa: scsa.name)
+def test_iter_codes_stops_or_yields_nothing(scsa):
+
+    codes = scsa.iter_codes(4, COLORS, 5)
+
+    assert all(len(next(codes)) == 5 for _ in range(10))
+    assert list(scsa.iter_codes(4, COLORS, 5, 0)) == []
+
+    if scsa.generate_codes(4, ["C"], 2) is None:
+
+        assert list(scsa.iter_codes(4, ["C"], 5, 20)) == []
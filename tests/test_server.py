@@ -0,0 +1,115 @@
+import asyncio
+import json
+from loadgen import LoadGenerator, percentile
+from server import GameServer
+
+async def exchange(port, requests):
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    replies = []
+
+    for request in requests:
+
+        writer.write((json.dumps(request) + "\n").encode())
+
+        await writer.drain()
+
+        replies.append(json.loads(await reader.readline()))
+
+    writer.close()
+
+    return replies
+
+def test_sessions_are_refused_when_the_scsa_cannot_fill_the_board():
+
+    server = GameServer()
+
+    reply = server.handle_request({"op": "new", "board_length": 5, "num_colors": 4, "scsa": "OnlyOnce"}, 0)
+
+    assert "error" in reply
+    assert server.sessions == {}
+
+def test_a_game_is_played_over_tcp():
+
+    async def play():
+
+        server = GameServer(port = 0)
+
+        await server.start()
+
+        try:
+
+            [reply] = await exchange(server.port, [{"op": "new", "board_length": 4, "num_colors": 6, "scsa": "PreferFewer", "guess_cutoff": 3}])
+            session_id = reply["session"]
+            answer = server.sessions[session_id].answer
+            wrong = "A"*4 if answer != "A"*4 else "B"*4
+
+            return await exchange(server.port, [
+                {"op": "guess", "session": session_id, "guess": wrong},
+                {"op": "guess", "session": session_id, "guess": answer},
+                {"op": "guess", "session": session_id, "guess": answer},
+                {"op": "stats"},
+            ])
+
+        finally:
+
+            server.server.close()
+            server.sweeper.cancel()
+
+    first, win, after, stats = asyncio.run(play())
+
+    assert first["response"][2] == 1
+    assert win == {"response": "win", "guesses": 2}
+    assert after == {"error": "unknown session"}
+    assert stats == {"sessions": 0, "games": 1, "guesses": 2, "expired": 0}
+
+def test_a_game_is_lost_at_the_guess_cutoff():
+
+    server = GameServer()
+    session_id = server.handle_request({"op": "new", "board_length": 4, "num_colors": 6, "scsa": "PreferFewer", "guess_cutoff": 2}, 0)["session"]
+    wrong = "A"*4 if server.sessions[session_id].answer != "A"*4 else "B"*4
+
+    assert len(server.handle_request({"op": "guess", "session": session_id, "guess": wrong}, 0)["response"]) == 3
+    assert server.handle_request({"op": "guess", "session": session_id, "guess": wrong}, 0) == {"response": "loss", "guesses": 2}
+
+def test_an_invalid_guess_ends_the_session():
+
+    server = GameServer()
+    session_id = server.handle_request({"op": "new", "board_length": 4, "num_colors": 6, "scsa": "PreferFewer"}, 0)["session"]
+
+    assert server.handle_request({"op": "guess", "session": session_id, "guess": "AB"}, 0) == {"response": "invalid", "guesses": 1}
+    assert session_id not in server.sessions
+
+def test_load_generator_plays_games_without_errors():
+
+    async def run():
+
+        server = GameServer(port = 0)
+
+        await server.start()
+
+        try:
+
+            generator = LoadGenerator(port = server.port, connections = 2, games = 3, duration = 0.3, guess_cutoff = 5)
+
+            return await generator.run(), server.games
+
+        finally:
+
+            server.server.close()
+            server.sweeper.cancel()
+
+    summary, games = asyncio.run(run())
+
+    assert summary["requests"] > 0
+    assert summary["errors"] == 0
+    assert sum(summary["results"].values()) <= games
+    assert summary["p50_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+
+def test_percentile_by_nearest_rank():
+
+    values = list(range(1, 101))
+
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0
@@ -0,0 +1,57 @@
+import itertools
+import multiprocessing
+from mastermind import feedback
+from sharedmem import ResponseTable, SharedCodes, attach
+
+COLORS = ["A", "B", "C"]
+CODES = ["".join(code) for code in itertools.product(COLORS, repeat = 3)]
+
+def read_in_worker(handle):
+
+    shared = attach(handle)
+
+    try:
+
+        if handle[0] == "codes":
+
+            return list(shared)
+
+        return [shared.response(4, i) for i in range(shared.num_codes)]
+
+    finally:
+
+        shared.close()
+
+def test_codes_are_read_by_workers():
+
+    codes = SharedCodes(CODES, COLORS)
+
+    try:
+
+        with multiprocessing.Pool(2) as pool:
+
+            assert pool.map(read_in_worker, [codes.handle]*2) == [CODES]*2
+
+    finally:
+
+        codes.unlink()
+
+def test_table_holds_the_response_of_every_pair():
+
+    table = ResponseTable(CODES, CODES, 3)
+
+    try:
+
+        for guess_index, guess in enumerate(CODES):
+
+            assert [table.response(guess_index, i) for i in range(len(CODES))] == [feedback(guess, code) for code in CODES]
+
+        with multiprocessing.Pool(2) as pool:
+
+            expected = [feedback(CODES[4], code) for code in CODES]
+
+            assert pool.map(read_in_worker, [table.handle]*2) == [expected]*2
+
+    finally:
+
+        table.unlink()
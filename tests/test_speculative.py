@@ -0,0 +1,94 @@
+import time
+from mastermind import Mastermind, Round
+from player import Player, RAM
+from scsa import PreferFewer
+from strategy import AdaptivePlayer
+from speculative import SpeculativePlayer
+
+def test_speculative_player_wins_with_every_guess_accounted_for():
+
+    colors = ["A", "B", "C", "D"]
+    player = SpeculativePlayer(AdaptivePlayer())
+
+    try:
+
+        for code in ["ABCD", "DDDA", "CCCC"]:
+
+            hits, misses = player.hits, player.misses
+
+            result, guesses = Round(4, colors, code, PreferFewer(), 100, 60).play_round(player, 600)
+
+            assert result == "win"
+            assert (player.hits - hits) + (player.misses - misses) == guesses - 1
+
+    finally:
+
+        player.close()
+
+def test_speculative_player_plays_concurrent_rounds():
+
+    colors = ["A", "B", "C", "D"]
+    player = SpeculativePlayer(RAM())
+
+    try:
+
+        Mastermind(4, colors, 100, 60, 600).play_concurrent_tournament(player, PreferFewer(), 4, 2)
+
+        assert player.hits + player.misses > 0
+
+    finally:
+
+        player.close()
+
+class Stubborn(Player):
+
+    def __init__(self):
+
+        self.player_name = "Stubborn"
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        if last_response[2] == 0:
+
+            return "AAAA"
+
+        # Never returns from a response the test's answer does not give
+        while last_response[:2] == (0, 0):
+
+            pass
+
+        return "ABCD"
+
+def test_process_replies_that_never_return_are_timed_out():
+
+    player = SpeculativePlayer(Stubborn(), executor = "process", max_workers = 4, reply_timeout = 0.5)
+
+    try:
+
+        result, _ = Round(4, ["A", "B", "C", "D"], "ABCD", PreferFewer(), 100, 60).play_round(player, 600)
+
+        assert result == "win"
+
+    finally:
+
+        start = time.perf_counter()
+
+        player.close()
+
+        assert time.perf_counter() - start < 5
+
+def test_nothing_is_speculated_above_max_candidates():
+
+    player = SpeculativePlayer(Stubborn(), max_candidates = 100)
+
+    try:
+
+        result, guesses = Round(4, ["A", "B", "C", "D"], "ABCD", PreferFewer(), 100, 60).play_round(player, 600)
+
+        assert (result, guesses) == ("win", 2)
+        assert player.hits == 0
+        assert player.planning is None
+
+    finally:
+
+        player.close()
@@ -0,0 +1,104 @@
+import math
+import random
+import pytest
+from mastermind import Mastermind
+from player import Budget
+from solvers import GeneticEngine, MinimaxEngine, SamplingEngine, all_codes, feedback, is_consistent
+from strategy import AdaptivePlayer, CostModel
+from scsa import PreferFewer
+
+COLORS = ["A", "B", "C", "D"]
+HISTORY = [("AABB", (1, 1)), ("ABCD", (2, 0))]
+
+def largest_class(guess, candidates):
+
+    counts = {}
+
+    for code in candidates:
+
+        counts[feedback(guess, code)] = counts.get(feedback(guess, code), 0) + 1
+
+    return max(counts.values())
+
+def test_minimax_minimizes_the_largest_response_class():
+
+    candidates = [code for code in all_codes(4, COLORS) if is_consistent(code, HISTORY)]
+    best = min(largest_class(guess, candidates) for guess in all_codes(4, COLORS))
+
+    assert largest_class(MinimaxEngine(True).choose(4, COLORS, HISTORY, candidates), candidates) == best
+    assert MinimaxEngine(False).choose(4, COLORS, HISTORY, candidates) in candidates
+
+def test_minimax_needs_candidates():
+
+    assert MinimaxEngine().choose(4, COLORS, HISTORY, None) is None
+    assert MinimaxEngine().choose(4, COLORS, HISTORY, ["ABAB", "BABA"]) == "ABAB"
+
+def test_sampling_and_genetic_engines_find_consistent_codes():
+
+    rng = random.Random(0)
+
+    assert is_consistent(SamplingEngine().choose(4, COLORS, HISTORY, None, rng), HISTORY)
+    assert is_consistent(GeneticEngine().choose(4, COLORS, HISTORY, None, rng), HISTORY)
+
+def test_sampling_gives_up_on_an_impossible_history():
+
+    impossible = [("AAAA", (0, 0)), ("BBBB", (0, 0)), ("CCCC", (0, 0)), ("DDDD", (0, 0))]
+
+    assert SamplingEngine(max_tries = 100).choose(4, COLORS, impossible, None, random.Random(0)) is None
+
+def test_cost_model_rules_out_engines_that_cannot_run():
+
+    model = CostModel(samples = 10)
+
+    assert model.calls(MinimaxEngine(), 4, COLORS, HISTORY, None, 10) == math.inf
+    assert model.calls(MinimaxEngine(False), 4, COLORS, HISTORY, ["AAAA"]*10, 10) == 100
+    assert model.calls(SamplingEngine(max_tries = 10), 4, COLORS, HISTORY, None, 1) == math.inf
+    assert model.calls(SamplingEngine(), 4, COLORS, HISTORY, ["AAAA"], 1) == 1
+
+def test_cost_model_corrections_follow_measured_times():
+
+    model = CostModel(samples = 10)
+    engine = GeneticEngine()
+
+    model.update(engine, 1.0, 3.0)
+
+    assert model.corrections[engine.name] == pytest.approx(3.0)
+
+    model.update(engine, 3.0, 3.0)
+
+    assert model.corrections[engine.name] == pytest.approx(3.0)
+
+def test_adaptive_player_uses_minimax_when_time_allows():
+
+    player = AdaptivePlayer()
+
+    player.make_timed_guess(4, COLORS, PreferFewer(), (0, 0, 0), Budget(round_time = 60, guesses = 100))
+
+    assert player.decisions[-1].engine == "minimax"
+    assert player.decisions[-1].enumerated
+
+def test_adaptive_player_falls_back_without_time_or_candidates():
+
+    player = AdaptivePlayer()
+
+    player.make_timed_guess(4, COLORS, PreferFewer(), (0, 0, 0), Budget(round_time = 0, guesses = 100))
+
+    assert player.decisions[-1].engine == "genetic"
+
+    player = AdaptivePlayer(max_candidates = 10)
+
+    player.make_timed_guess(4, COLORS, PreferFewer(), (0, 0, 0), Budget(round_time = 60, guesses = 100))
+
+    assert player.decisions[-1].engine in ("sampling", "genetic")
+    assert not player.decisions[-1].enumerated
+    assert sum(player.engine_uses.values()) == len(player.decisions)
+
+def test_concurrent_sessions_record_their_choices_on_the_player():
+
+    player = AdaptivePlayer()
+
+    Mastermind(4, COLORS, 100, 60, 600).play_concurrent_tournament(player, PreferFewer(), 8, 4)
+
+    assert sum(decision.guess == 1 for decision in player.decisions) == 8
+    assert sum(player.engine_uses.values()) == len(player.decisions)
+    assert player.cost_model.corrections
@@ -0,0 +1,145 @@
+import ast
+import multiprocessing
+import os
+import time
+from mastermind import Mastermind, Round
+from player import RAM, Player
+from scsa import PreferFewer
+from supervised import SupervisedPlayer
+
+COLORS = ["A", "B", "C", "D", "E", "F"]
+
+class Sleepy(Player):
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        time.sleep(60)
+
+class Hungry(Player):
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        return str(bytearray(1 << 32))
+
+class Crashing(Player):
+
+    def make_guess(self, board_length, colors, scsa, last_response):
+
+        os._exit(1)
+
+def play_round(player, time_cutoff = 5):
+
+    return Round(4, COLORS, "AABB", PreferFewer(), time_cutoff = time_cutoff).play_round(player)
+
+def results(capsys):
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Results: ")]
+
+    return ast.literal_eval(lines[-1][len("Results: "):])
+
+def test_a_played_player_plays_concurrent_rounds(capsys):
+
+    player = SupervisedPlayer(RAM())
+    mastermind = Mastermind(4, COLORS, 100, 60, 600)
+
+    try:
+
+        mastermind.play_tournament(player, PreferFewer(), 2)
+
+        assert results(capsys)["win"] == 2
+
+        worker = player.process
+
+        mastermind.play_concurrent_tournament(player, PreferFewer(), 12, 3)
+
+        assert results(capsys)["win"] == 12
+
+        # Forks are kept with their workers for later rounds, one per round that was in progress at once
+        assert worker in multiprocessing.active_children()
+        assert 1 < len(player.idle_forks) <= 3
+        assert len(multiprocessing.active_children()) == len(player.idle_forks)
+
+    finally:
+
+        player.close()
+
+    assert player.process is None
+    assert multiprocessing.active_children() == []
+
+def test_forks_add_their_recycled_workers_to_the_player(capsys):
+
+    player = SupervisedPlayer(Sleepy())
+
+    try:
+
+        Mastermind(4, COLORS, 100, 0.3, 600).play_concurrent_tournament(player, PreferFewer(), 4, 4)
+
+        assert results(capsys)["loss"] == 4
+        assert player.recycled == 4
+
+    finally:
+
+        player.close()
+
+    assert multiprocessing.active_children() == []
+
+def test_a_slow_worker_loses_the_round_and_is_replaced():
+
+    player = SupervisedPlayer(Sleepy(), time_cutoff = 0.3)
+
+    start = time.time()
+
+    try:
+
+        assert play_round(player, 0.3) == ("loss", 1)
+        assert time.time() - start < 5
+        assert player.recycled == 1 and player.process is None
+
+    finally:
+
+        player.close()
+
+def test_a_worker_over_its_memory_limit_loses_the_round():
+
+    player = SupervisedPlayer(Hungry(), memory_limit = 256*1024*1024)
+
+    try:
+
+        assert play_round(player) == ("loss", 1)
+        assert player.recycled == 1
+
+        # A fresh worker takes the next round, and hits the limit again
+        assert play_round(player) == ("loss", 1)
+        assert player.recycled == 2
+
+    finally:
+
+        player.close()
+
+def test_a_worker_that_dies_loses_the_round():
+
+    player = SupervisedPlayer(Crashing())
+
+    try:
+
+        assert play_round(player) == ("loss", 1)
+        assert player.recycled == 1
+
+    finally:
+
+        player.close()
+
+    assert multiprocessing.active_children() == []
+
+def test_a_supervised_player_still_wins():
+
+    player = SupervisedPlayer(RAM(), memory_limit = 1 << 30)
+
+    try:
+
+        assert play_round(player)[0] == "win"
+        assert player.recycled == 0
+
+    finally:
+
+        player.close()
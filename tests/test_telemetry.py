@@ -0,0 +1,88 @@
+import threading
+from telemetry import Telemetry
+
+def enabled():
+
+    telemetry = Telemetry()
+    telemetry.enabled = True
+
+    return telemetry
+
+def test_nothing_is_recorded_until_enabled():
+
+    telemetry = Telemetry()
+
+    telemetry.count("rejections")
+    telemetry.gauge("table_size", 10)
+    telemetry.observe("candidates_before", 5)
+
+    assert telemetry.end_round() == {}
+    assert telemetry.gauges == {} and telemetry.summaries == {}
+
+def test_counters_are_summarized_per_round():
+
+    telemetry = enabled()
+
+    telemetry.count("feedback_calls", 10)
+    telemetry.end_round()
+    telemetry.count("rejections", 3)
+    telemetry.count("feedback_calls", 4)
+
+    assert telemetry.end_round() == {"rejections": 3, "feedback_calls": 4}
+    assert telemetry.counters == {"feedback_calls": 14, "rejections": 3}
+    assert (telemetry.per_round["rejections"].count, telemetry.per_round["rejections"].mean()) == (2, 1.5)
+    assert telemetry.per_round["feedback_calls"].max == 10
+
+def test_pruning_and_hit_rates():
+
+    telemetry = enabled()
+
+    telemetry.prune("candidates", 100, 25)
+    telemetry.count("speculation_hits", 3)
+    telemetry.count("speculation_misses")
+
+    assert telemetry.summaries["candidates_pruned_ratio"].mean() == 0.75
+    assert telemetry.hit_rate("speculation") == 0.75
+    assert telemetry.hit_rate("table") is None
+
+def test_export_is_prometheus_text():
+
+    telemetry = enabled()
+
+    telemetry.count("rejections", 2)
+    telemetry.gauge("table_size", 7)
+    telemetry.end_round()
+
+    lines = telemetry.export({"player": "RAM"}).splitlines()
+
+    assert 'mastermind_rounds_total{player="RAM"} 1' in lines
+    assert "# TYPE mastermind_rejections_total counter" in lines
+    assert 'mastermind_rejections_total{player="RAM"} 2' in lines
+    assert 'mastermind_rejections_per_round{player="RAM",stat="max"} 2' in lines
+    assert 'mastermind_table_size{player="RAM"} 7' in lines
+
+def test_reports_from_threads_are_all_kept():
+
+    telemetry = enabled()
+
+    def report(thread):
+
+        for i in range(1000):
+
+            telemetry.count("feedback_calls")
+            telemetry.gauge("gauge_" + str(thread), i)
+            telemetry.observe("candidates_before", i)
+
+    threads = [threading.Thread(target = report, args = (thread,)) for thread in range(8)]
+
+    for thread in threads:
+
+        thread.start()
+
+    for thread in threads:
+
+        thread.join()
+
+    assert telemetry.end_round() == {"feedback_calls": 8000}
+    assert telemetry.gauges == {"gauge_" + str(thread): 999 for thread in range(8)}
+    assert telemetry.summaries["candidates_before"].count == 8000